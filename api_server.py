@@ -0,0 +1,248 @@
+import argparse
+import hashlib
+import json
+import mimetypes
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+from history_reader import has_history_views, has_range_views, iter_history
+from read_cache import ReadCache
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+DEFAULT_MAX_RESPONSES = 256
+
+def make_etag(body):
+    """Strong ETag derived from the response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+class BadRequest(Exception):
+    pass
+
+class NotFound(Exception):
+    pass
+
+class ApiCache:
+    """Rendered JSON responses shared by every viewer, refreshed on new blocks
+
+    Reads go through a ReadCache, so the node sees at most one
+    eth_blockNumber per `block_ttl` and one eth_call per distinct query per
+    block, however many viewers there are. Rendering a missing response is
+    done under one lock, so concurrent viewers asking for the same thing
+    wait for a single fetch instead of each calling the node. ETags are
+    derived from the body, so a new block that changes nothing still
+    answers If-None-Match with 304. Every read behind one response is
+    pinned to the block the response is cached under, so a page never
+    mixes a history length from one block with entries from another.
+    """
+
+    def __init__(self, contract, block_ttl=1.0, max_responses=DEFAULT_MAX_RESPONSES):
+        self.contract = contract
+        self.reads = ReadCache(contract, max_entries=max_responses, block_ttl=block_ttl)
+        self.max_responses = max_responses
+        self.use_range_views = has_range_views(contract)
+        self.use_history_views = has_history_views(contract)
+        self._responses = OrderedDict()
+        self._lock = threading.Lock()
+        self._fill_lock = threading.Lock()
+
+    def get(self, key, render):
+        """Return (block, body, etag) for `key`, calling render(block) on a miss"""
+        block = self.reads.current_block()
+        with self._lock:
+            cached = self._responses.get(key)
+            if cached is not None and cached[0] == block:
+                self._responses.move_to_end(key)
+                return cached
+        with self._fill_lock:
+            with self._lock:
+                cached = self._responses.get(key)
+                if cached is not None and cached[0] == block:
+                    return cached
+            body = json.dumps(render(block)).encode("utf-8")
+            entry = (block, body, make_etag(body))
+            with self._lock:
+                self._responses[key] = entry
+                self._responses.move_to_end(key)
+                while len(self._responses) > self.max_responses:
+                    self._responses.popitem(last=False)
+            return entry
+
+    def contract_info(self, block):
+        greeting, owner, total, history_length = self.reads.get_contract_info(block)
+        return {
+            "greeting": greeting,
+            "owner": owner,
+            "totalGreetings": total,
+            "historyLength": history_length,
+        }
+
+    def history_page(self, offset, limit, block):
+        """Newest-first page of history at `block`, with absolute indexes"""
+        total = self.reads.get_contract_info(block)[3]
+        count = max(0, min(limit, total - offset))
+        if not self.use_history_views:
+            rows = [row[1:] for row in self._logged_history(total - offset - count, total - offset, block)]
+        elif self.use_range_views:
+            rows = self.reads.call("getHistoryRangeReverse", offset, count, block_number=block) if count else []
+        else:
+            rows = [
+                self.reads.call("getGreetingFromHistory", total - 1 - offset - i, block_number=block)
+                for i in range(count)
+            ]
+        entries = [_entry(total - 1 - offset - i, row) for i, row in enumerate(rows)]
+        return {"total": total, "offset": offset, "limit": limit, "entries": entries}
+
+    def history_entry(self, index, block):
+        total = self.reads.get_contract_info(block)[3]
+        if not 0 <= index < total:
+            raise NotFound(f"History index {index} out of range (0-{total - 1})")
+        if not self.use_history_views:
+            return _entry(index, self._logged_history(index, index + 1, block)[0][1:])
+        return _entry(index, self.reads.call("getGreetingFromHistory", index, block_number=block))
+
+    def _logged_history(self, start, stop, block):
+        # Compact deployments keep history only in logs; see history_reader.iter_history
+        if start >= stop:
+            return []
+        return list(iter_history(self.contract, start, stop, newest_first=True, block_identifier=block))
+
+def _entry(index, row):
+    message, updated_by, timestamp = row
+    return {"index": index, "message": message, "updatedBy": updated_by, "timestamp": timestamp}
+
+def _int_param(query, name, default, minimum=0, maximum=None):
+    try:
+        value = int(query.get(name, [default])[0])
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise BadRequest(f"{name} must be between {minimum} and {maximum}")
+    return value
+
+def make_handler(cache, static_dir=STATIC_DIR):
+    """Request handler class serving static/ and the JSON API from `cache`"""
+    contract_body = json.dumps({"address": cache.contract.address, "abi": cache.contract.abi}).encode("utf-8")
+    static_root = Path(static_dir).resolve()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            try:
+                if url.path.startswith("/api/"):
+                    self.serve_api(url.path, parse_qs(url.query))
+                else:
+                    self.serve_static(url.path)
+            except NotFound as e:
+                self.send_json_error(HTTPStatus.NOT_FOUND, str(e))
+            except BadRequest as e:
+                self.send_json_error(HTTPStatus.BAD_REQUEST, str(e))
+            except Exception as e:
+                self.send_json_error(HTTPStatus.BAD_GATEWAY, f"Node request failed: {e}")
+
+        def serve_api(self, path, query):
+            if path == "/api/contract":
+                return self.send_body(contract_body, make_etag(contract_body), "application/json")
+            if path == "/api/greeting":
+                key, render = path, lambda block: {"greeting": cache.reads.get_greeting(block)}
+            elif path == "/api/info":
+                key, render = path, cache.contract_info
+            elif path == "/api/history":
+                offset = _int_param(query, "offset", 0)
+                limit = _int_param(query, "limit", DEFAULT_PAGE_LIMIT, 1, MAX_PAGE_LIMIT)
+                key, render = (path, offset, limit), lambda block: cache.history_page(offset, limit, block)
+            elif path.startswith("/api/history/"):
+                try:
+                    index = int(path.rsplit("/", 1)[1])
+                except ValueError:
+                    raise NotFound(f"No such history entry: {path}")
+                key, render = path, lambda block: cache.history_entry(index, block)
+            else:
+                raise NotFound(f"No such endpoint: {path}")
+            block, body, etag = cache.get(key, render)
+            self.send_body(body, etag, "application/json", block)
+
+        def serve_static(self, path):
+            if path in ("/", "/index.html"):
+                relative = "templates/index.html"
+            elif path.startswith("/static/"):
+                relative = path[len("/static/"):]
+            else:
+                raise NotFound(f"No such file: {path}")
+            file_path = (static_root / relative).resolve()
+            if static_root not in file_path.parents or not file_path.is_file():
+                raise NotFound(f"No such file: {path}")
+            body = file_path.read_bytes()
+            content_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+            self.send_body(body, make_etag(body), content_type)
+
+        def send_body(self, body, etag, content_type, block=None):
+            # no-cache: browsers keep the body but revalidate it with If-None-Match
+            not_modified = etag in self.headers.get("If-None-Match", "")
+            self.send_response(HTTPStatus.NOT_MODIFIED if not_modified else HTTPStatus.OK)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            if block is not None:
+                self.send_header("X-Block-Number", str(block))
+            if not_modified:
+                self.end_headers()
+                return
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_json_error(self, status, message):
+            body = json.dumps({"error": message}).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def make_server(contract, host="127.0.0.1", port=8000, block_ttl=1.0):
+    """ThreadingHTTPServer for the frontend and JSON API; port 0 picks a free port"""
+    cache = ApiCache(contract, block_ttl=block_ttl)
+    server = ThreadingHTTPServer((host, port), make_handler(cache))
+    server.cache = cache
+    return server
+
+def main():
+    """Serve the web frontend and a cached read API for the deployed contract"""
+    from client import connect, ganache_url
+    from interact import load_contract
+
+    parser = argparse.ArgumentParser(description="Caching read API for the greeting frontend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--block-ttl", type=float, default=1.0,
+                        help="seconds between eth_blockNumber checks")
+    args = parser.parse_args()
+
+    w3 = connect()
+    if not w3.is_connected():
+        print(f" Failed to connect to {ganache_url()}")
+        return
+
+    contract, contract_address = load_contract(w3)
+    server = make_server(contract, args.host, args.port, args.block_ttl)
+    print(f" Serving {contract_address} on http://{args.host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        stats = server.cache.reads.stats()
+        print(f"\n Read cache: {stats['hits']} hits, {stats['misses']} misses")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
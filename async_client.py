@@ -0,0 +1,122 @@
+import asyncio
+import json
+from web3 import AsyncWeb3, AsyncHTTPProvider
+from gas_planner import DEFAULT_MARGIN, worst_case_allowance
+from history_reader import has_history_views
+
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_TIMEOUT = 30
+
+class AsyncGreetingClient:
+    """Coroutine versions of the interact.py operations
+
+    Every call goes through a shared semaphore, so at most `max_concurrency`
+    requests are outstanding at once, and through asyncio.wait_for, so a
+    stuck node fails the call after `timeout` seconds instead of hanging it.
+    The operations do not print. get_greeting, get_contract_info and
+    set_greeting return the same values as their interact.py counterparts;
+    get_greeting_history returns the entries themselves, where interact.py
+    prints them and returns their count.
+
+    Nonces are assigned locally, per account, under an asyncio lock, so
+    concurrent set_greeting calls from one account get consecutive nonces
+    instead of all reading the same transaction count from the node.
+    """
+
+    def __init__(self, w3, contract, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 timeout=DEFAULT_TIMEOUT):
+        self.w3 = w3
+        self.contract = contract
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._nonce_lock = asyncio.Lock()
+        self._nonces = {}
+        self._chain_id = None
+
+    @classmethod
+    def from_deployment(cls, ganache_url, deployment_path="deployment_info.json",
+                        abi_path="contract_abi.json", **kwargs):
+        """Build a client for the contract recorded by deloy.py"""
+        with open(deployment_path, "r") as file:
+            deployment_info = json.load(file)
+
+        with open(abi_path, "r") as file:
+            abi = json.load(file)
+
+        w3 = AsyncWeb3(AsyncHTTPProvider(ganache_url))
+        contract = w3.eth.contract(address=deployment_info["contract_address"], abi=abi)
+        return cls(w3, contract, **kwargs)
+
+    async def _bounded(self, awaitable, timeout=None):
+        """Run one request under the concurrency limit and timeout"""
+        async with self._semaphore:
+            return await asyncio.wait_for(awaitable, timeout or self.timeout)
+
+    async def _next_nonce(self, account):
+        async with self._nonce_lock:
+            if account not in self._nonces:
+                self._nonces[account] = await self._bounded(
+                    self.w3.eth.get_transaction_count(account, "pending")
+                )
+            nonce = self._nonces[account]
+            self._nonces[account] += 1
+            return nonce
+
+    async def _resync_nonce(self, account):
+        """Reload the account's nonce from the node on the next send"""
+        async with self._nonce_lock:
+            self._nonces.pop(account, None)
+
+    async def get_greeting(self):
+        """Get current greeting"""
+        return await self._bounded(self.contract.functions.getGreeting().call())
+
+    async def get_contract_info(self):
+        """Get (currentGreeting, owner, totalGreetings, historyLength)"""
+        return await self._bounded(self.contract.functions.getContractInfo().call())
+
+    async def get_greeting_history(self):
+        """Get every (message, updatedBy, timestamp) history entry in order
+
+        All entry reads are issued together and overlap up to the
+        concurrency limit. A compact deployment has no history views and
+        raises ValueError; rebuild its history from logs instead.
+        """
+        if not has_history_views(self.contract):
+            raise ValueError("Contract has no getGreetingFromHistory (compact deployment); "
+                             "use history_hash.reconstruct_history")
+        history_count = await self._bounded(self.contract.functions.getHistoryCount().call())
+        return await asyncio.gather(*(
+            self._bounded(self.contract.functions.getGreetingFromHistory(i).call())
+            for i in range(history_count)
+        ))
+
+    async def set_greeting(self, account, private_key, new_greeting, receipt_timeout=120):
+        """Set a new greeting and wait for its receipt
+
+        Only the submission holds a concurrency slot; the receipt wait runs
+        outside it so many pending transactions can be awaited at once.
+        """
+        set_greeting_call = self.contract.functions.setGreeting(new_greeting)
+        if self._chain_id is None:
+            self._chain_id = await self._bounded(self.w3.eth.chain_id)
+        gas_price = await self._bounded(self.w3.eth.gas_price)
+        estimate = await self._bounded(set_greeting_call.estimate_gas({"from": account}))
+        nonce = await self._next_nonce(account)
+        try:
+            transaction = await self._bounded(
+                set_greeting_call.build_transaction({
+                    "chainId": self._chain_id,
+                    "from": account,
+                    "nonce": nonce,
+                    "gas": int((estimate + worst_case_allowance(set_greeting_call)) * DEFAULT_MARGIN),
+                    "gasPrice": gas_price,
+                })
+            )
+            signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=private_key)
+            tx_hash = await self._bounded(self.w3.eth.send_raw_transaction(signed_txn.rawTransaction))
+        except Exception:
+            # The nonce was not used, so later sends would wait on the gap
+            await self._resync_nonce(account)
+            raise
+        return await self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=receipt_timeout)
@@ -0,0 +1,100 @@
+import argparse
+import sys
+import time
+from client import connect, ganache_url, load_credentials
+from deloy import compile_contract
+from gas_planner import GasPlanner
+from greeting_batcher import GreetingBatcher, DEFAULT_GAS_BUDGET
+from nonce_manager import PipelinedSubmitter
+
+def deploy(w3, account, source_file="contract.sol"):
+    """Deploy a fresh GreetingContract from an unlocked account"""
+    compiled_sol = compile_contract(source_file=source_file, save_output=False)
+    contract_interface = compiled_sol["contracts"][source_file]["GreetingContract"]
+    GreetingContract = w3.eth.contract(
+        abi=contract_interface["abi"],
+        bytecode=contract_interface["evm"]["bytecode"]["object"],
+    )
+    tx_hash = GreetingContract.constructor("Hello, Blockchain World!").transact({"from": account})
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+    return w3.eth.contract(address=receipt.contractAddress, abi=contract_interface["abi"])
+
+def summarize(receipts, greetings, elapsed):
+    gas_used = sum(receipt.gasUsed for receipt in receipts)
+    return {
+        "transactions": len(receipts),
+        "gas_per_greeting": gas_used / len(greetings),
+        "ms_per_greeting": elapsed * 1000 / len(greetings),
+        "all_succeeded": all(receipt.status == 1 for receipt in receipts),
+    }
+
+def run_single(w3, contract, account, private_key, greetings):
+    """One pipelined setGreeting transaction per greeting"""
+    submitter = PipelinedSubmitter(w3, account, private_key, gas_planner=GasPlanner(w3),
+                                   chain_id=w3.eth.chain_id)
+    calls = (contract.functions.setGreeting(greeting) for greeting in greetings)
+    start = time.perf_counter()
+    receipts = [receipt for _, _, receipt in submitter.submit_all(calls)]
+    return summarize(receipts, greetings, time.perf_counter() - start)
+
+def run_batched(w3, contract, account, private_key, greetings, gas_budget):
+    """setGreetings transactions packed by GreetingBatcher, also pipelined"""
+    batcher = GreetingBatcher(contract, account, gas_budget=gas_budget)
+    batcher.calibrate()
+    submitter = PipelinedSubmitter(w3, account, private_key, gas_planner=GasPlanner(w3),
+                                   chain_id=w3.eth.chain_id)
+    receipts = []
+    start = time.perf_counter()
+    for batch in batcher.chunks(greetings):
+        receipts.extend(receipt for _, _, receipt in submitter.wait_for_slot())
+        submitter.send(contract.functions.setGreetings(batch), gas=batcher.gas_limit(batch))
+    receipts.extend(receipt for _, _, receipt in submitter.drain())
+    return summarize(receipts, greetings, time.perf_counter() - start)
+
+def main():
+    """Compare per-greeting gas and time for setGreeting and setGreetings"""
+    parser = argparse.ArgumentParser(description="Batched vs single greeting updates")
+    parser.add_argument("--count", type=int, default=200, help="greetings to submit")
+    parser.add_argument("--length", type=int, default=32, help="greeting length in bytes")
+    parser.add_argument("--gas-budget", type=int, default=DEFAULT_GAS_BUDGET)
+    parser.add_argument("--in-process", action="store_true",
+                        help="use an in-process eth-tester chain instead of Ganache")
+    args = parser.parse_args()
+
+    if args.in_process:
+        from local_chain import LocalChain
+
+        chain = LocalChain()
+        w3, account, private_key = chain.w3, chain.accounts[0], chain.private_keys[0]
+    else:
+        w3 = connect()
+        if not w3.is_connected():
+            print(f" Failed to connect to {ganache_url()}")
+            return 1
+        account, private_key = load_credentials()
+
+    greetings = [f"{i:0{args.length}d}"[-args.length:] for i in range(args.count)]
+    results = {
+        "setGreeting": run_single(w3, deploy(w3, account), account, private_key, greetings),
+        "setGreetings": run_batched(w3, deploy(w3, account), account, private_key, greetings,
+                                    args.gas_budget),
+    }
+
+    print("=" * 60)
+    print(f" {args.count} greetings of {args.length} bytes, batch gas budget {args.gas_budget}")
+    print(f" {'mode':<14} {'txs':>6} {'gas/greeting':>14} {'ms/greeting':>12} {'all succeeded':>14}")
+    for mode, result in results.items():
+        print(f" {mode:<14} {result['transactions']:>6} {result['gas_per_greeting']:>14.0f} "
+              f"{result['ms_per_greeting']:>12.2f} {str(result['all_succeeded']):>14}")
+    failed = [mode for mode, result in results.items() if not result["all_succeeded"]]
+    if failed:
+        # Reverted or out-of-gas transactions make the gas figures meaningless
+        print(f"\n Some {' and '.join(failed)} transactions failed; no comparison made")
+        return 1
+    single, batched = results["setGreeting"], results["setGreetings"]
+    print(f"\n Batching saves {1 - batched['gas_per_greeting'] / single['gas_per_greeting']:.1%} gas "
+          f"and {1 - batched['ms_per_greeting'] / single['ms_per_greeting']:.1%} time per greeting")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
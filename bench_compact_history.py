@@ -0,0 +1,80 @@
+import argparse
+import time
+from client import connect, ganache_url
+from deloy import compile_contract
+from history_hash import reconstruct_history
+
+VARIANTS = {
+    "array": "contract.sol",
+    "compact": "contract_compact.sol",
+}
+
+def deploy_variant(w3, source_file, account):
+    """Deploy one contract variant, returning the contract and its deploy receipt"""
+    compiled_sol = compile_contract(source_file=source_file, save_output=False)
+    contract_interface = compiled_sol["contracts"][source_file]["GreetingContract"]
+    GreetingContract = w3.eth.contract(
+        abi=contract_interface["abi"],
+        bytecode=contract_interface["evm"]["bytecode"]["object"],
+    )
+    tx_hash = GreetingContract.constructor("Hello, Blockchain World!").transact({"from": account})
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+    contract = w3.eth.contract(address=receipt.contractAddress, abi=contract_interface["abi"])
+    return contract, receipt
+
+def measure_variant(w3, source_file, greeting_lengths, updates):
+    """Record deploy gas, setGreeting gas per length and the mean over `updates` writes"""
+    account = w3.eth.accounts[0]
+    contract, receipt = deploy_variant(w3, source_file, account)
+
+    results = {"deploy": receipt.gasUsed}
+    for length in greeting_lengths:
+        tx_hash = contract.functions.setGreeting("x" * length).transact({"from": account})
+        results[f"setGreeting[{length}]"] = w3.eth.wait_for_transaction_receipt(tx_hash).gasUsed
+
+    total = 0
+    for i in range(updates):
+        tx_hash = contract.functions.setGreeting(f"Update number {i}").transact({"from": account})
+        total += w3.eth.wait_for_transaction_receipt(tx_hash).gasUsed
+    results[f"mean of {updates}"] = total // max(updates, 1)
+    return contract, results
+
+def main():
+    """Compare per-update gas of the history array and the compact hash-only contract"""
+    parser = argparse.ArgumentParser(description="History array vs event-sourced compact history")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[1, 31, 32, 100, 200],
+                        help="greeting lengths in bytes")
+    parser.add_argument("--updates", type=int, default=50,
+                        help="short updates to average, and to rebuild from logs")
+    parser.add_argument("--in-process", action="store_true",
+                        help="use an in-process eth-tester chain instead of Ganache")
+    args = parser.parse_args()
+
+    if args.in_process:
+        from web3 import Web3, EthereumTesterProvider
+
+        w3 = Web3(EthereumTesterProvider())
+    else:
+        w3 = connect()
+        if not w3.is_connected():
+            print(f" Failed to connect to {ganache_url()}")
+            return
+
+    contracts, results = {}, {}
+    for name, source_file in VARIANTS.items():
+        contracts[name], results[name] = measure_variant(w3, source_file, args.lengths, args.updates)
+
+    print("=" * 60)
+    print(f" {'case':<20} {'array':>10} {'compact':>10} {'saved':>10}")
+    for case, before in results["array"].items():
+        after = results["compact"][case]
+        print(f" {case:<20} {before:>10} {after:>10} {1 - after / before:>10.1%}")
+
+    start = time.perf_counter()
+    entries = reconstruct_history(contracts["compact"])
+    elapsed = time.perf_counter() - start
+    print(f"\n Rebuilt and verified {len(entries)} compact history entries from logs "
+          f"in {elapsed * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import json
+import time
+from client import connect, ganache_url
+from deloy import compile_contract
+from history_reader import has_range_views, iter_history
+
+def deploy_seeded_contract(w3, entries):
+    """Deploy a fresh contract and fill its history using an unlocked Ganache account"""
+    # Built from the current contract.sol, so the range views are measured too
+    compiled_sol = compile_contract(source_file="contract.sol", save_output=False)
+
+    contract_interface = compiled_sol["contracts"]["contract.sol"]["GreetingContract"]
+    account = w3.eth.accounts[0]
+    GreetingContract = w3.eth.contract(
+        abi=contract_interface["abi"],
+        bytecode=contract_interface["evm"]["bytecode"]["object"],
+    )
+    tx_hash = GreetingContract.constructor("Benchmark greeting").transact({"from": account})
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+    contract = w3.eth.contract(address=receipt.contractAddress, abi=contract_interface["abi"])
+
+    # Fire the seeding transactions first, then wait for the last one only
+    tx_hash = None
+    for i in range(entries - 1):
+        tx_hash = contract.functions.setGreeting(f"Greeting #{i}").transact({"from": account})
+    if tx_hash is not None:
+        w3.eth.wait_for_transaction_receipt(tx_hash)
+
+    return contract
+
+def read_history_loop(contract):
+    """The original N+1 loop from interact.get_greeting_history"""
+    history_count = contract.functions.getHistoryCount().call()
+    return [
+        contract.functions.getGreetingFromHistory(i).call()
+        for i in range(history_count)
+    ]
+
+def read_history_batched(contract, page_size, concurrency):
+    """Drain iter_history, keeping only the count"""
+    count = 0
+    for _ in iter_history(contract, page_size=page_size, concurrency=concurrency):
+        count += 1
+    return count
+
+def main():
+    """Compare the per-entry loop against batched history reads"""
+    parser = argparse.ArgumentParser(description="Benchmark greeting history retrieval")
+    parser.add_argument("--entries", type=int, default=1000, help="history entries to seed")
+    parser.add_argument("--page-size", type=int, nargs="+", default=[50, 100, 250])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--address", help="benchmark an existing contract instead of seeding one")
+    args = parser.parse_args()
+
+    w3 = connect()
+    if not w3.is_connected():
+        print(f" Failed to connect to {ganache_url()}")
+        return
+
+    if args.address:
+        with open("contract_abi.json", "r") as file:
+            abi = json.load(file)
+        contract = w3.eth.contract(address=args.address, abi=abi)
+    else:
+        print(f" Seeding {args.entries} history entries...")
+        contract = deploy_seeded_contract(w3, args.entries)
+
+    entries = contract.functions.getHistoryCount().call()
+    read_path = "getHistoryRange pages" if has_range_views(contract) else "batched getGreetingFromHistory"
+    print(f" Contract: {contract.address} ({entries} entries, read with {read_path})")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    read_history_loop(contract)
+    baseline = time.perf_counter() - start
+    print(f" {'loop':<28} {baseline:8.3f}s  {entries / baseline:10.1f} entries/s")
+
+    for page_size in args.page_size:
+        for concurrency in args.concurrency:
+            start = time.perf_counter()
+            read_history_batched(contract, page_size, concurrency)
+            elapsed = time.perf_counter() - start
+            label = f"batched page={page_size} conc={concurrency}"
+            print(f" {label:<28} {elapsed:8.3f}s  {entries / elapsed:10.1f} entries/s"
+                  f"  ({baseline / elapsed:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import json
+import random
+import time
+from eth_abi import encode
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.datastructures import AttributeDict
+from log_decoder import LogDecoder
+
+def make_logs(abi, count, updaters=20, seed=1):
+    """Synthetic GreetingSet/GreetingUpdated logs shaped like eth_getLogs results"""
+    rng = random.Random(seed)
+    events = {item["name"]: item for item in abi if item.get("type") == "event"}
+    updated, greeting_set = events["GreetingUpdated"], events["GreetingSet"]
+    accounts = [rng.randbytes(20) for _ in range(updaters)]
+    address = Web3.to_checksum_address(rng.randbytes(20))
+
+    logs = []
+    previous = "Hello, Blockchain World!"
+    for i in range(count):
+        message = f"Greeting {i} " + "x" * rng.randrange(0, 180)
+        if i % 100 == 0:
+            event_abi, values = greeting_set, [message, 1_700_000_000 + i]
+        else:
+            event_abi, values = updated, [previous, message, 1_700_000_000 + i]
+        types = [item["type"] for item in event_abi["inputs"] if not item["indexed"]]
+        logs.append(AttributeDict({
+            "address": address,
+            "topics": [HexBytes(event_abi_to_log_topic(event_abi)), HexBytes(bytes(12) + rng.choice(accounts))],
+            "data": HexBytes(encode(types, values)),
+            "blockNumber": i // 10,
+            "blockHash": HexBytes(rng.randbytes(32)),
+            "transactionHash": HexBytes(rng.randbytes(32)),
+            "transactionIndex": i % 10,
+            "logIndex": 0,
+            "removed": False,
+        }))
+        previous = message
+    return logs
+
+def decode_with_web3(contract, logs):
+    """The usual path: pick the event by topic and call its process_log"""
+    events = {
+        event_abi_to_log_topic(event.abi): event
+        for event in (contract.events.GreetingSet(), contract.events.GreetingUpdated())
+    }
+    return [events[bytes(log["topics"][0])].process_log(log) for log in logs]
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    """Compare web3's process_log with LogDecoder on the same batch of logs"""
+    parser = argparse.ArgumentParser(description="Bulk GreetingSet/GreetingUpdated log decoding")
+    parser.add_argument("--logs", type=int, default=50_000)
+    parser.add_argument("--updaters", type=int, default=20, help="distinct updater addresses")
+    parser.add_argument("--abi-file", default="contract_abi.json")
+    args = parser.parse_args()
+
+    with open(args.abi_file, "r") as file:
+        abi = json.load(file)
+    logs = make_logs(abi, args.logs, args.updaters)
+    contract = Web3().eth.contract(abi=abi)
+    decoder = LogDecoder(abi)
+
+    expected, web3_time = timed(decode_with_web3, contract, logs)
+    decoded, fast_time = timed(decoder.decode_logs, logs)
+    if decoded != expected:
+        print(" Decoded events differ from web3's decoding")
+        return
+
+    print("=" * 60)
+    print(f" {args.logs} logs, {args.updaters} updaters; outputs identical")
+    print(f" {'decoder':<12} {'seconds':>9} {'logs/s':>12}")
+    print(f" {'process_log':<12} {web3_time:>9.3f} {args.logs / web3_time:>12,.0f}")
+    print(f" {'LogDecoder':<12} {fast_time:>9.3f} {args.logs / fast_time:>12,.0f}")
+    print(f" Speedup: {web3_time / fast_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import json
+import os
+import time
+from eth_account import Account
+from web3 import Web3
+from parallel_signer import DEFAULT_CHUNK_SIZE, ParallelSigner, build_transactions
+
+def main():
+    """Measure signatures per second for growing numbers of worker processes"""
+    parser = argparse.ArgumentParser(description="Parallel transaction signing throughput")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--transactions", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--abi-file", default="contract_abi.json")
+    args = parser.parse_args()
+
+    # Signing needs no node: a throwaway key and a made-up contract address will do
+    with open(args.abi_file, "r") as file:
+        abi = json.load(file)
+    account = Account.create()
+    contract = Web3().eth.contract(address=Web3.to_checksum_address("0x" + "42" * 20), abi=abi)
+    calls = [contract.functions.setGreeting(f"Offline greeting {i}") for i in range(args.transactions)]
+
+    start = time.perf_counter()
+    # The limits only need to be plausible; nothing is sent
+    gas_limits = [500000] * len(calls)
+    transactions = build_transactions(calls, account.address, 0, gas_limits, 10**9, 1337)
+    build_time = time.perf_counter() - start
+
+    results, reference = [], None
+    for workers in args.workers:
+        with ParallelSigner(account.key, workers, args.chunk_size) as signer:
+            # Start the pool outside the timing, as a long-running job would
+            signer.sign_all(transactions[:workers])
+            start = time.perf_counter()
+            signed = signer.sign_all(transactions)
+            elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = signed
+        elif signed != reference:
+            print(f" {workers} workers produced different signatures")
+            return
+        results.append((workers, elapsed))
+
+    print("=" * 60)
+    print(f" {args.transactions} setGreeting transactions, {os.cpu_count()} CPUs")
+    print(f" Building (ABI encoding): {args.transactions / build_time:,.0f} tx/s")
+    print(f" {'workers':>8} {'seconds':>9} {'sigs/s':>10} {'speedup':>8}")
+    for workers, elapsed in results:
+        print(f" {workers:>8} {elapsed:>9.2f} {args.transactions / elapsed:>10,.0f} "
+              f"{results[0][1] / elapsed:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
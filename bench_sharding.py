@@ -0,0 +1,84 @@
+import argparse
+import time
+from bench_signer_pool import block_interval_middleware
+from client import connect, ganache_url, load_credentials, load_private_keys
+from deloy import compile_contract, deploy_shards
+from sharding import ShardRouter
+from signer_pool import SignerPool
+
+def run(w3, contracts, private_keys, writes, keys, max_in_flight):
+    """Route `writes` greetings from `keys` distinct senders over the shards"""
+    router = ShardRouter(contracts)
+    pool = SignerPool(w3, private_keys, max_in_flight=max_in_flight, chain_id=w3.eth.chain_id)
+    items = ((f"user-{i % keys}", f"Sharded greeting {i}") for i in range(writes))
+
+    start = time.perf_counter()
+    receipts = [receipt for _, _, receipt in pool.submit_all(router.route(items))]
+    elapsed = time.perf_counter() - start
+
+    per_shard = [0] * len(contracts)
+    for i in range(writes):
+        per_shard[router.shard_for(f"user-{i % keys}")] += 1
+    return {
+        "shards": len(contracts),
+        "succeeded": sum(receipt.status for receipt in receipts),
+        "elapsed": elapsed,
+        "tx_per_sec": writes / elapsed,
+        "gas_per_write": sum(receipt.gasUsed for receipt in receipts) / writes,
+        "writes_per_shard": per_shard,
+    }
+
+def main():
+    """Measure aggregate write throughput for growing numbers of shards"""
+    parser = argparse.ArgumentParser(description="Sharded GreetingContract write throughput")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--keys", type=int, default=50, help="distinct routing keys")
+    parser.add_argument("--signers", type=int, default=4)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--block-time", type=float, default=2.0,
+                        help="simulated seconds per block on the in-process chain")
+    parser.add_argument("--in-process", action="store_true",
+                        help="use a fresh eth-tester chain per run instead of Ganache")
+    args = parser.parse_args()
+
+    compiled_sol = compile_contract(save_output=False)
+    results = []
+    for shard_count in args.shards:
+        if args.in_process:
+            from local_chain import LocalChain
+
+            chain = LocalChain()
+            w3 = chain.w3
+            deployer, deployer_key = chain.accounts[0], chain.private_keys[0]
+            private_keys = chain.private_keys[1:]
+        else:
+            w3 = connect(pool_size=args.signers * args.max_in_flight)
+            if not w3.is_connected():
+                print(f" Failed to connect to {ganache_url()}")
+                return
+            deployer, deployer_key = load_credentials()
+            private_keys = load_private_keys()
+
+        if len(private_keys) < args.signers:
+            print(f" Need {args.signers} signer keys, only {len(private_keys)} available")
+            return
+        shards = deploy_shards(w3, deployer, deployer_key, compiled_sol, shard_count,
+                               chain_id=w3.eth.chain_id, info_file=None)
+        contracts = [w3.eth.contract(address=shard["address"], abi=compiled_sol["contracts"]
+                                     ["contract.sol"]["GreetingContract"]["abi"]) for shard in shards]
+        if args.in_process:
+            # Added after deploying: it hides receipts until a wall-clock boundary, not a new block
+            w3.middleware_onion.add(block_interval_middleware(args.block_time), "block_interval")
+        results.append(run(w3, contracts, private_keys[:args.signers], args.writes, args.keys,
+                           args.max_in_flight))
+
+    print("=" * 70)
+    print(f" {args.writes} writes from {args.keys} keys, {args.signers} signers")
+    print(f" {'shards':>7} {'tx/s':>8} {'elapsed':>9} {'gas/write':>10}  writes per shard")
+    for result in results:
+        print(f" {result['shards']:>7} {result['tx_per_sec']:>8.1f} {result['elapsed']:>8.2f}s "
+              f"{result['gas_per_write']:>10.0f}  {result['writes_per_shard']}")
+
+if __name__ == "__main__":
+    main()
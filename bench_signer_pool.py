@@ -0,0 +1,127 @@
+import argparse
+import time
+from eth_account import Account
+from client import connect, ganache_url, load_private_keys
+from signer_pool import SignerPool
+
+DEFAULT_ACCOUNT_SLOTS = 8
+
+def block_interval_middleware(block_time, account_slots=None):
+    """Make receipts appear only at the next `block_time` boundary after sending
+
+    eth-tester mines every transaction on arrival, and its py-evm backend
+    cannot collect several raw transactions into one pending block. Holding
+    each receipt back until the next block boundary models a node with a
+    block interval, while every transaction still really executes in order.
+
+    With `account_slots`, a send is rejected while its sender already has
+    that many transactions waiting for a block, like the per-account limit
+    of a real node's transaction pool.
+    """
+    def factory(make_request, w3):
+        visible_at = {}
+        pending = {}
+
+        def middleware(method, params):
+            now = time.monotonic()
+            if method == "eth_getTransactionReceipt":
+                ready = visible_at.get(params[0], 0)
+                if now < ready:
+                    return {"jsonrpc": "2.0", "result": None}
+            sender = None
+            if method == "eth_sendRawTransaction" and account_slots is not None:
+                sender = Account.recover_transaction(params[0])
+                waiting = pending[sender] = [ready for ready in pending.get(sender, []) if ready > now]
+                if len(waiting) >= account_slots:
+                    return {"jsonrpc": "2.0", "error": {
+                        "code": -32000, "message": f"txpool is full: {sender} has {len(waiting)} pending",
+                    }}
+            response = make_request(method, params)
+            if method == "eth_sendRawTransaction" and "result" in response:
+                next_block = (now // block_time + 1) * block_time
+                visible_at[response["result"]] = next_block
+                if sender is not None:
+                    pending[sender].append(next_block)
+            return response
+
+        return middleware
+
+    return factory
+
+def in_process_setup(block_time, account_slots):
+    """Deploy to a fresh eth-tester chain with a simulated block interval and account limit"""
+    from local_chain import LocalChain
+
+    chain = LocalChain()
+    chain.w3.middleware_onion.add(block_interval_middleware(block_time, account_slots), "block_interval")
+    return chain.w3, chain.contract, chain.private_keys
+
+def run(w3, contract, private_keys, writes, max_in_flight):
+    """Submit `writes` setGreeting calls through a pool of the given keys"""
+    pool = SignerPool(w3, private_keys, max_in_flight=max_in_flight, chain_id=w3.eth.chain_id)
+    calls = (contract.functions.setGreeting(f"Signer pool greeting {i}") for i in range(writes))
+
+    start = time.perf_counter()
+    statuses = [receipt.status for _, _, receipt in pool.submit_all(calls)]
+    elapsed = time.perf_counter() - start
+
+    return {
+        "signers": len(private_keys),
+        "in_flight": len(private_keys) * max_in_flight,
+        "writes": writes,
+        "succeeded": sum(statuses),
+        "elapsed": elapsed,
+        "tx_per_sec": writes / elapsed,
+        "sent_per_signer": pool.sent,
+    }
+
+def main():
+    """Measure write throughput for growing numbers of signers"""
+    parser = argparse.ArgumentParser(description="SignerPool write throughput benchmark")
+    parser.add_argument("--signers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_ACCOUNT_SLOTS,
+                        help="pending transactions per signer")
+    parser.add_argument("--block-time", type=float, default=2.0,
+                        help="simulated seconds per block on the in-process chain")
+    parser.add_argument("--account-slots", type=int, default=DEFAULT_ACCOUNT_SLOTS,
+                        help="pending transactions the in-process node accepts per account")
+    parser.add_argument("--in-process", action="store_true",
+                        help="use a fresh eth-tester chain per run instead of Ganache")
+    args = parser.parse_args()
+
+    results = []
+    for signers in args.signers:
+        if args.in_process:
+            w3, contract, private_keys = in_process_setup(args.block_time, args.account_slots)
+        else:
+            from interact import load_contract
+
+            w3 = connect(pool_size=signers * args.max_in_flight)
+            if not w3.is_connected():
+                print(f" Failed to connect to {ganache_url()}")
+                return
+            contract, _ = load_contract(w3)
+            private_keys = load_private_keys()
+
+        if len(private_keys) < signers:
+            print(f" Skipping {signers} signers: only {len(private_keys)} keys available")
+            continue
+        try:
+            results.append(run(w3, contract, private_keys[:signers], args.writes, args.max_in_flight))
+        except Exception as e:
+            print(f" {signers} signers: send rejected ({e})")
+    if not results:
+        return
+
+    print("=" * 60)
+    print(f" {'signers':>8} {'in-flight':>10} {'tx/s':>10} {'elapsed':>10} {'speedup':>8}")
+    for result in results:
+        speedup = result["tx_per_sec"] / results[0]["tx_per_sec"]
+        print(f" {result['signers']:>8} {result['in_flight']:>10} {result['tx_per_sec']:>10.1f} "
+              f"{result['elapsed']:>9.2f}s {speedup:>7.2f}x")
+    if args.in_process:
+        print(f" The in-process node accepts {args.account_slots} pending transactions per account")
+
+if __name__ == "__main__":
+    main()
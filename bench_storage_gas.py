@@ -0,0 +1,54 @@
+import argparse
+from client import connect, ganache_url
+from deloy import compile_contract
+
+VARIANTS = {
+    "unpacked": "contract_unpacked.sol",
+    "packed": "contract.sol",
+}
+
+def measure_variant(w3, source_file, greeting_lengths):
+    """Deploy one contract variant and record deploy and setGreeting gas"""
+    compiled_sol = compile_contract(source_file=source_file, output_file=None)
+    contract_interface = compiled_sol["contracts"][source_file]["GreetingContract"]
+    account = w3.eth.accounts[0]
+
+    GreetingContract = w3.eth.contract(
+        abi=contract_interface["abi"],
+        bytecode=contract_interface["evm"]["bytecode"]["object"],
+    )
+    tx_hash = GreetingContract.constructor("Hello, Blockchain World!").transact({"from": account})
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+    contract = w3.eth.contract(address=receipt.contractAddress, abi=contract_interface["abi"])
+
+    results = {"deploy": receipt.gasUsed}
+    for length in greeting_lengths:
+        tx_hash = contract.functions.setGreeting("x" * length).transact({"from": account})
+        results[f"setGreeting[{length}]"] = w3.eth.wait_for_transaction_receipt(tx_hash).gasUsed
+    return results
+
+def main():
+    """Compare gas for the unpacked and packed history layouts"""
+    parser = argparse.ArgumentParser(description="Compare GreetingContract storage layouts")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[1, 31, 32, 100, 200],
+                        help="greeting lengths in bytes")
+    args = parser.parse_args()
+
+    w3 = connect()
+    if not w3.is_connected():
+        print(f" Failed to connect to {ganache_url()}")
+        return
+
+    results = {
+        name: measure_variant(w3, source_file, args.lengths)
+        for name, source_file in VARIANTS.items()
+    }
+
+    print("=" * 60)
+    print(f" {'case':<20} {'unpacked':>10} {'packed':>10} {'saved':>10}")
+    for case, before in results["unpacked"].items():
+        after = results["packed"][case]
+        print(f" {case:<20} {before:>10} {after:>10} {before - after:>10}")
+
+if __name__ == "__main__":
+    main()
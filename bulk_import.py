@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import sys
+from client import connect, ganache_url, load_credentials
+from interact import load_contract
+from metrics import export_from_env
+
+MAX_GREETING_BYTES = 200
+DEFAULT_OUTPUT = "import_results.jsonl"
+DEFAULT_MAX_IN_FLIGHT = 16
+
+def parse_greeting(raw_line):
+    """Return (greeting, error) for one input line
+
+    A line is either a JSON string or an object with a "greeting" key.
+    Greetings must be 1-200 bytes of UTF-8, the same rule setGreeting
+    enforces on-chain, so invalid ones are rejected before spending gas.
+    """
+    try:
+        value = json.loads(raw_line)
+    except json.JSONDecodeError as e:
+        return None, f"invalid JSON: {e}"
+
+    greeting = value.get("greeting") if isinstance(value, dict) else value
+    if not isinstance(greeting, str):
+        return None, "expected a string or an object with a \"greeting\" string"
+
+    size = len(greeting.encode("utf-8"))
+    if size == 0:
+        return None, "Greeting cannot be empty"
+    if size > MAX_GREETING_BYTES:
+        return None, f"Greeting too long ({size} bytes, max {MAX_GREETING_BYTES})"
+    return greeting, None
+
+def load_progress(output_path):
+    """Read a previous results file and return (finished_lines, pending)
+
+    finished_lines holds the line numbers that already have a final
+    result; pending maps line numbers to the hash of a transaction that was
+    sent but whose receipt was never recorded.
+    """
+    finished, pending = set(), {}
+    if not os.path.exists(output_path):
+        return finished, pending
+
+    with open(output_path, "r") as file:
+        for raw in file:
+            try:
+                record = json.loads(raw)
+            except json.JSONDecodeError:
+                # A crash can leave a truncated last line
+                continue
+            line = record["line"]
+            if record["status"] == "pending":
+                pending[line] = record["tx_hash"]
+            else:
+                finished.add(line)
+                pending.pop(line, None)
+    return finished, pending
+
+class ResultWriter:
+    """Appends one JSON record per line to the results file, flushed immediately"""
+
+    def __init__(self, path):
+        self.file = open(path, "a")
+        self.counts = {}
+
+    def write(self, line, status, **fields):
+        self.file.write(json.dumps({"line": line, "status": status, **fields}) + "\n")
+        self.file.flush()
+        if status != "pending":
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+    def receipt(self, line, tx_hash, receipt):
+        self.write(
+            line,
+            "success" if receipt.status == 1 else "failed",
+            tx_hash=tx_hash.hex(),
+            gas_used=receipt.gasUsed,
+            block_number=receipt.blockNumber,
+        )
+
+    def close(self):
+        self.file.close()
+
+def import_greetings(w3, contract, account, private_key, lines, output_path,
+                     max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+    """Submit one setGreeting per input line and record the results
+
+    `lines` is an iterable of raw input lines, numbered from 1. Each
+    transaction is recorded as "pending" when it is sent, and again with
+    its receipt once it is mined. A rerun with the same input and output
+    skips finished lines and waits for (or, if the node no longer knows
+    it, resends) every transaction still pending. Returns the final status
+    counts of this run.
+    """
+    from hexbytes import HexBytes
+    from web3.exceptions import TransactionNotFound
+    from gas_planner import GasPlanner
+    from nonce_manager import PipelinedSubmitter
+
+    finished, pending = load_progress(output_path)
+    submitter = PipelinedSubmitter(
+        w3, account, private_key, max_in_flight=max_in_flight,
+        gas_planner=GasPlanner(w3), chain_id=w3.eth.chain_id,
+    )
+    results = ResultWriter(output_path)
+
+    try:
+        # Transactions sent by a crashed run
+        for line, tx_hash in pending.items():
+            try:
+                w3.eth.get_transaction(tx_hash)
+            except TransactionNotFound:
+                continue
+            submitter.track(HexBytes(tx_hash), tag=line)
+            finished.add(line)
+
+        for line, raw_line in enumerate(lines, start=1):
+            if line in finished or not raw_line.strip():
+                continue
+
+            greeting, error = parse_greeting(raw_line)
+            if error:
+                results.write(line, "invalid", error=error)
+                continue
+
+            for tag, tx_hash, receipt in submitter.wait_for_slot():
+                results.receipt(tag, tx_hash, receipt)
+            try:
+                tx_hash = submitter.send(contract.functions.setGreeting(greeting), tag=line)
+            except Exception as e:
+                results.write(line, "error", error=str(e))
+                continue
+            results.write(line, "pending", tx_hash=tx_hash.hex())
+
+        for tag, tx_hash, receipt in submitter.drain():
+            results.receipt(tag, tx_hash, receipt)
+    finally:
+        results.close()
+
+    return results.counts
+
+def main():
+    """Import greetings from a JSONL file (or stdin) without the interactive menu"""
+    parser = argparse.ArgumentParser(description="Bulk setGreeting import from JSONL")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="JSONL file with one greeting per line, or - for stdin")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help="results JSONL; rerunning with the same file resumes the import")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT)
+    args = parser.parse_args()
+
+    account, private_key = load_credentials()
+    if not private_key or not account:
+        print(" PRIVATE_KEY and ACCOUNT_ADDRESS must be set in .env", file=sys.stderr)
+        return 1
+
+    w3 = connect()
+    if not w3.is_connected():
+        print(f" Failed to connect to {ganache_url()}", file=sys.stderr)
+        return 1
+
+    contract, contract_address = load_contract(w3)
+    print(f" Importing greetings into {contract_address}")
+
+    if args.input == "-":
+        counts = import_greetings(w3, contract, account, private_key, sys.stdin,
+                                  args.output, args.max_in_flight)
+    else:
+        with open(args.input, "r") as file:
+            counts = import_greetings(w3, contract, account, private_key, file,
+                                      args.output, args.max_in_flight)
+
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f" Done: {summary or 'nothing to import'}")
+    print(f" Results written to {args.output}")
+    export_from_env()
+    return 0 if not counts.get("failed") and not counts.get("error") else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
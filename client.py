@@ -0,0 +1,145 @@
+import functools
+import os
+import random
+import time
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+DEFAULT_GANACHE_URL = "http://127.0.0.1:7545"
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.1
+DEFAULT_MAX_BACKOFF = 2.0
+
+# HTTP statuses that mean "try again later" rather than "bad request"
+RETRY_STATUSES = {429, 502, 503, 504}
+
+# Sends are not retried: the node signs and assigns the nonce for eth_sendTransaction,
+# so a retry could send a second transaction, and a retried eth_sendRawTransaction
+# whose first attempt timed out after reaching the node fails with "already known"
+# or "nonce too low", which senders would take for a stale nonce and re-sign.
+NO_RETRY_METHODS = {"eth_sendTransaction", "eth_sendRawTransaction"}
+
+def ganache_url():
+    """RPC endpoint from GANACHE_URL, defaulting to a local Ganache"""
+    return os.getenv("GANACHE_URL", DEFAULT_GANACHE_URL)
+
+def with_0x(value):
+    """Add the 0x prefix to a hex string that lacks it"""
+    return value if value.startswith("0x") else "0x" + value
+
+def load_credentials():
+    """Return (account, private_key) from the .env file, or (None, None)"""
+    private_key = os.getenv("PRIVATE_KEY")
+    account = os.getenv("ACCOUNT_ADDRESS")
+    if not private_key or not account:
+        return None, None
+    return with_0x(account), with_0x(private_key)
+
+def load_private_keys():
+    """Return the keys listed in PRIVATE_KEYS (comma separated), else [PRIVATE_KEY]"""
+    keys = os.getenv("PRIVATE_KEYS") or os.getenv("PRIVATE_KEY") or ""
+    return [with_0x(key.strip()) for key in keys.split(",") if key.strip()]
+
+def make_session(pool_size=DEFAULT_POOL_SIZE):
+    """requests.Session keeping up to `pool_size` keep-alive connections to the node"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def is_transient(error):
+    """Whether a failed request is worth retrying"""
+    import requests
+
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRY_STATUSES
+    return False
+
+def retry_middleware(retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF):
+    """Provider middleware retrying transient failures with full-jitter backoff
+
+    Attempt n waits a random time between 0 and min(max_backoff,
+    backoff * 2**n), so clients that failed together do not retry together.
+    """
+    def factory(make_request, w3):
+        def middleware(method, params):
+            if method in NO_RETRY_METHODS:
+                return make_request(method, params)
+            for attempt in range(retries + 1):
+                try:
+                    return make_request(method, params)
+                except Exception as e:
+                    if attempt == retries or not is_transient(e):
+                        raise
+                time.sleep(random.uniform(0, min(max_backoff, backoff * 2 ** attempt)))
+
+        return middleware
+
+    return factory
+
+@functools.lru_cache(maxsize=None)
+def _pooled_provider_class():
+    # Defined on first use so importing this module does not import web3
+    from web3 import HTTPProvider
+
+    class PooledHTTPProvider(HTTPProvider):
+        """HTTPProvider sending every request through one shared session
+
+        web3 caches one session per thread; sharing a single session lets
+        worker threads reuse the same pool of keep-alive connections.
+        """
+
+        def __init__(self, endpoint_uri, session, request_kwargs=None):
+            super().__init__(endpoint_uri, request_kwargs=request_kwargs)
+            self.session = session
+
+        def make_request(self, method, params):
+            request_data = self.encode_rpc_request(method, params)
+            response = self.session.post(self.endpoint_uri, data=request_data,
+                                         **self.get_request_kwargs())
+            response.raise_for_status()
+            return self.decode_rpc_response(response.content)
+
+    return PooledHTTPProvider
+
+def connect(url=None, pool_size=None, timeout=None, retries=None, backoff=DEFAULT_BACKOFF,
+            metrics=None):
+    """Build a Web3 instance on a pooled, retrying HTTP provider
+
+    Unset options come from RPC_POOL_SIZE, RPC_TIMEOUT and RPC_RETRIES, then
+    the defaults above. Requests are recorded in `metrics`, or in the shared
+    registry when METRICS_FILE is set. The connection is not checked; call
+    is_connected().
+    """
+    from web3 import Web3
+    import metrics as metrics_module
+
+    pool_size = pool_size or int(os.getenv("RPC_POOL_SIZE", DEFAULT_POOL_SIZE))
+    timeout = timeout or float(os.getenv("RPC_TIMEOUT", DEFAULT_TIMEOUT))
+    if retries is None:
+        retries = int(os.getenv("RPC_RETRIES", DEFAULT_RETRIES))
+
+    provider = _pooled_provider_class()(
+        url or ganache_url(),
+        session=make_session(pool_size),
+        request_kwargs={"timeout": timeout},
+    )
+    # Replaces web3's own retry middleware, which retries without any delay
+    middlewares = [retry_middleware(retries, backoff)]
+    if metrics is None and metrics_module.enabled():
+        metrics = metrics_module.REGISTRY
+    if metrics is not None:
+        # Outermost, so latency includes retries and errors are counted once
+        middlewares.insert(0, metrics_module.metrics_middleware(metrics))
+    provider.middlewares = middlewares
+    return Web3(provider)
@@ -8,6 +8,15 @@ contract GreetingContract {
     uint256 public greetingCount;
     
     // Struct to store greeting history
+    // updatedBy (20 bytes) and timestamp (12 bytes) share one storage slot
+    struct GreetingRecord {
+        string message;
+        address updatedBy;
+        uint96 timestamp;
+    }
+    
+    // History entry as returned by the views, with a uint256 timestamp so
+    // their ABI is unchanged by the packed storage layout
     struct GreetingHistory {
         string message;
         address updatedBy;
@@ -15,7 +24,11 @@ contract GreetingContract {
     }
     
     // Array to store all greeting history
-    GreetingHistory[] public greetingHistories;
+    GreetingRecord[] private greetingRecords;
+    
+    // Rolling hash over every history entry, so a cached copy can be
+    // checked with one call (see history_checkpoint.py)
+    bytes32 public historyHash;
     
     // Events
     event GreetingUpdated(
@@ -38,11 +51,12 @@ contract GreetingContract {
         greetingCount = 1;
         
         // Add initial greeting to history
-        greetingHistories.push(GreetingHistory({
+        greetingRecords.push(GreetingRecord({
             message: _initialGreeting,
             updatedBy: msg.sender,
-            timestamp: block.timestamp
+            timestamp: uint96(block.timestamp)
         }));
+        historyHash = _nextHistoryHash(bytes32(0), _initialGreeting);
         
         emit GreetingSet(_initialGreeting, msg.sender, block.timestamp);
     }
@@ -54,26 +68,87 @@ contract GreetingContract {
     
     // Function to update greeting
     function setGreeting(string memory _newGreeting) public {
-        require(bytes(_newGreeting).length > 0, "Greeting cannot be empty");
-        require(bytes(_newGreeting).length <= 200, "Greeting too long (max 200 characters)");
+        _validateGreeting(_newGreeting);
         
         string memory oldGreeting = greeting;
         greeting = _newGreeting;
         greetingCount++;
         
-        // Add to history
-        greetingHistories.push(GreetingHistory({
+        _recordGreeting(oldGreeting, _newGreeting);
+        historyHash = _nextHistoryHash(historyHash, _newGreeting);
+    }
+    
+    // Function to apply several greeting updates in one transaction
+    // Each greeting is validated, added to history and announced with its own
+    // GreetingUpdated event, exactly as if setGreeting were called for each in
+    // turn. The current greeting, the count and the history hash are written
+    // to storage once.
+    function setGreetings(string[] calldata _newGreetings) public {
+        require(_newGreetings.length > 0, "No greetings given");
+        
+        string memory oldGreeting = greeting;
+        bytes32 hash = historyHash;
+        for (uint256 i = 0; i < _newGreetings.length; i++) {
+            string memory newGreeting = _newGreetings[i];
+            _validateGreeting(newGreeting);
+            _recordGreeting(oldGreeting, newGreeting);
+            hash = _nextHistoryHash(hash, newGreeting);
+            oldGreeting = newGreeting;
+        }
+        
+        greeting = oldGreeting;
+        greetingCount += _newGreetings.length;
+        historyHash = hash;
+    }
+    
+    function _validateGreeting(string memory _greeting) private pure {
+        require(bytes(_greeting).length > 0, "Greeting cannot be empty");
+        require(bytes(_greeting).length <= 200, "Greeting too long (max 200 characters)");
+    }
+    
+    // Add a greeting to history and emit its update event
+    function _recordGreeting(string memory _oldGreeting, string memory _newGreeting) private {
+        greetingRecords.push(GreetingRecord({
             message: _newGreeting,
             updatedBy: msg.sender,
-            timestamp: block.timestamp
+            timestamp: uint96(block.timestamp)
         }));
         
-        emit GreetingUpdated(oldGreeting, _newGreeting, msg.sender, block.timestamp);
+        emit GreetingUpdated(_oldGreeting, _newGreeting, msg.sender, block.timestamp);
+    }
+    
+    // Fold one new history entry into the rolling hash
+    function _nextHistoryHash(bytes32 _previous, string memory _message) private view returns (bytes32) {
+        return keccak256(abi.encode(_previous, keccak256(bytes(_message)), msg.sender, block.timestamp));
+    }
+    
+    // Widen a stored entry to the view struct
+    function _toHistory(GreetingRecord storage _record) private view returns (GreetingHistory memory) {
+        return GreetingHistory({
+            message: _record.message,
+            updatedBy: _record.updatedBy,
+            timestamp: _record.timestamp
+        });
+    }
+    
+    // Getter for one history entry, same ABI as the former public array getter
+    function greetingHistories(uint256 index) public view returns (
+        string memory message,
+        address updatedBy,
+        uint256 timestamp
+    ) {
+        GreetingRecord storage record = greetingRecords[index];
+        return (record.message, record.updatedBy, record.timestamp);
     }
     
     // Function to get greeting history count
     function getHistoryCount() public view returns (uint256) {
-        return greetingHistories.length;
+        return greetingRecords.length;
+    }
+    
+    // Function to get the history length and hash in one call
+    function getHistoryCheckpoint() public view returns (uint256 count, bytes32 accumulator) {
+        return (greetingRecords.length, historyHash);
     }
     
     // Function to get specific greeting from history
@@ -82,14 +157,50 @@ contract GreetingContract {
         address updatedBy,
         uint256 timestamp
     ) {
-        require(index < greetingHistories.length, "Index out of bounds");
-        GreetingHistory memory history = greetingHistories[index];
-        return (history.message, history.updatedBy, history.timestamp);
+        require(index < greetingRecords.length, "Index out of bounds");
+        GreetingRecord storage record = greetingRecords[index];
+        return (record.message, record.updatedBy, record.timestamp);
+    }
+    
+    // Function to get a page of greeting history, oldest first
+    function getHistoryRange(uint256 start, uint256 count) public view returns (GreetingHistory[] memory) {
+        uint256 length = greetingRecords.length;
+        if (start >= length) {
+            return new GreetingHistory[](0);
+        }
+        if (count > length - start) {
+            count = length - start;
+        }
+        
+        GreetingHistory[] memory page = new GreetingHistory[](count);
+        for (uint256 i = 0; i < count; i++) {
+            page[i] = _toHistory(greetingRecords[start + i]);
+        }
+        return page;
+    }
+    
+    // Function to get a page of greeting history, newest first
+    // offset 0 is the most recent entry
+    function getHistoryRangeReverse(uint256 offset, uint256 count) public view returns (GreetingHistory[] memory) {
+        uint256 length = greetingRecords.length;
+        if (offset >= length) {
+            return new GreetingHistory[](0);
+        }
+        if (count > length - offset) {
+            count = length - offset;
+        }
+        
+        GreetingHistory[] memory page = new GreetingHistory[](count);
+        for (uint256 i = 0; i < count; i++) {
+            page[i] = _toHistory(greetingRecords[length - 1 - offset - i]);
+        }
+        return page;
     }
     
     // Function to get all greeting history
+    // Unbounded: prefer getHistoryRange once history grows large
     function getAllHistory() public view returns (GreetingHistory[] memory) {
-        return greetingHistories;
+        return getHistoryRange(0, greetingRecords.length);
     }
     
     // Function to get contract info
@@ -99,6 +210,6 @@ contract GreetingContract {
         uint256 totalGreetings,
         uint256 historyLength
     ) {
-        return (greeting, owner, greetingCount, greetingHistories.length);
+        return (greeting, owner, greetingCount, greetingRecords.length);
     }
 }
\ No newline at end of file
@@ -0,0 +1,108 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+// Opt-in variant of GreetingContract without the on-chain history array.
+// Only the current greeting, the count and a rolling hash of the history are
+// stored; the entries themselves live in the GreetingSet/GreetingUpdated logs
+// and are rebuilt and checked against historyHash by history_hash.py.
+
+contract GreetingContract {
+    // State variables
+    string private greeting;
+    address public owner;
+    uint256 public greetingCount;
+
+    // Rolling hash of every history entry, starting from bytes32(0):
+    // keccak256(abi.encode(previous, keccak256(bytes(message)), updatedBy, timestamp))
+    bytes32 public historyHash;
+
+    // Events
+    event GreetingUpdated(
+        string oldGreeting,
+        string newGreeting,
+        address indexed updatedBy,
+        uint256 timestamp
+    );
+
+    event GreetingSet(
+        string greeting,
+        address indexed setBy,
+        uint256 timestamp
+    );
+
+    // Constructor
+    constructor(string memory _initialGreeting) {
+        greeting = _initialGreeting;
+        owner = msg.sender;
+        greetingCount = 1;
+        historyHash = _nextHistoryHash(bytes32(0), _initialGreeting);
+
+        emit GreetingSet(_initialGreeting, msg.sender, block.timestamp);
+    }
+
+    // Function to get current greeting
+    function getGreeting() public view returns (string memory) {
+        return greeting;
+    }
+
+    // Function to update greeting
+    function setGreeting(string memory _newGreeting) public {
+        _validateGreeting(_newGreeting);
+
+        emit GreetingUpdated(greeting, _newGreeting, msg.sender, block.timestamp);
+
+        greeting = _newGreeting;
+        greetingCount++;
+        historyHash = _nextHistoryHash(historyHash, _newGreeting);
+    }
+
+    // Function to apply several greeting updates in one transaction
+    // The hash is folded in memory and written to storage once.
+    function setGreetings(string[] calldata _newGreetings) public {
+        require(_newGreetings.length > 0, "No greetings given");
+
+        string memory oldGreeting = greeting;
+        bytes32 hash = historyHash;
+        for (uint256 i = 0; i < _newGreetings.length; i++) {
+            string memory newGreeting = _newGreetings[i];
+            _validateGreeting(newGreeting);
+            emit GreetingUpdated(oldGreeting, newGreeting, msg.sender, block.timestamp);
+            hash = _nextHistoryHash(hash, newGreeting);
+            oldGreeting = newGreeting;
+        }
+
+        greeting = oldGreeting;
+        greetingCount += _newGreetings.length;
+        historyHash = hash;
+    }
+
+    function _validateGreeting(string memory _greeting) private pure {
+        require(bytes(_greeting).length > 0, "Greeting cannot be empty");
+        require(bytes(_greeting).length <= 200, "Greeting too long (max 200 characters)");
+    }
+
+    function _nextHistoryHash(bytes32 _previous, string memory _message) private view returns (bytes32) {
+        return keccak256(abi.encode(_previous, keccak256(bytes(_message)), msg.sender, block.timestamp));
+    }
+
+    // Function to get greeting history count
+    // Every update adds one history entry, so this equals greetingCount
+    function getHistoryCount() public view returns (uint256) {
+        return greetingCount;
+    }
+
+    // Function to get the history length and hash in one call
+    function getHistoryCheckpoint() public view returns (uint256 count, bytes32 accumulator) {
+        return (greetingCount, historyHash);
+    }
+
+    // Function to get contract info
+    function getContractInfo() public view returns (
+        string memory currentGreeting,
+        address contractOwner,
+        uint256 totalGreetings,
+        uint256 historyLength
+    ) {
+        return (greeting, owner, greetingCount, greetingCount);
+    }
+}
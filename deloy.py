@@ -1,59 +1,130 @@
-from web3 import Web3
-from solcx import compile_standard, install_solc
+from eth_utils import keccak
+from packaging.version import Version
+import hashlib
 import json
 import os
 from pathlib import Path
-from dotenv import load_dotenv
+from client import connect, ganache_url, load_credentials
+from gas_planner import GasPlanner
+from metrics import REGISTRY, export_from_env
 
-# Load environment variables
-load_dotenv()
+SOLC_VERSION = "0.8.0"
+COMPILE_CACHE_DIR = Path(".solc_cache")
 
-def compile_contract():
-    """Compile the Solidity contract"""
+def build_compiler_input(source_file, optimize=False, optimizer_runs=200):
+    """Build the solc standard-JSON input for a contract source file"""
+    with open(source_file, "r") as file:
+        contract_source_code = file.read()
+    
+    settings = {
+        "outputSelection": {
+            "*": {
+                "*": ["abi", "metadata", "evm.bytecode", "evm.sourceMap"]
+            }
+        }
+    }
+    if optimize:
+        settings["optimizer"] = {"enabled": True, "runs": optimizer_runs}
+    
+    return {
+        "language": "Solidity",
+        "sources": {source_file: {"content": contract_source_code}},
+        "settings": settings,
+    }
+
+def compile_cache_key(compiler_input):
+    """Hash of the compiler version and the full standard-JSON input"""
+    payload = json.dumps({"solc": SOLC_VERSION, "input": compiler_input}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def artifact_matches(compiled_sol, compiler_input):
+    """Check whether a saved solc output was built from this exact input
+
+    solc embeds the compiler version, optimizer settings and the keccak256
+    of every source in each contract's metadata, so a previously written
+    compiled_contract.json can be reused without recompiling.
+    """
+    optimizer = compiler_input["settings"].get("optimizer", {"enabled": False, "runs": 200})
+    for source_file, source in compiler_input["sources"].items():
+        contracts = compiled_sol.get("contracts", {}).get(source_file)
+        if not contracts:
+            return False
+        source_hash = "0x" + keccak(text=source["content"]).hex()
+        for contract_interface in contracts.values():
+            metadata = json.loads(contract_interface["metadata"])
+            if not metadata["compiler"]["version"].startswith(SOLC_VERSION + "+"):
+                return False
+            if metadata["sources"][source_file]["keccak256"] != source_hash:
+                return False
+            if metadata["settings"]["optimizer"] != optimizer:
+                return False
+    return True
+
+def compile_contract(source_file="contract.sol", optimize=False, optimizer_runs=200,
+                     output_file="compiled_contract.json", save_output=True):
+    """Compile the Solidity contract, reusing cached output when possible
+    
+    Outputs are cached under .solc_cache/ keyed by a hash of the source,
+    compiler version and settings. An existing output_file built from the
+    same input also counts as a hit, so unchanged sources never need solc.
+    With save_output=False the artifact is only read, never written.
+    """
     print(" Compiling contract...")
     
-    # Install specific Solidity version
-    install_solc("0.8.0")
+    compiler_input = build_compiler_input(source_file, optimize, optimizer_runs)
+    cache_file = COMPILE_CACHE_DIR / f"{compile_cache_key(compiler_input)}.json"
     
-    # Read the contract file
-    with open("contract.sol", "r") as file:
-        contract_source_code = file.read()
+    compiled_sol = None
+    if cache_file.exists():
+        with open(cache_file, "r") as file:
+            compiled_sol = json.load(file)
+        print(" Using cached compilation")
+    elif output_file and os.path.exists(output_file):
+        with open(output_file, "r") as file:
+            saved_sol = json.load(file)
+        if artifact_matches(saved_sol, compiler_input):
+            compiled_sol = saved_sol
+            print(f" {output_file} is up to date")
+        else:
+            print(f" {output_file} has no up-to-date build of {source_file}; recompiling")
     
-    # Compile the contract
-    compiled_sol = compile_standard(
-        {
-            "language": "Solidity",
-            "sources": {"contract.sol": {"content": contract_source_code}},
-            "settings": {
-                "outputSelection": {
-                    "*": {
-                        "*": ["abi", "metadata", "evm.bytecode", "evm.sourceMap"]
-                    }
-                }
-            },
-        },
-        solc_version="0.8.0",
-    )
+    if compiled_sol is None:
+        from solcx import compile_standard, get_installed_solc_versions, install_solc
+        
+        # Only hit the network when the compiler is not installed yet
+        if Version(SOLC_VERSION) not in get_installed_solc_versions():
+            install_solc(SOLC_VERSION)
+        
+        compiled_sol = compile_standard(compiler_input, solc_version=SOLC_VERSION)
+        print(" Contract compiled successfully!")
+    
+    if not cache_file.exists():
+        COMPILE_CACHE_DIR.mkdir(exist_ok=True)
+        with open(cache_file, "w") as file:
+            json.dump(compiled_sol, file)
     
     # Save compiled contract
-    with open("compiled_contract.json", "w") as file:
-        json.dump(compiled_sol, file, indent=4)
+    if output_file and save_output:
+        with open(output_file, "w") as file:
+            json.dump(compiled_sol, file, indent=4)
     
-    print(" Contract compiled successfully!")
     return compiled_sol
 
-def deploy_contract(w3, account, private_key, compiled_sol):
+def deploy_contract(w3, account, private_key, compiled_sol, gas_planner=None,
+                    source_file="contract.sol"):
     """Deploy the contract to the blockchain"""
     print("\n Deploying contract...")
+    gas_planner = gas_planner or GasPlanner(w3)
     
     # Get contract data
-    contract_interface = compiled_sol["contracts"]["contract.sol"]["GreetingContract"]
+    contract_interface = compiled_sol["contracts"][source_file]["GreetingContract"]
     bytecode = contract_interface["evm"]["bytecode"]["object"]
     abi = contract_interface["abi"]
     
     # Save ABI for later use
     with open("contract_abi.json", "w") as file:
         json.dump(abi, file, indent=4)
+    REGISTRY.register_abi(abi)
     
     # Create contract instance
     GreetingContract = w3.eth.contract(abi=abi, bytecode=bytecode)
@@ -61,30 +132,34 @@ def deploy_contract(w3, account, private_key, compiled_sol):
     # Get nonce
     nonce = w3.eth.get_transaction_count(account)
     
-    # Build transaction
+    # Build transaction, sizing the gas limit from an estimate
     initial_greeting = "Hello, Blockchain World!"
-    transaction = GreetingContract.constructor(initial_greeting).build_transaction({
+    constructor = GreetingContract.constructor(initial_greeting)
+    transaction = constructor.build_transaction({
         "chainId": 1337,  # Ganache default chain ID
         "from": account,
         "nonce": nonce,
-        "gas": 2000000,
-        "gasPrice": w3.eth.gas_price,
+        "gas": gas_planner.estimate_gas(constructor, account),
+        "gasPrice": gas_planner.gas_price(),
     })
     
     # Sign transaction
-    signed_txn = w3.eth.account.sign_transaction(transaction, private_key=private_key)
+    with REGISTRY.time("sign", "constructor"):
+        signed_txn = w3.eth.account.sign_transaction(transaction, private_key=private_key)
     
     # Send transaction
     print(" Sending transaction...")
-    tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+    with REGISTRY.time("send", "constructor"):
+        tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
     
     # Wait for transaction receipt
     print(" Waiting for transaction receipt...")
-    tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+    with REGISTRY.time("receipt", "constructor"):
+        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
     
     print(f" Contract deployed successfully!")
     print(f" Contract Address: {tx_receipt.contractAddress}")
-    print(f" Gas Used: {tx_receipt.gasUsed}")
+    print(f" Gas Used: {tx_receipt.gasUsed} (limit {transaction['gas']})")
     print(f" Transaction Hash: {tx_hash.hex()}")
     
     # Save deployment info
@@ -93,7 +168,9 @@ def deploy_contract(w3, account, private_key, compiled_sol):
         "transaction_hash": tx_hash.hex(),
         "deployer_address": account,
         "initial_greeting": initial_greeting,
-        "gas_used": tx_receipt.gasUsed
+        "gas_used": tx_receipt.gasUsed,
+        "source_file": source_file,
+        "optimizer": json.loads(contract_interface["metadata"])["settings"]["optimizer"]
     }
     
     with open("deployment_info.json", "w") as file:
@@ -101,6 +178,94 @@ def deploy_contract(w3, account, private_key, compiled_sol):
     
     return tx_receipt.contractAddress, abi
 
+def deploy_shards(w3, account, private_key, compiled_sol, count, gas_planner=None,
+                  source_file="contract.sol", existing=(), chain_id=1337,
+                  info_file="deployment_info.json"):
+    """Deploy `count` contract instances at once, keeping existing ones that match
+    
+    An address in `existing` is kept as the shard at its position when its
+    on-chain code equals the runtime code of the compiled contract, which an
+    eth_call of the creation code returns without sending anything. The
+    missing instances are signed with consecutive local nonces, sent back to
+    back and their receipts collected together. Returns the shard records;
+    with an `info_file` they, and the ABI, are also saved for the other scripts.
+    """
+    from nonce_manager import NonceManager
+    from receipt_collector import ReceiptCollector
+    
+    print(f"\n Deploying {count} contract instances...")
+    gas_planner = gas_planner or GasPlanner(w3)
+    
+    contract_interface = compiled_sol["contracts"][source_file]["GreetingContract"]
+    bytecode = contract_interface["evm"]["bytecode"]["object"]
+    abi = contract_interface["abi"]
+    REGISTRY.register_abi(abi)
+    
+    initial_greeting = "Hello, Blockchain World!"
+    constructor = w3.eth.contract(abi=abi, bytecode=bytecode).constructor(initial_greeting)
+    runtime_code = w3.eth.call({"from": account, "data": constructor.data_in_transaction})
+    
+    shards = [None] * count
+    for i, address in enumerate(list(existing)[:count]):
+        if w3.eth.get_code(address) == runtime_code:
+            shards[i] = {"address": address, "transaction_hash": None, "gas_used": 0}
+            print(f" Shard {i}: code matches, keeping {address}")
+    
+    missing = [i for i, shard in enumerate(shards) if shard is None]
+    if missing:
+        nonces = NonceManager(w3, account)
+        gas = gas_planner.estimate_gas(constructor, account)
+        gas_price = gas_planner.gas_price()
+        with ReceiptCollector(w3, poll_interval=0.1) as collector:
+            futures = {}
+            for i in missing:
+                transaction = constructor.build_transaction({
+                    "chainId": chain_id,
+                    "from": account,
+                    "nonce": nonces.next_nonce(),
+                    "gas": gas,
+                    "gasPrice": gas_price,
+                })
+                signed_txn = w3.eth.account.sign_transaction(transaction, private_key=private_key)
+                futures[i] = collector.watch(w3.eth.send_raw_transaction(signed_txn.rawTransaction))
+            print(f" Sent {len(missing)} deployments, waiting for receipts...")
+            for i, future in futures.items():
+                tx_receipt = future.result()
+                if tx_receipt.status != 1:
+                    raise RuntimeError(f"Deployment of shard {i} failed: {tx_receipt.transactionHash.hex()}")
+                shards[i] = {
+                    "address": tx_receipt.contractAddress,
+                    "transaction_hash": tx_receipt.transactionHash.hex(),
+                    "gas_used": tx_receipt.gasUsed,
+                }
+                print(f" Shard {i}: deployed at {tx_receipt.contractAddress}")
+    
+    if info_file:
+        with open("contract_abi.json", "w") as file:
+            json.dump(abi, file, indent=4)
+        deployment_info = {
+            "contract_address": shards[0]["address"],
+            "shards": shards,
+            "deployer_address": account,
+            "initial_greeting": initial_greeting,
+            "source_file": source_file,
+            "optimizer": json.loads(contract_interface["metadata"])["settings"]["optimizer"]
+        }
+        with open(info_file, "w") as file:
+            json.dump(deployment_info, file, indent=4)
+    
+    return shards
+
+def existing_shard_addresses(info_file="deployment_info.json"):
+    """Addresses recorded by an earlier deployment, shard 0 first"""
+    if not os.path.exists(info_file):
+        return []
+    with open(info_file, "r") as file:
+        deployment_info = json.load(file)
+    if "shards" in deployment_info:
+        return [shard["address"] for shard in deployment_info["shards"]]
+    return [deployment_info["contract_address"]]
+
 def main():
     """Main deployment function"""
     print("=" * 60)
@@ -109,12 +274,11 @@ def main():
     
     # Connect to Ganache
     print("\n Connecting to Ganache...")
-    ganache_url = os.getenv("GANACHE_URL", "http://127.0.0.1:7545")
-    w3 = Web3(Web3.HTTPProvider(ganache_url))
+    w3 = connect()
     
     if not w3.is_connected():
         print(" Failed to connect to Ganache!")
-        print(f" Make sure Ganache is running on {ganache_url}")
+        print(f" Make sure Ganache is running on {ganache_url()}")
         return
     
     print(" Connected to Ganache!")
@@ -122,8 +286,7 @@ def main():
     print(f"  Block Number: {w3.eth.block_number}")
     
     # Get account from environment or Ganache
-    private_key = os.getenv("PRIVATE_KEY")
-    account = os.getenv("ACCOUNT_ADDRESS")
+    account, private_key = load_credentials()
     
     if not private_key or not account:
         print("\n  No private key found in .env file!")
@@ -134,21 +297,28 @@ def main():
         print(f"   ACCOUNT_ADDRESS={account}")
         return
     
-    # Validate account
-    if not account.startswith('0x'):
-        account = '0x' + account
-    if not private_key.startswith('0x'):
-        private_key = '0x' + private_key
-    
     print(f"\n Deployer Account: {account}")
     print(f" Balance: {w3.from_wei(w3.eth.get_balance(account), 'ether')} ETH")
     
     try:
-        # Compile contract
-        compiled_sol = compile_contract()
+        # Compile contract (set SOLC_OPTIMIZE=1 to enable the optimizer)
+        optimize = os.getenv("SOLC_OPTIMIZE", "").lower() in ("1", "true", "yes")
+        optimizer_runs = int(os.getenv("SOLC_OPTIMIZER_RUNS", "200"))
+        # CONTRACT_SOURCE=contract_compact.sol deploys the hash-only history variant
+        source_file = os.getenv("CONTRACT_SOURCE", "contract.sol")
+        compiled_sol = compile_contract(source_file=source_file, optimize=optimize,
+                                        optimizer_runs=optimizer_runs)
         
-        # Deploy contract
-        contract_address, abi = deploy_contract(w3, account, private_key, compiled_sol)
+        # Deploy contract; DEPLOY_SHARDS=K deploys K instances, keeping matching ones
+        shard_count = int(os.getenv("DEPLOY_SHARDS", "1"))
+        if shard_count > 1:
+            shards = deploy_shards(w3, account, private_key, compiled_sol, shard_count,
+                                   source_file=source_file, existing=existing_shard_addresses(),
+                                   chain_id=w3.eth.chain_id)
+            contract_address = shards[0]["address"]
+        else:
+            contract_address, abi = deploy_contract(w3, account, private_key, compiled_sol,
+                                                    source_file=source_file)
         
         print("\n" + "=" * 60)
         print(" DEPLOYMENT COMPLETED SUCCESSFULLY!")
@@ -157,6 +327,7 @@ def main():
         print(f"   1. Use contract address: {contract_address}")
         print(f"   2. Run 'python interact.py' to interact with the contract")
         print(f"   3. Run 'python test_contract.py' to run tests")
+        export_from_env()
         
     except Exception as e:
         print(f"\n Error during deployment: {str(e)}")
@@ -0,0 +1,188 @@
+import asyncio
+import queue
+import threading
+from collections import deque
+
+from log_decoder import LogDecoder
+
+DEFAULT_REORG_DEPTH = 12
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_MAX_CHUNK_SIZE = 2000
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_BUFFER_SIZE = 1000
+
+ADDED = "added"
+REMOVED = "removed"
+
+_STOP = object()
+
+class EventFollower:
+    """Tail GreetingSet/GreetingUpdated logs as new blocks arrive
+
+    Each poll fetches logs only for blocks it has not scanned yet, with
+    eth_getLogs ranges that double after every successful request (up to
+    `max_chunk_size`) and halve when the node rejects a range as too large.
+    Changes come out as (ADDED, event) or (REMOVED, event), where event is
+    the decoded log as returned by process_log.
+
+    The hash of the last block of every scanned range within `reorg_depth`
+    blocks of the head is kept. When one of them no longer matches the
+    chain, events from the dropped blocks are emitted again as REMOVED, in
+    reverse order, and the blocks are scanned again on the new branch.
+
+    Iterating the follower (plain or with `async for`) polls in a background
+    thread and hands changes over through a queue of `buffer_size` entries.
+    When the consumer falls behind the queue fills up and polling pauses, so
+    memory use stays bounded.
+    """
+
+    def __init__(self, contract, start_block=None, reorg_depth=DEFAULT_REORG_DEPTH,
+                 chunk_size=DEFAULT_CHUNK_SIZE, max_chunk_size=DEFAULT_MAX_CHUNK_SIZE,
+                 poll_interval=DEFAULT_POLL_INTERVAL, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.contract = contract
+        self.w3 = contract.w3
+        self.reorg_depth = reorg_depth
+        self.chunk_size = chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.poll_interval = poll_interval
+        self.buffer_size = buffer_size
+
+        self.decoder = LogDecoder(contract.abi)
+        self.topics = self.decoder.topics
+        self.next_block = self.w3.eth.block_number + 1 if start_block is None else start_block
+        self._checkpoints = deque()  # (block_number, block_hash) of scanned range ends
+        if self.next_block > 0:
+            # Anchor reorg detection at the block before the first scanned one
+            anchor = self.next_block - 1
+            self._checkpoints.append((anchor, self.w3.eth.get_block(anchor).hash))
+        self._recent = deque()  # events emitted from blocks that may still be reorged out
+        self._stopped = threading.Event()
+
+    def poll(self):
+        """Return the changes since the previous poll as a list"""
+        return list(self._changes())
+
+    def stop(self):
+        """End a running iteration; the background poller exits with it"""
+        self._stopped.set()
+
+    def _changes(self):
+        latest = self.w3.eth.block_number
+        yield from self._handle_reorg(latest)
+
+        while self.next_block <= latest:
+            chunk_end = min(self.next_block + self.chunk_size - 1, latest)
+            logs = self._get_logs(self.next_block, chunk_end)
+            # _get_logs may have shrunk the range
+            chunk_end = min(self.next_block + self.chunk_size - 1, latest)
+            self.chunk_size = min(self.chunk_size * 2, self.max_chunk_size)
+
+            self._checkpoints.append((chunk_end, self.w3.eth.get_block(chunk_end).hash))
+            self.next_block = chunk_end + 1
+            self._prune(latest)
+
+            for log in logs:
+                event = self.decoder.decode_log(log)
+                if event["blockNumber"] > latest - self.reorg_depth:
+                    self._recent.append(event)
+                yield ADDED, event
+
+    def _get_logs(self, from_block, to_block):
+        """eth_getLogs, halving the range until the node accepts it"""
+        while True:
+            try:
+                return self.w3.eth.get_logs({
+                    "address": self.contract.address,
+                    "fromBlock": from_block,
+                    "toBlock": to_block,
+                    "topics": [self.topics],
+                })
+            except ValueError:
+                if to_block == from_block:
+                    raise
+                self.chunk_size = max(self.chunk_size // 2, 1)
+                to_block = from_block + self.chunk_size - 1
+
+    def _handle_reorg(self, latest):
+        """Retract events from blocks that are no longer on the chain"""
+        reorged = False
+        while self._checkpoints:
+            block_number, block_hash = self._checkpoints[-1]
+            if block_number <= latest and self.w3.eth.get_block(block_number).hash == block_hash:
+                break
+            self._checkpoints.pop()
+            reorged = True
+
+        if not reorged:
+            return
+        if not self._checkpoints:
+            raise RuntimeError(f"Chain reorganized deeper than {self.reorg_depth} blocks")
+
+        rescan_from = self._checkpoints[-1][0] + 1
+        while self._recent and self._recent[-1]["blockNumber"] >= rescan_from:
+            yield REMOVED, self._recent.pop()
+        self.next_block = rescan_from
+
+    def _prune(self, latest):
+        """Forget checkpoints and events that are too deep to be reorged out"""
+        horizon = latest - self.reorg_depth
+        while len(self._checkpoints) > 1 and self._checkpoints[1][0] <= horizon:
+            self._checkpoints.popleft()
+        while self._recent and self._recent[0]["blockNumber"] <= horizon:
+            self._recent.popleft()
+
+    def _produce(self, buffer):
+        try:
+            while not self._stopped.is_set():
+                for change in self._changes():
+                    if not self._put(buffer, change):
+                        return
+                self._stopped.wait(self.poll_interval)
+        except Exception as e:
+            self._put(buffer, e)
+        finally:
+            self._put(buffer, _STOP)
+
+    def _put(self, buffer, item):
+        """Block until there is room in the buffer; give up once stopped"""
+        while True:
+            try:
+                buffer.put(item, timeout=self.poll_interval)
+                return True
+            except queue.Full:
+                if self._stopped.is_set():
+                    return False
+
+    def __iter__(self):
+        self._stopped.clear()
+        buffer = queue.Queue(self.buffer_size)
+        producer = threading.Thread(target=self._produce, args=(buffer,), daemon=True)
+        producer.start()
+        try:
+            while True:
+                try:
+                    item = buffer.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    if not producer.is_alive():
+                        return
+                    continue
+                if item is _STOP:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Also reached when the consumer breaks out of the loop
+            self.stop()
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        changes = iter(self)
+        try:
+            while True:
+                change = await loop.run_in_executor(None, next, changes, _STOP)
+                if change is _STOP:
+                    return
+                yield change
+        finally:
+            self.stop()
@@ -0,0 +1,260 @@
+import argparse
+import csv
+import json
+import struct
+import sys
+from array import array
+from datetime import datetime, timezone
+from history_reader import DEFAULT_CONCURRENCY, DEFAULT_PAGE_SIZE, has_history_views, iter_history
+
+FORMATS = ("csv", "jsonl", "columnar")
+FIELDS = ("index", "message", "updated_by", "timestamp")
+
+COLUMNAR_MAGIC = b"GRHIST1\n"
+DEFAULT_BLOCK_ROWS = 4096
+
+class HistoryRow:
+    """One history entry; __slots__ keeps per-row overhead to four references"""
+
+    __slots__ = FIELDS
+
+    def __init__(self, index, message, updated_by, timestamp):
+        self.index = index
+        self.message = message
+        self.updated_by = updated_by
+        self.timestamp = timestamp
+
+    def __iter__(self):
+        return iter((self.index, self.message, self.updated_by, self.timestamp))
+
+    def __eq__(self, other):
+        return isinstance(other, HistoryRow) and tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return f"HistoryRow{tuple(self)!r}"
+
+def parse_time(value):
+    """Unix seconds, or an ISO 8601 date/time (UTC unless it has an offset)"""
+    if value.isdigit():
+        return int(value)
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+def _first_index_after(contract, lo, hi, timestamp, block_identifier, inclusive):
+    """Binary search for the first index in [lo, hi) whose entry is at or after `timestamp`
+
+    History timestamps never decrease, so log2(n) getGreetingFromHistory
+    calls locate a time bound without reading the entries before it.
+    """
+    get_entry = contract.functions.getGreetingFromHistory
+    while lo < hi:
+        mid = (lo + hi) // 2
+        entry_time = get_entry(mid).call(block_identifier=block_identifier)[2]
+        if entry_time < timestamp or (not inclusive and entry_time == timestamp):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def iter_rows(contract, since=None, until=None, updated_by=None,
+              page_size=DEFAULT_PAGE_SIZE, concurrency=DEFAULT_CONCURRENCY):
+    """Yield a HistoryRow per entry with since <= timestamp <= until, oldest first
+
+    The time range is turned into an index range up front, so only entries
+    inside it are fetched; the updater filter is applied as pages stream in.
+    A compact deployment has no getGreetingFromHistory to search with, so
+    there every entry is read and the time range is filtered as well.
+    """
+    block_identifier = contract.w3.eth.block_number
+    count = contract.functions.getHistoryCount().call(block_identifier=block_identifier)
+    start, stop = 0, count
+    searchable = has_history_views(contract)
+    if since is not None and searchable:
+        start = _first_index_after(contract, start, stop, since, block_identifier, inclusive=True)
+    if until is not None and searchable:
+        stop = _first_index_after(contract, start, stop, until, block_identifier, inclusive=False)
+    if updated_by is not None:
+        updated_by = updated_by.lower()
+
+    for index, message, updater, timestamp in iter_history(
+        contract, start, stop, page_size=page_size, concurrency=concurrency,
+        block_identifier=block_identifier
+    ):
+        if not searchable and ((since is not None and timestamp < since)
+                               or (until is not None and timestamp > until)):
+            continue
+        if updated_by is None or updater.lower() == updated_by:
+            yield HistoryRow(index, message, updater, timestamp)
+
+class CsvWriter:
+    def __init__(self, file):
+        self._writer = csv.writer(file)
+        self._writer.writerow(FIELDS)
+
+    def write(self, row):
+        self._writer.writerow(row)
+
+    def close(self):
+        pass
+
+class JsonlWriter:
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, row):
+        self.file.write(json.dumps(dict(zip(FIELDS, row))) + "\n")
+
+    def close(self):
+        pass
+
+class ColumnarWriter:
+    """Binary columnar format, written in blocks of up to `block_rows` rows
+
+    After an 8-byte magic, each block is a little-endian uint32 row count n,
+    then its columns:
+
+        index        n x uint64
+        timestamp    n x uint64
+        new updaters uint32 count, then 20 bytes per address
+        updater      n x uint32 id into every address seen so far
+        message      n x uint32 byte length, then the UTF-8 bytes
+
+    A block with n = 0 ends the file. Only one block is buffered, so memory
+    does not grow with the history; the updater table grows with the number
+    of distinct updaters only.
+    """
+
+    def __init__(self, file, block_rows=DEFAULT_BLOCK_ROWS):
+        self.file = file
+        self.block_rows = block_rows
+        self._updater_ids = {}
+        self._reset()
+        file.write(COLUMNAR_MAGIC)
+
+    def _reset(self):
+        self._indexes = array("Q")
+        self._timestamps = array("Q")
+        self._updaters = array("I")
+        self._lengths = array("I")
+        self._new_updaters = []
+        self._messages = []
+
+    def write(self, row):
+        updater_id = self._updater_ids.get(row.updated_by)
+        if updater_id is None:
+            updater_id = self._updater_ids[row.updated_by] = len(self._updater_ids)
+            self._new_updaters.append(bytes.fromhex(row.updated_by[2:]))
+        message = row.message.encode("utf-8")
+        self._indexes.append(row.index)
+        self._timestamps.append(row.timestamp)
+        self._updaters.append(updater_id)
+        self._lengths.append(len(message))
+        self._messages.append(message)
+        if len(self._indexes) >= self.block_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._indexes:
+            return
+        write = self.file.write
+        write(struct.pack("<I", len(self._indexes)))
+        write(_le_bytes(self._indexes))
+        write(_le_bytes(self._timestamps))
+        write(struct.pack("<I", len(self._new_updaters)))
+        write(b"".join(self._new_updaters))
+        write(_le_bytes(self._updaters))
+        write(_le_bytes(self._lengths))
+        write(b"".join(self._messages))
+        self._reset()
+
+    def close(self):
+        self.flush()
+        self.file.write(struct.pack("<I", 0))
+
+def _le_bytes(values):
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _read_array(file, typecode, count):
+    values = array(typecode)
+    values.frombytes(file.read(values.itemsize * count))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+def read_columnar(file):
+    """Yield the HistoryRows of a columnar export, one block in memory at a time"""
+    from eth_utils import to_checksum_address
+
+    if file.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar history export")
+    updaters = []
+    while True:
+        (count,) = struct.unpack("<I", file.read(4))
+        if count == 0:
+            return
+        indexes = _read_array(file, "Q", count)
+        timestamps = _read_array(file, "Q", count)
+        (new_updaters,) = struct.unpack("<I", file.read(4))
+        updaters.extend(to_checksum_address(file.read(20)) for _ in range(new_updaters))
+        updater_ids = _read_array(file, "I", count)
+        lengths = _read_array(file, "I", count)
+        messages = memoryview(file.read(sum(lengths)))
+        offset = 0
+        for i in range(count):
+            message = str(messages[offset:offset + lengths[i]], "utf-8")
+            offset += lengths[i]
+            yield HistoryRow(indexes[i], message, updaters[updater_ids[i]], timestamps[i])
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter, "columnar": ColumnarWriter}
+
+def export_rows(rows, file, fmt):
+    """Write rows one at a time in the given format, returning how many were written"""
+    writer = WRITERS[fmt](file)
+    written = 0
+    for row in rows:
+        writer.write(row)
+        written += 1
+    writer.close()
+    return written
+
+def main():
+    """Stream greeting history to CSV, JSONL or the columnar format"""
+    from client import connect, ganache_url
+    from interact import load_contract
+
+    parser = argparse.ArgumentParser(description="Export greeting history with bounded memory")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--output", default="-", help="output file, or - for stdout")
+    parser.add_argument("--since", type=parse_time, help="unix time or ISO date, inclusive")
+    parser.add_argument("--until", type=parse_time, help="unix time or ISO date, inclusive")
+    parser.add_argument("--updated-by", help="only entries from this address")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+
+    w3 = connect()
+    if not w3.is_connected():
+        print(f" Failed to connect to {ganache_url()}", file=sys.stderr)
+        return 1
+
+    contract, _ = load_contract(w3)
+    rows = iter_rows(contract, args.since, args.until, args.updated_by,
+                     args.page_size, args.concurrency)
+
+    binary = args.format == "columnar"
+    if args.output == "-":
+        file = sys.stdout.buffer if binary else sys.stdout
+        written = export_rows(rows, file, args.format)
+    else:
+        with open(args.output, "wb" if binary else "w", newline=None if binary else "") as file:
+            written = export_rows(rows, file, args.format)
+    print(f" Exported {written} history entries", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import sys
+import client
+from deloy import compile_contract
+
+DEFAULT_BASELINE = "gas_baseline.json"
+DEFAULT_THRESHOLD = 0.01
+GREETING_LENGTHS = [1, 31, 32, 64, 100, 150, 200]
+HISTORY_SIZES = [1, 10, 100]
+
+def connect(in_process):
+    """Connect to Ganache, or start an in-process eth-tester chain"""
+    if in_process:
+        from web3 import Web3, EthereumTesterProvider
+        return Web3(EthereumTesterProvider())
+
+    w3 = client.connect()
+    if not w3.is_connected():
+        raise ConnectionError(f"Failed to connect to {client.ganache_url()}")
+    return w3
+
+def wait(w3, tx_hash):
+    return w3.eth.wait_for_transaction_receipt(tx_hash)
+
+def measure(w3, contract_interface, greeting_lengths, history_sizes):
+    """Return {case_name: gasUsed} for deploy and every setGreeting case
+
+    Every setGreeting case replaces the same 24-byte greeting, so results
+    depend only on the new greeting's length and the history size. Cases
+    run against an evm_snapshot that is reverted afterwards.
+    """
+    account = w3.eth.accounts[0]
+    GreetingContract = w3.eth.contract(
+        abi=contract_interface["abi"],
+        bytecode=contract_interface["evm"]["bytecode"]["object"],
+    )
+    receipt = wait(w3, GreetingContract.constructor("Hello, Blockchain World!").transact({"from": account}))
+    contract = w3.eth.contract(address=receipt.contractAddress, abi=contract_interface["abi"])
+    results = {"deploy": receipt.gasUsed}
+
+    history_size = 1
+    for target_size in sorted(history_sizes):
+        # Grow history up to the target, ending on the common previous greeting
+        while history_size < target_size:
+            wait(w3, contract.functions.setGreeting("Hello, Blockchain World!").transact({"from": account}))
+            history_size += 1
+
+        for length in greeting_lengths:
+            snapshot = w3.testing.snapshot()
+            receipt = wait(w3, contract.functions.setGreeting("x" * length).transact({"from": account}))
+            results[f"setGreeting/len={length}/history={target_size}"] = receipt.gasUsed
+            w3.testing.revert(snapshot)
+
+    return results
+
+def compare(results, baseline, threshold):
+    """Return (regressions, unmeasured, lines) comparing results against a baseline
+
+    `unmeasured` lists the cases the baseline has no value for.
+    """
+    regressions = []
+    unmeasured = []
+    lines = []
+    for case, gas_used in results.items():
+        previous = baseline.get(case)
+        if previous is None:
+            unmeasured.append(case)
+            lines.append(f" {case:<36} {gas_used:>10} {'(new)':>10}")
+            continue
+        change = (gas_used - previous) / previous
+        marker = ""
+        if change > threshold:
+            regressions.append(case)
+            marker = "  REGRESSION"
+        lines.append(f" {case:<36} {gas_used:>10} {change:>+9.2%}{marker}")
+    return regressions, unmeasured, lines
+
+def main():
+    """Run the gas benchmark and check it against the saved baseline"""
+    parser = argparse.ArgumentParser(description="GreetingContract gas regression benchmark")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative increase per case (0.01 = 1%%)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write the measured results as the new baseline")
+    parser.add_argument("--in-process", action="store_true",
+                        help="use an in-process eth-tester chain instead of Ganache")
+    parser.add_argument("--source", default="contract.sol")
+    parser.add_argument("--optimize", action="store_true")
+    parser.add_argument("--optimizer-runs", type=int, default=200)
+    parser.add_argument("--lengths", type=int, nargs="+", default=GREETING_LENGTHS)
+    parser.add_argument("--history-sizes", type=int, nargs="+", default=HISTORY_SIZES)
+    args = parser.parse_args()
+
+    # Without a baseline nothing can regress, so a check would always pass
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        print(f" No baseline at {args.baseline}; record one with --update-baseline")
+        return 2
+
+    compiled_sol = compile_contract(
+        source_file=args.source,
+        optimize=args.optimize,
+        optimizer_runs=args.optimizer_runs,
+        save_output=False,
+    )
+    contract_interface = compiled_sol["contracts"][args.source]["GreetingContract"]
+
+    w3 = connect(args.in_process)
+    results = measure(w3, contract_interface, args.lengths, args.history_sizes)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)["cases"]
+
+    regressions, unmeasured, lines = compare(results, baseline, args.threshold)
+    print("=" * 60)
+    print(" GAS BENCHMARK")
+    print("=" * 60)
+    for line in lines:
+        print(line)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump({
+                "chain": "eth-tester" if args.in_process else "ganache",
+                "optimizer": {"enabled": args.optimize, "runs": args.optimizer_runs},
+                "cases": results,
+            }, file, indent=4)
+        print(f"\n Baseline written to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\n {len(regressions)} case(s) regressed by more than {args.threshold:.2%}")
+        return 1
+
+    if unmeasured:
+        print(f"\n {len(unmeasured)} case(s) missing from {args.baseline}; "
+              f"rerun with --update-baseline to record them")
+        return 2
+
+    print("\n No gas regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
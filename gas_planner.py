@@ -0,0 +1,144 @@
+import threading
+import time
+
+DEFAULT_PRICE_TTL = 15
+DEFAULT_MARGIN = 1.25
+
+# SSTORE of a zero slot costs 20000 where overwriting a set one costs 2900
+FRESH_SLOT_GAS = 20000 - 2900
+# Clearing a slot (cold access plus the write) when a shorter string replaces a longer one
+CLEARED_SLOT_GAS = 2100 + 2900
+# Greetings are capped at 200 bytes, i.e. 7 storage slots of string data
+MAX_STRING_SLOTS = 7
+
+def _string_slots(length):
+    """Storage slots of string data; strings up to 31 bytes live in the length slot"""
+    return 0 if length < 32 else (length + 31) // 32
+
+def _string_lengths(values):
+    for value in values:
+        if isinstance(value, str):
+            yield len(value.encode("utf-8"))
+        elif isinstance(value, (list, tuple)):
+            yield from _string_lengths(value)
+
+def worst_case_allowance(contract_function):
+    """Gas the estimate may be short by because of the string being replaced
+
+    An estimate depends on the stored greeting: a long one makes writing
+    the new string cheap (slots overwritten) and a short one makes it
+    expensive (slots written from zero), while replacing a long greeting
+    with a short one pays to clear its slots. Adding both worst cases to
+    any estimate gives a limit that holds whatever was stored before.
+    """
+    lengths = list(_string_lengths(getattr(contract_function, "args", None) or ()))
+    if not lengths:
+        return 0
+    return FRESH_SLOT_GAS * _string_slots(max(lengths)) + CLEARED_SLOT_GAS * MAX_STRING_SLOTS
+
+def bounded_gas(contract_function, account, margin=DEFAULT_MARGIN):
+    """Gas limit for one call: a fresh estimate plus the worst-case allowance and margin"""
+    estimate = contract_function.estimate_gas({"from": account})
+    return int((estimate + worst_case_allowance(contract_function)) * margin)
+
+class GasPlanner:
+    """Caches gas estimates and the gas price between transactions
+
+    Gas limits are estimated once per (function, calldata length, string
+    slots) and reused. ABI encoding pads strings to 32-byte words, so the
+    calldata length alone puts a 1-byte and a 32-byte greeting in the same
+    bucket, although only the 32-byte one needs a storage slot for its
+    data; the slot count keeps them apart. Greetings sharing a key can
+    still cost different amounts, as the cost also depends on the greeting
+    being replaced, which the key cannot see (and which pipelined senders
+    do not know yet). The limit is safe because the estimate is raised by
+    worst_case_allowance() and then scaled by `margin`, not because every
+    call under a key costs the same.
+    Receipts passed to record_receipt() raise the cached limit if a
+    transaction came closer to it than the margin allows.
+
+    The gas price is refreshed when it is older than `price_ttl` seconds or
+    when notify_block() reports a new block.
+    """
+
+    def __init__(self, w3, price_ttl=DEFAULT_PRICE_TTL, margin=DEFAULT_MARGIN):
+        self.w3 = w3
+        self.price_ttl = price_ttl
+        self.margin = margin
+        self._lock = threading.Lock()
+        self._estimates = {}
+        self._gas_used = {}
+        self._gas_price = None
+        self._price_fetched_at = 0.0
+        self._price_block = None
+
+    def notify_block(self, block_number):
+        """Expire the cached gas price once a newer block has been seen"""
+        with self._lock:
+            if self._price_block is not None and block_number > self._price_block:
+                self._gas_price = None
+            self._price_block = block_number
+
+    def gas_price(self):
+        with self._lock:
+            expired = time.monotonic() - self._price_fetched_at > self.price_ttl
+            if self._gas_price is None or expired:
+                self._gas_price = self.w3.eth.gas_price
+                self._price_fetched_at = time.monotonic()
+            return self._gas_price
+
+    @staticmethod
+    def _key(contract_function):
+        """Cache key: the function name, its encoded calldata length and its string slots"""
+        if hasattr(contract_function, "_encode_transaction_data"):
+            data = contract_function._encode_transaction_data()
+            name = contract_function.abi["name"]
+        else:
+            data = contract_function.data_in_transaction
+            name = "constructor"
+        lengths = list(_string_lengths(getattr(contract_function, "args", None) or ()))
+        return name, len(data), _string_slots(max(lengths, default=0))
+
+    def estimate_gas(self, contract_function, account):
+        """Return a cached gas limit for this call, estimating it on first use"""
+        key = self._key(contract_function)
+        with self._lock:
+            gas = self._estimates.get(key)
+        if gas is None:
+            gas = bounded_gas(contract_function, account, self.margin)
+            with self._lock:
+                self._estimates.setdefault(key, gas)
+        return gas
+
+    def record_receipt(self, contract_function, receipt):
+        """Remember how much gas a mined transaction actually used"""
+        key = self._key(contract_function)
+        with self._lock:
+            self._gas_used.setdefault(key, []).append(receipt.gasUsed)
+            needed = int(receipt.gasUsed * self.margin)
+            if key in self._estimates and needed > self._estimates[key]:
+                self._estimates[key] = needed
+
+    def accuracy_report(self):
+        """Compare each cached gas limit with the gasUsed seen in receipts
+
+        Returns {(function, calldata_length, string_slots): stats}, where
+        stats holds the gas limit used, the sample count, the min/mean/max
+        gasUsed and the mean headroom as a percentage of gasUsed.
+        """
+        report = {}
+        with self._lock:
+            for key, used in self._gas_used.items():
+                estimate = self._estimates.get(key)
+                mean_used = sum(used) / len(used)
+                report[key] = {
+                    "gas_limit": estimate,
+                    "samples": len(used),
+                    "min_gas_used": min(used),
+                    "mean_gas_used": mean_used,
+                    "max_gas_used": max(used),
+                    "headroom_pct": (
+                        None if estimate is None else (estimate - mean_used) / mean_used * 100
+                    ),
+                }
+        return report
@@ -0,0 +1,86 @@
+from gas_planner import CLEARED_SLOT_GAS, FRESH_SLOT_GAS, MAX_STRING_SLOTS, _string_slots
+
+DEFAULT_GAS_BUDGET = 3_000_000
+DEFAULT_MARGIN = 1.25
+
+def _slots(greeting):
+    """Storage slots of string data the greeting's history entry writes"""
+    return _string_slots(len(greeting.encode("utf-8")))
+
+def _final_allowance(greeting):
+    """Worst case for the last greeting, which also overwrites the stored one
+
+    Writing it may fill every one of its string slots from zero, and
+    replacing a longer stored greeting clears up to MAX_STRING_SLOTS slots,
+    neither of which the calibration estimates can see.
+    """
+    return FRESH_SLOT_GAS * _slots(greeting) + CLEARED_SLOT_GAS * MAX_STRING_SLOTS
+
+class GreetingBatcher:
+    """Packs greetings into setGreetings batches that stay under a gas budget
+
+    Gas for a batch is modelled as fixed + sum(item + slot * slots) plus a
+    worst-case allowance for the final greeting, where slots is the number
+    of storage slots the greeting's string data needs: none below 32 bytes,
+    since short strings live in their length slot, and ceil(length / 32)
+    from 32 bytes up. The three coefficients are calibrated from three
+    eth_estimateGas calls on first use, so packing a long queue needs no
+    per-batch estimates. Batches are filled greedily, in order, until the
+    modelled gas times `margin` would exceed `gas_budget`; a greeting that
+    exceeds it on its own still gets a batch of its own.
+    """
+
+    def __init__(self, contract, account, gas_budget=DEFAULT_GAS_BUDGET, margin=DEFAULT_MARGIN):
+        self.contract = contract
+        self.account = account
+        self.gas_budget = gas_budget
+        self.margin = margin
+        self._model = None
+
+    def _estimate(self, greetings):
+        return self.contract.functions.setGreetings(greetings).estimate_gas({"from": self.account})
+
+    def calibrate(self):
+        """Fit (fixed, item, slot) from batches of one short, two short and 200-byte + short greetings
+
+        The long greeting goes first, so only its history entry differs
+        between the batches: the last greeting also becomes the stored one,
+        whose cost depends on what was stored before.
+        """
+        short, long = "x", "x" * 200
+        one = self._estimate([short])
+        two = self._estimate([short, short])
+        mixed = self._estimate([long, short])
+        item = two - one
+        slot = (mixed - two) / _slots(long)
+        self._model = (one - item, item, slot)
+        return self._model
+
+    def _item_gas(self, greeting):
+        fixed, item, slot = self._model or self.calibrate()
+        return item + slot * _slots(greeting)
+
+    def batch_gas(self, greetings):
+        """Modelled gas for one setGreetings call, before the margin"""
+        fixed = (self._model or self.calibrate())[0]
+        if not greetings:
+            return fixed
+        return fixed + sum(self._item_gas(greeting) for greeting in greetings) + _final_allowance(greetings[-1])
+
+    def gas_limit(self, greetings):
+        """Gas limit to send a batch with: the modelled gas plus the margin"""
+        return int(self.batch_gas(greetings) * self.margin)
+
+    def chunks(self, greetings):
+        """Yield consecutive lists of greetings, each fitting in the gas budget"""
+        fixed = (self._model or self.calibrate())[0]
+        batch, gas = [], fixed
+        for greeting in greetings:
+            cost = self._item_gas(greeting)
+            if batch and (gas + cost + _final_allowance(greeting)) * self.margin > self.gas_budget:
+                yield batch
+                batch, gas = [], fixed
+            batch.append(greeting)
+            gas += cost
+        if batch:
+            yield batch
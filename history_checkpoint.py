@@ -0,0 +1,93 @@
+import argparse
+import os
+import time
+from history_hash import history_hash, next_history_hash
+from history_reader import DEFAULT_CONCURRENCY, DEFAULT_PAGE_SIZE, iter_history
+
+def read_checkpoint(contract, block_identifier="latest"):
+    """(count, accumulator) from getHistoryCheckpoint(), in one eth_call"""
+    count, accumulator = contract.functions.getHistoryCheckpoint().call(block_identifier=block_identifier)
+    return count, bytes(accumulator)
+
+def verify_history(contract, entries, block_identifier="latest"):
+    """Check a cached history against the chain without re-reading it
+
+    `entries` are (message, updatedBy, timestamp) tuples, oldest first,
+    such as GreetingIndex.history() yields. They are hashed locally the way
+    the contract does, and compared with one getHistoryCheckpoint() call.
+    Returns True when they are exactly the on-chain history.
+    """
+    count, accumulator = read_checkpoint(contract, block_identifier)
+    entries = list(entries)
+    return len(entries) == count and history_hash(entries) == accumulator
+
+def update_history(contract, entries, page_size=DEFAULT_PAGE_SIZE, concurrency=DEFAULT_CONCURRENCY):
+    """Append the entries missing from a cached history and verify the result
+
+    Only entries after the cached ones are fetched. The cached entries and
+    the new ones are checked together against one checkpoint, so a stale
+    or corrupted cache is caught too; it raises ValueError, and the cache
+    then has to be read again in full. Returns the list of new entries.
+    """
+    block = contract.w3.eth.block_number
+    count, accumulator = read_checkpoint(contract, block)
+    entries = list(entries)
+    if len(entries) > count:
+        raise ValueError(f"Cache has {len(entries)} entries, contract has only {count}")
+
+    new_entries = []
+    # Entries are append-only, so [len(entries), count) is unchanged at any later block
+    for _, message, updated_by, timestamp in iter_history(
+        contract, len(entries), count, page_size=page_size, concurrency=concurrency
+    ):
+        new_entries.append((message, updated_by, timestamp))
+    if len(new_entries) != count - len(entries):
+        raise ValueError(f"Expected {count - len(entries)} new entries, read {len(new_entries)}")
+
+    running = history_hash(entries)
+    for message, updated_by, timestamp in new_entries:
+        running = next_history_hash(running, message, updated_by, timestamp)
+    if running != accumulator:
+        raise ValueError(f"Cached history does not match the contract hash at block {block}")
+    return new_entries
+
+def main():
+    """Verify the local event index against the contract with one call"""
+    from client import connect, ganache_url
+    from indexer import DEFAULT_DB_PATH, GreetingIndex
+    from interact import load_contract
+
+    parser = argparse.ArgumentParser(description="Check cached greeting history against the chain")
+    parser.add_argument("--db", default=os.getenv("GREETING_INDEX_DB", DEFAULT_DB_PATH),
+                        help="SQLite index built by indexer.py")
+    args = parser.parse_args()
+
+    w3 = connect()
+    if not w3.is_connected():
+        print(f" Failed to connect to {ganache_url()}")
+        return
+
+    contract, contract_address = load_contract(w3)
+    with GreetingIndex(args.db) as index:
+        block = index.last_synced_block(contract_address)
+        if block is None:
+            print(f" Nothing indexed for {contract_address} in {args.db} yet; "
+                  f"run 'python indexer.py --db {args.db}' first")
+            return
+        entries = list(index.history(contract_address))
+
+    start = time.perf_counter()
+    local_hash = history_hash(entries)
+    elapsed = time.perf_counter() - start
+    # Compare at the block the index was synced to, so later updates do not count as a mismatch
+    count, accumulator = read_checkpoint(contract, block)
+
+    print(f" Hashed {len(entries)} indexed entries in {elapsed * 1000:.1f} ms")
+    if len(entries) == count and local_hash == accumulator:
+        print(f" Index matches the contract at block {block}")
+    else:
+        print(f" Index does NOT match the contract at block {block} "
+              f"({len(entries)} entries indexed, {count} on chain); rebuild it")
+
+if __name__ == "__main__":
+    main()
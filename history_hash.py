@@ -0,0 +1,64 @@
+from eth_utils import keccak
+from indexer import DEFAULT_CHUNK_SIZE
+from log_decoder import LogDecoder
+
+EMPTY_HISTORY_HASH = b"\x00" * 32
+
+def next_history_hash(previous, message, updated_by, timestamp):
+    """Fold one history entry into the rolling hash, as the contract does
+
+    Matches keccak256(abi.encode(previous, keccak256(bytes(message)),
+    updatedBy, timestamp)): four 32-byte words, the address left-padded.
+    """
+    return keccak(
+        previous
+        + keccak(message.encode("utf-8"))
+        + bytes(12) + bytes.fromhex(updated_by[2:])
+        + timestamp.to_bytes(32, "big")
+    )
+
+def history_hash(entries, previous=EMPTY_HISTORY_HASH):
+    """Rolling hash over (message, updatedBy, timestamp) entries, oldest first"""
+    for message, updated_by, timestamp in entries:
+        previous = next_history_hash(previous, message, updated_by, timestamp)
+    return previous
+
+def fetch_history(contract, start_block=0, to_block=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (message, updatedBy, timestamp) from GreetingSet/GreetingUpdated logs in chain order"""
+    w3 = contract.w3
+    to_block = w3.eth.block_number if to_block is None else to_block
+    decoder = LogDecoder(contract.abi)
+
+    from_block = start_block
+    while from_block <= to_block:
+        chunk_end = min(from_block + chunk_size - 1, to_block)
+        logs = w3.eth.get_logs({
+            "address": contract.address,
+            "fromBlock": from_block,
+            "toBlock": chunk_end,
+            "topics": [decoder.topics],
+        })
+        for log in logs:
+            name, args = decoder.decode_args(log["topics"], log["data"])
+            if name == "GreetingSet":
+                yield args["greeting"], args["setBy"], args["timestamp"]
+            else:
+                yield args["newGreeting"], args["updatedBy"], args["timestamp"]
+        from_block = chunk_end + 1
+
+def reconstruct_history(contract, start_block=0, chunk_size=DEFAULT_CHUNK_SIZE, block_identifier=None):
+    """Rebuild the full history from logs and verify it against the on-chain hash
+
+    Logs and getHistoryCheckpoint() are both read at the same block (the
+    latest one unless `block_identifier` is given), so updates landing
+    meanwhile cannot cause a false mismatch. Raises ValueError if the logs
+    do not reproduce the stored count and hash.
+    """
+    block = contract.w3.eth.block_number if block_identifier is None else block_identifier
+    entries = list(fetch_history(contract, start_block, block, chunk_size))
+    count, accumulator = contract.functions.getHistoryCheckpoint().call(block_identifier=block)
+    if len(entries) != count:
+        raise ValueError(f"Found {len(entries)} history entries in logs, contract has {count}")
+    if history_hash(entries) != bytes(accumulator):
+        raise ValueError(f"History rebuilt from logs does not match the contract hash at block {block}")
+    return entries
@@ -0,0 +1,148 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+
+from hexbytes import HexBytes
+
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+
+from history_hash import reconstruct_history
+from rpc_batch import batch_request
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_CONCURRENCY = 4
+
+def has_range_views(contract):
+    """Check whether the contract ABI exposes getHistoryRange/getHistoryRangeReverse"""
+    names = {item.get("name") for item in contract.abi if item.get("type") == "function"}
+    return {"getHistoryRange", "getHistoryRangeReverse"} <= names
+
+def has_history_views(contract):
+    """Check whether the contract ABI exposes getGreetingFromHistory
+
+    The compact variant (contract_compact.sol) keeps no history array, so
+    its entries can only be read back from the GreetingSet/GreetingUpdated
+    logs.
+    """
+    return any(
+        item.get("type") == "function" and item.get("name") == "getGreetingFromHistory"
+        for item in contract.abi
+    )
+
+def _decode_output(w3, fn_abi, result):
+    """Decode raw eth_call output the same way ContractFunction.call() does"""
+    output_types = get_abi_output_types(fn_abi)
+    decoded = w3.codec.decode(output_types, HexBytes(result))
+    normalized = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, decoded)
+    return tuple(normalized)
+
+def _fetch_page_batched(contract, indexes, block_identifier):
+    """Fetch the given history entries with one getGreetingFromHistory call each,
+    sent together as a single batch round trip"""
+    w3 = contract.w3
+    fn_abi = contract.get_function_by_name("getGreetingFromHistory").abi
+    calls = [
+        (
+            "eth_call",
+            [
+                {
+                    "to": contract.address,
+                    "data": contract.encodeABI(fn_name="getGreetingFromHistory", args=[i]),
+                },
+                hex(block_identifier),
+            ],
+        )
+        for i in indexes
+    ]
+    results = batch_request(w3, calls)
+    return [_decode_output(w3, fn_abi, result) for result in results]
+
+def _fetch_page_range(contract, start, stop, newest_first, history_count, block_identifier):
+    """Fetch history entries [start, stop) with a single range view call"""
+    if newest_first:
+        page = contract.functions.getHistoryRangeReverse(history_count - stop, stop - start)
+    else:
+        page = contract.functions.getHistoryRange(start, stop - start)
+    return [tuple(entry) for entry in page.call(block_identifier=block_identifier)]
+
+def _iter_logged_history(contract, start, stop, newest_first, block_identifier):
+    """History entries [start, stop) rebuilt from logs, for contracts without history views"""
+    entries = reconstruct_history(contract, block_identifier=block_identifier)
+    indexes = range(start, stop)
+    for i in reversed(indexes) if newest_first else indexes:
+        yield i, *entries[i]
+
+def iter_history(contract, start=0, stop=None, page_size=DEFAULT_PAGE_SIZE,
+                 concurrency=DEFAULT_CONCURRENCY, newest_first=False, block_identifier=None):
+    """Yield (index, message, updatedBy, timestamp) for each history entry
+
+    Entries are fetched in pages of `page_size`, with up to `concurrency`
+    pages in flight at once. A page is one getHistoryRange call when the
+    contract has range views, or otherwise one JSON-RPC batch of
+    getGreetingFromHistory calls. Only those pages are held in memory, so
+    memory use does not grow with the history size. All reads are pinned to
+    `block_identifier`, by default the block that was current when
+    iteration started, so the view is consistent across pages. With
+    `newest_first` entries in [start, stop) are yielded from the most
+    recent one backwards.
+
+    A compact deployment has no history views. Its whole history is then
+    rebuilt from logs and checked against getHistoryCheckpoint() (see
+    history_hash.reconstruct_history), which reads every log and holds
+    every entry in memory; for large histories use the event index instead.
+    """
+    if page_size < 1 or concurrency < 1:
+        raise ValueError("page_size and concurrency must be positive")
+
+    if block_identifier is None:
+        block_identifier = contract.w3.eth.block_number
+    history_count = contract.functions.getHistoryCount().call(
+        block_identifier=block_identifier
+    )
+    stop = history_count if stop is None else min(stop, history_count)
+    if not has_history_views(contract):
+        yield from _iter_logged_history(contract, start, stop, newest_first, block_identifier)
+        return
+    use_range_views = has_range_views(contract)
+
+    if newest_first:
+        page_bounds = (
+            (max(page_stop - page_size, start), page_stop)
+            for page_stop in range(stop, start, -page_size)
+        )
+    else:
+        page_bounds = (
+            (page_start, min(page_start + page_size, stop))
+            for page_start in range(start, stop, page_size)
+        )
+
+    def fetch(page_start, page_stop):
+        if use_range_views:
+            return _fetch_page_range(
+                contract, page_start, page_stop, newest_first, history_count, block_identifier
+            )
+        indexes = range(page_start, page_stop)
+        return _fetch_page_batched(
+            contract, reversed(indexes) if newest_first else indexes, block_identifier
+        )
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = deque()
+
+        def schedule():
+            bounds = next(page_bounds, None)
+            if bounds is not None:
+                pending.append((bounds, executor.submit(fetch, *bounds)))
+
+        for _ in range(concurrency):
+            schedule()
+
+        while pending:
+            (page_start, page_stop), future = pending.popleft()
+            entries = future.result()
+            schedule()
+            indexes = range(page_start, page_stop)
+            for i, (message, updated_by, timestamp) in zip(
+                reversed(indexes) if newest_first else indexes, entries
+            ):
+                yield i, message, updated_by, timestamp
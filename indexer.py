@@ -0,0 +1,190 @@
+import argparse
+import os
+import sqlite3
+
+from log_decoder import LogDecoder
+
+DEFAULT_DB_PATH = "greeting_index.db"
+DEFAULT_CHUNK_SIZE = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS greeting_events (
+    contract_address TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    event TEXT NOT NULL,
+    old_greeting TEXT,
+    greeting TEXT NOT NULL,
+    updated_by TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    PRIMARY KEY (contract_address, block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS idx_events_block ON greeting_events (contract_address, block_number);
+CREATE INDEX IF NOT EXISTS idx_events_updater ON greeting_events (contract_address, updated_by);
+CREATE INDEX IF NOT EXISTS idx_events_timestamp ON greeting_events (contract_address, timestamp);
+CREATE TABLE IF NOT EXISTS sync_state (
+    contract_address TEXT PRIMARY KEY,
+    last_block INTEGER NOT NULL
+);
+"""
+
+class GreetingIndex:
+    """Local SQLite copy of the GreetingSet/GreetingUpdated event logs"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def last_synced_block(self, contract_address):
+        """Return the last block indexed for a contract, or None"""
+        row = self.conn.execute(
+            "SELECT last_block FROM sync_state WHERE contract_address = ?",
+            (contract_address,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def sync(self, contract, start_block=0, chunk_size=DEFAULT_CHUNK_SIZE, confirmations=0):
+        """Fetch new logs since the last sync and store them
+
+        Logs are requested with eth_getLogs in ranges of `chunk_size` blocks.
+        Each range is committed together with the sync marker, so an
+        interrupted sync resumes from the last completed range. Blocks newer
+        than `latest - confirmations` are left for a later run.
+        Returns the number of events added.
+        """
+        w3 = contract.w3
+        address = contract.address
+        last_block = self.last_synced_block(address)
+        from_block = start_block if last_block is None else last_block + 1
+        to_block = w3.eth.block_number - confirmations
+
+        decoder = LogDecoder(contract.abi)
+
+        added = 0
+        while from_block <= to_block:
+            chunk_end = min(from_block + chunk_size - 1, to_block)
+            logs = w3.eth.get_logs({
+                "address": address,
+                "fromBlock": from_block,
+                "toBlock": chunk_end,
+                "topics": [decoder.topics],
+            })
+            rows = [_to_row(event) for event in decoder.decode_logs(logs)]
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO greeting_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sync_state VALUES (?, ?)",
+                    (address, chunk_end),
+                )
+            added += len(rows)
+            from_block = chunk_end + 1
+
+        return added
+
+    def history(self, contract_address, updated_by=None, since=None, until=None):
+        """Yield (message, updatedBy, timestamp) in chain order, like getGreetingFromHistory"""
+        query = "SELECT greeting, updated_by, timestamp FROM greeting_events WHERE contract_address = ?"
+        params = [contract_address]
+        if updated_by is not None:
+            query += " AND updated_by = ?"
+            params.append(updated_by)
+        if since is not None:
+            query += " AND timestamp >= ?"
+            params.append(since)
+        if until is not None:
+            query += " AND timestamp <= ?"
+            params.append(until)
+        query += " ORDER BY block_number, log_index"
+        yield from self.conn.execute(query, params)
+
+    def history_count(self, contract_address):
+        """Number of indexed history entries for a contract"""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM greeting_events WHERE contract_address = ?",
+            (contract_address,),
+        ).fetchone()[0]
+
+    def contract_info(self, contract_address):
+        """Rebuild the getContractInfo() tuple from the indexed events
+
+        Returns (currentGreeting, owner, totalGreetings, historyLength), or
+        None when nothing has been indexed for the contract yet.
+        """
+        latest = self.conn.execute(
+            "SELECT greeting FROM greeting_events WHERE contract_address = ? "
+            "ORDER BY block_number DESC, log_index DESC LIMIT 1",
+            (contract_address,),
+        ).fetchone()
+        if latest is None:
+            return None
+
+        # The deployer emits GreetingSet and becomes the owner
+        owner = self.conn.execute(
+            "SELECT updated_by FROM greeting_events WHERE contract_address = ? AND event = 'GreetingSet'",
+            (contract_address,),
+        ).fetchone()
+        count = self.history_count(contract_address)
+        return [latest[0], owner[0] if owner else None, count, count]
+
+def _to_row(event):
+    """Flatten a decoded GreetingSet/GreetingUpdated event into a table row"""
+    args = event["args"]
+    if event["event"] == "GreetingSet":
+        old_greeting, greeting, updated_by = None, args["greeting"], args["setBy"]
+    else:
+        old_greeting, greeting, updated_by = args["oldGreeting"], args["newGreeting"], args["updatedBy"]
+
+    return (
+        event["address"],
+        event["blockNumber"],
+        event["logIndex"],
+        event["transactionHash"].hex(),
+        event["event"],
+        old_greeting,
+        greeting,
+        updated_by,
+        args["timestamp"],
+    )
+
+def main():
+    """Bring the SQLite event index up to date with the deployed contract"""
+    from client import connect, ganache_url
+    from interact import load_contract
+
+    parser = argparse.ArgumentParser(description="Sync the local greeting event index")
+    parser.add_argument("--db", default=os.getenv("GREETING_INDEX_DB", DEFAULT_DB_PATH),
+                        help="SQLite file (default: GREETING_INDEX_DB or greeting_index.db)")
+    parser.add_argument("--start-block", type=int, default=0, help="first block of a new index")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="blocks per eth_getLogs")
+    parser.add_argument("--confirmations", type=int, default=0, help="leave the newest blocks for later")
+    args = parser.parse_args()
+
+    w3 = connect()
+    if not w3.is_connected():
+        print(f" Failed to connect to {ganache_url()}")
+        return
+
+    contract, contract_address = load_contract(w3)
+    with GreetingIndex(args.db) as index:
+        added = index.sync(contract, args.start_block, args.chunk_size, args.confirmations)
+        block = index.last_synced_block(contract_address)
+        count = index.history_count(contract_address)
+    print(f" Indexed {added} new events for {contract_address} in {args.db}")
+    print(f" {count} history entries, synced to block {block}")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
-from web3 import Web3
 import json
 import os
 from datetime import datetime
-from dotenv import load_dotenv
+from client import connect, ganache_url, load_credentials
+from gas_planner import GasPlanner, bounded_gas
+from metrics import REGISTRY, export_from_env
+from read_cache import ReadCache
 
-# Load environment variables
-load_dotenv()
+# web3-dependent modules (history_reader, indexer, nonce_manager) are imported
+# where they are first used, so the banner appears before web3 has loaded
 
 def load_contract(w3):
     """Load the deployed contract"""
@@ -19,40 +21,74 @@ def load_contract(w3):
     
     contract_address = deployment_info["contract_address"]
     contract = w3.eth.contract(address=contract_address, abi=abi)
+    REGISTRY.register_abi(abi)
     
     return contract, contract_address
 
-def get_greeting(contract):
-    """Get current greeting"""
+def get_greeting(contract, read_cache=None):
+    """Get current greeting, through the read cache when one is given"""
     try:
-        greeting = contract.functions.getGreeting().call()
+        if read_cache is not None:
+            greeting = read_cache.get_greeting()
+        else:
+            greeting = contract.functions.getGreeting().call()
         print(f"\n Current Greeting: '{greeting}'")
         return greeting
     except Exception as e:
         print(f" Error getting greeting: {str(e)}")
         return None
 
-def set_greeting(contract, w3, account, private_key, new_greeting):
-    """Set a new greeting"""
+def set_greeting(contract, w3, account, private_key, new_greeting, nonce_manager=None,
+                 gas_planner=None, read_cache=None, receipt_collector=None):
+    """Set a new greeting
+
+    With a NonceManager the nonce is assigned locally instead of being
+    fetched from the node for every transaction. With a GasPlanner the gas
+    limit and gas price come from its caches. A ReadCache is invalidated
+    once the transaction is confirmed. A ReceiptCollector shares one
+    batched receipt poll per block with every other pending transaction.
+    """
     try:
         print(f"\n Setting new greeting: '{new_greeting}'")
         
         # Build transaction
-        nonce = w3.eth.get_transaction_count(account)
-        transaction = contract.functions.setGreeting(new_greeting).build_transaction({
+        if nonce_manager is not None:
+            nonce = nonce_manager.next_nonce()
+        else:
+            nonce = w3.eth.get_transaction_count(account)
+        set_greeting_call = contract.functions.setGreeting(new_greeting)
+        if gas_planner is not None:
+            gas = gas_planner.estimate_gas(set_greeting_call, account)
+            gas_price = gas_planner.gas_price()
+        else:
+            gas = bounded_gas(set_greeting_call, account)
+            gas_price = w3.eth.gas_price
+        transaction = set_greeting_call.build_transaction({
             "chainId": 1337,
             "from": account,
             "nonce": nonce,
-            "gas": 200000,
-            "gasPrice": w3.eth.gas_price,
+            "gas": gas,
+            "gasPrice": gas_price,
         })
         
         # Sign and send transaction
-        signed_txn = w3.eth.account.sign_transaction(transaction, private_key=private_key)
-        tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        with REGISTRY.time("sign", "setGreeting"):
+            signed_txn = w3.eth.account.sign_transaction(transaction, private_key=private_key)
+        with REGISTRY.time("send", "setGreeting"):
+            tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
         
         print(" Waiting for transaction confirmation...")
-        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        with REGISTRY.time("receipt", "setGreeting"):
+            if receipt_collector is not None:
+                tx_receipt = receipt_collector.wait(tx_hash)
+            else:
+                tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        if gas_planner is not None:
+            gas_planner.record_receipt(set_greeting_call, tx_receipt)
+            gas_planner.notify_block(tx_receipt.blockNumber)
+        if read_cache is not None:
+            read_cache.invalidate()
+            read_cache.notify_block(tx_receipt.blockNumber)
         
         if tx_receipt.status == 1:
             print(" Greeting updated successfully!")
@@ -75,12 +111,20 @@ def set_greeting(contract, w3, account, private_key, new_greeting):
         
     except Exception as e:
         print(f" Error setting greeting: {str(e)}")
+        if nonce_manager is not None:
+            nonce_manager.resync()
         return None
 
-def get_contract_info(contract):
-    """Get contract information"""
+def get_contract_info(contract, index=None, read_cache=None):
+    """Get contract information, from the local event index or the read cache when given"""
     try:
-        info = contract.functions.getContractInfo().call()
+        if index is not None:
+            index.sync(contract)
+            info = index.contract_info(contract.address)
+        elif read_cache is not None:
+            info = read_cache.get_contract_info()
+        else:
+            info = contract.functions.getContractInfo().call()
         print(f"\n Contract Information:")
         print(f"   Current Greeting: '{info[0]}'")
         print(f"   Owner: {info[1]}")
@@ -91,19 +135,29 @@ def get_contract_info(contract):
         print(f" Error getting contract info: {str(e)}")
         return None
 
-def get_greeting_history(contract):
-    """Get greeting history"""
+def get_greeting_history(contract, index=None):
+    """Get greeting history, from the local event index when one is given"""
     try:
-        history_count = contract.functions.getHistoryCount().call()
+        if index is not None:
+            index.sync(contract)
+            history_count = index.history_count(contract.address)
+            entries = (
+                (i, *entry) for i, entry in enumerate(index.history(contract.address))
+            )
+        else:
+            from history_reader import iter_history
+            
+            history_count = contract.functions.getHistoryCount().call()
+            # Entries arrive in batched pages instead of one call per entry
+            entries = iter_history(contract, stop=history_count)
+
         print(f"\n Greeting History ({history_count} entries):")
         print("=" * 80)
         
-        for i in range(history_count):
-            history = contract.functions.getGreetingFromHistory(i).call()
-            timestamp = datetime.fromtimestamp(history[2])
-            print(f"\n{i + 1}. Message: '{history[0]}'")
-            print(f"   Updated By: {history[1]}")
-            print(f"   Timestamp: {timestamp}")
+        for i, message, updated_by, timestamp in entries:
+            print(f"\n{i + 1}. Message: '{message}'")
+            print(f"   Updated By: {updated_by}")
+            print(f"   Timestamp: {datetime.fromtimestamp(timestamp)}")
         
         print("=" * 80)
         return history_count
@@ -112,8 +166,13 @@ def get_greeting_history(contract):
         print(f" Error getting history: {str(e)}")
         return None
 
-def interactive_menu(contract, w3, account, private_key):
+def interactive_menu(contract, w3, account, private_key, index=None):
     """Interactive menu for contract interaction"""
+    from nonce_manager import NonceManager
+    
+    nonce_manager = NonceManager(w3, account)
+    gas_planner = GasPlanner(w3)
+    read_cache = ReadCache(contract)
     while True:
         print("\n" + "=" * 60)
         print(" GREETING CONTRACT INTERACTION MENU")
@@ -128,23 +187,26 @@ def interactive_menu(contract, w3, account, private_key):
         choice = input("\n Enter your choice (1-5): ").strip()
         
         if choice == "1":
-            get_greeting(contract)
+            get_greeting(contract, read_cache)
             
         elif choice == "2":
             new_greeting = input("\n Enter new greeting: ").strip()
             if new_greeting:
-                set_greeting(contract, w3, account, private_key, new_greeting)
+                set_greeting(contract, w3, account, private_key, new_greeting, nonce_manager,
+                             gas_planner, read_cache)
             else:
                 print(" Greeting cannot be empty!")
                 
         elif choice == "3":
-            get_contract_info(contract)
+            get_contract_info(contract, index, read_cache)
             
         elif choice == "4":
-            get_greeting_history(contract)
+            get_greeting_history(contract, index)
             
         elif choice == "5":
-            print("\n Goodbye!")
+            stats = read_cache.stats()
+            print(f"\n Read cache: {stats['hits']} hits, {stats['misses']} misses")
+            print(" Goodbye!")
             break
             
         else:
@@ -158,11 +220,11 @@ def main():
     
     # Connect to Ganache
     print("\n Connecting to Ganache...")
-    ganache_url = os.getenv("GANACHE_URL", "http://127.0.0.1:7545")
-    w3 = Web3(Web3.HTTPProvider(ganache_url))
+    w3 = connect()
     
     if not w3.is_connected():
         print(" Failed to connect to Ganache!")
+        print(f" Make sure Ganache is running on {ganache_url()}")
         return
     
     print(" Connected to Ganache!")
@@ -173,8 +235,7 @@ def main():
         print(f" Contract loaded at: {contract_address}")
         
         # Get account from environment
-        private_key = os.getenv("PRIVATE_KEY")
-        account = os.getenv("ACCOUNT_ADDRESS")
+        account, private_key = load_credentials()
         
         if not private_key or not account:
             print("\n  No private key found in .env file!")
@@ -183,16 +244,20 @@ def main():
             print("   ACCOUNT_ADDRESS=your_account_address_here")
             return
         
-        # Validate account
-        if not account.startswith('0x'):
-            account = '0x' + account
-        if not private_key.startswith('0x'):
-            private_key = '0x' + private_key
-        
         print(f" Using Account: {account}")
         
+        # Serve history and info views from a local event index if configured
+        index = None
+        index_path = os.getenv("GREETING_INDEX_DB")
+        if index_path:
+            from indexer import GreetingIndex
+            
+            index = GreetingIndex(index_path)
+            print(f" Using event index: {index_path}")
+        
         # Start interactive menu
-        interactive_menu(contract, w3, account, private_key)
+        interactive_menu(contract, w3, account, private_key, index)
+        export_from_env()
         
     except FileNotFoundError:
         print(" Contract not deployed! Please run 'python deploy.py' first.")
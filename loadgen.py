@@ -0,0 +1,177 @@
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+from client import connect, ganache_url
+from interact import load_contract
+
+def percentiles(samples):
+    """Summarize latency samples (seconds) as milliseconds"""
+    if not samples:
+        return {"count": 0}
+    if len(samples) == 1:
+        value = samples[0] * 1000
+        return {"count": 1, "mean": value, "p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "count": len(samples),
+        "mean": statistics.fmean(samples) * 1000,
+        "p50": cuts[49] * 1000,
+        "p95": cuts[94] * 1000,
+        "p99": cuts[98] * 1000,
+    }
+
+def serialized_middleware(make_request, w3):
+    """Run one request at a time; eth-tester is not safe to call from several threads
+
+    Re-entrant because some middlewares issue nested requests of their own.
+    """
+    lock = threading.RLock()
+
+    def middleware(method, params):
+        with lock:
+            return make_request(method, params)
+
+    return middleware
+
+def in_process_contract():
+    """Start an eth-tester chain and deploy the compiled contract on it"""
+    from local_chain import LocalChain
+
+    chain = LocalChain()
+    chain.w3.middleware_onion.add(serialized_middleware, "serialize")
+    return chain.w3, chain.contract
+
+class LoadGenerator:
+    """Closed-loop load: each worker runs one operation at a time until the deadline
+
+    Writes are sent from the node's unlocked accounts (worker i uses account
+    i mod N) so the node assigns nonces. Three latencies are recorded:
+    submission (send_transaction returns), inclusion (receipt available,
+    measured from the start of submission) and reads (one eth_call).
+    """
+
+    def __init__(self, w3, contract, workers, write_ratio, duration, poll_latency=0.01):
+        self.w3 = w3
+        self.contract = contract
+        self.workers = workers
+        self.write_ratio = write_ratio
+        self.duration = duration
+        self.poll_latency = poll_latency
+        self.accounts = w3.eth.accounts
+        self._lock = threading.Lock()
+        self.latencies = {"submission": [], "inclusion": [], "read": []}
+        self.counts = {"write": 0, "read": 0, "write_errors": 0, "read_errors": 0}
+
+    def _record(self, kind, **samples):
+        with self._lock:
+            self.counts[kind] += 1
+            for name, value in samples.items():
+                self.latencies[name].append(value)
+
+    def _write(self, account, n):
+        start = time.perf_counter()
+        tx_hash = self.contract.functions.setGreeting(f"Load test greeting {n}").transact({"from": account})
+        submitted = time.perf_counter()
+        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=self.poll_latency)
+        included = time.perf_counter()
+        if receipt.status != 1:
+            raise RuntimeError(f"Transaction {tx_hash.hex()} reverted")
+        self._record("write", submission=submitted - start, inclusion=included - start)
+
+    def _read(self, rng):
+        start = time.perf_counter()
+        if rng.random() < 0.5:
+            self.contract.functions.getGreeting().call()
+        else:
+            self.contract.functions.getContractInfo().call()
+        self._record("read", read=time.perf_counter() - start)
+
+    def _worker(self, worker_id, deadline):
+        rng = random.Random(worker_id)
+        account = self.accounts[worker_id % len(self.accounts)]
+        n = 0
+        while time.perf_counter() < deadline:
+            is_write = rng.random() < self.write_ratio
+            try:
+                if is_write:
+                    self._write(account, f"{worker_id}-{n}")
+                else:
+                    self._read(rng)
+            except Exception:
+                with self._lock:
+                    self.counts["write_errors" if is_write else "read_errors"] += 1
+            n += 1
+
+    def run(self):
+        """Run the load and return the results as a JSON-serializable dict"""
+        start = time.perf_counter()
+        deadline = start + self.duration
+        threads = [
+            threading.Thread(target=self._worker, args=(worker_id, deadline))
+            for worker_id in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        return {
+            "config": {
+                "workers": self.workers,
+                "write_ratio": self.write_ratio,
+                "duration": self.duration,
+            },
+            "elapsed": elapsed,
+            "ops_per_sec": {
+                "write": self.counts["write"] / elapsed,
+                "read": self.counts["read"] / elapsed,
+                "total": (self.counts["write"] + self.counts["read"]) / elapsed,
+            },
+            "counts": self.counts,
+            "latency_ms": {name: percentiles(samples) for name, samples in self.latencies.items()},
+        }
+
+def main():
+    """Run a load test against Ganache or an in-process chain"""
+    parser = argparse.ArgumentParser(description="Greeting contract load generator")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--write-ratio", type=float, default=0.2,
+                        help="fraction of operations that are setGreeting writes")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--in-process", action="store_true",
+                        help="deploy to an in-process eth-tester chain instead of Ganache")
+    parser.add_argument("--output", default="loadgen_results.json")
+    args = parser.parse_args()
+
+    if args.in_process:
+        w3, contract = in_process_contract()
+    else:
+        # One pooled connection per worker
+        w3 = connect(pool_size=args.workers)
+        if not w3.is_connected():
+            print(f" Failed to connect to {ganache_url()}")
+            return
+        contract, _ = load_contract(w3)
+
+    print(f" Running {args.workers} workers for {args.duration}s "
+          f"({args.write_ratio:.0%} writes) against {contract.address}")
+    results = LoadGenerator(w3, contract, args.workers, args.write_ratio, args.duration).run()
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=4)
+
+    print("=" * 60)
+    print(f" Throughput: {results['ops_per_sec']['total']:.1f} ops/s "
+          f"({results['ops_per_sec']['write']:.1f} writes/s, {results['ops_per_sec']['read']:.1f} reads/s)")
+    for name, stats in results["latency_ms"].items():
+        if stats["count"]:
+            print(f" {name:<11} p50 {stats['p50']:8.2f} ms  p95 {stats['p95']:8.2f} ms  p99 {stats['p99']:8.2f} ms")
+    print(f" Errors: {results['counts']['write_errors']} writes, {results['counts']['read_errors']} reads")
+    print(f" Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
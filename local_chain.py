@@ -0,0 +1,38 @@
+from web3 import Web3, EthereumTesterProvider
+from eth_tester.backends.pyevm.main import get_default_account_keys
+from deloy import compile_contract
+
+DEFAULT_INITIAL_GREETING = "Hello, Blockchain World!"
+
+class LocalChain:
+    """In-process eth-tester (py-evm) chain with GreetingContract deployed
+
+    Needs no Ganache and shares no state with other processes, so every test
+    process can run its own chain. snapshot()/revert() wrap evm_snapshot and
+    evm_revert to roll the chain back between tests.
+    """
+
+    def __init__(self, source_file="contract.sol", contract_name="GreetingContract",
+                 initial_greeting=DEFAULT_INITIAL_GREETING):
+        compiled_sol = compile_contract(source_file=source_file, save_output=False)
+        contract_interface = compiled_sol["contracts"][source_file][contract_name]
+
+        self.w3 = Web3(EthereumTesterProvider())
+        self.accounts = self.w3.eth.accounts
+        self.private_keys = [key.to_hex() for key in get_default_account_keys()]
+        self.abi = contract_interface["abi"]
+        self.bytecode = contract_interface["evm"]["bytecode"]["object"]
+        self.contract = self.deploy(initial_greeting)
+
+    def deploy(self, initial_greeting=DEFAULT_INITIAL_GREETING, account_index=0):
+        """Deploy a new contract instance from one of the test accounts"""
+        factory = self.w3.eth.contract(abi=self.abi, bytecode=self.bytecode)
+        tx_hash = factory.constructor(initial_greeting).transact({"from": self.accounts[account_index]})
+        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        return self.w3.eth.contract(address=receipt.contractAddress, abi=self.abi)
+
+    def snapshot(self):
+        return self.w3.testing.snapshot()
+
+    def revert(self, snapshot_id):
+        self.w3.testing.revert(snapshot_id)
@@ -0,0 +1,124 @@
+import json
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+from web3.datastructures import AttributeDict
+
+EVENT_NAMES = ("GreetingSet", "GreetingUpdated")
+
+class _EventLayout:
+    """Where each argument of one event lives in a log, worked out once from the ABI"""
+
+    __slots__ = ("name", "topic_args", "data_args", "head_size")
+
+    def __init__(self, event_abi):
+        self.name = event_abi["name"]
+        self.topic_args = []  # (name, topic position)
+        self.data_args = []   # (name, is_string, head offset)
+        for input_abi in event_abi["inputs"]:
+            kind = input_abi["type"]
+            if input_abi.get("indexed"):
+                if kind != "address":
+                    raise ValueError(f"{self.name}: unsupported indexed type {kind}")
+                self.topic_args.append((input_abi["name"], len(self.topic_args) + 1))
+            elif kind in ("string", "uint256"):
+                self.data_args.append((input_abi["name"], kind == "string", 32 * len(self.data_args)))
+            else:
+                raise ValueError(f"{self.name}: unsupported type {kind}")
+        self.head_size = 32 * len(self.data_args)
+
+class LogDecoder:
+    """Decodes GreetingSet/GreetingUpdated logs without going through eth-abi
+
+    Both events have the same shape: an indexed address topic and a data
+    section of dynamic strings and uint256 words. The layout is taken from
+    the ABI once, and each log is then read with memoryview slices of its
+    data, so no copies are made before the final str() of each string.
+    Updater addresses are checksummed once and cached, since a few accounts
+    write most of the history.
+
+    decode_log() returns the same value as the event's process_log(): an
+    AttributeDict when the log is one, a plain dict otherwise.
+    """
+
+    def __init__(self, abi):
+        events = {item["name"]: item for item in abi if item.get("type") == "event"}
+        missing = [name for name in EVENT_NAMES if name not in events]
+        if missing:
+            raise ValueError(f"ABI has no {', '.join(missing)} event")
+        self.layouts = {
+            event_abi_to_log_topic(events[name]): _EventLayout(events[name])
+            for name in EVENT_NAMES
+        }
+        self.topics = ["0x" + topic.hex() for topic in self.layouts]
+        self._addresses = {}
+
+    def decode_args(self, topics, data):
+        """Return (event name, args dict) for one log's topics and data"""
+        layout = self.layouts.get(_as_bytes(topics[0]))
+        if layout is None:
+            raise ValueError("Not a GreetingSet/GreetingUpdated log")
+        if len(topics) != len(layout.topic_args) + 1:
+            raise ValueError(f"{layout.name} log has {len(topics)} topics")
+
+        args = {}
+        for name, position in layout.topic_args:
+            topic = _as_bytes(topics[position])
+            address = self._addresses.get(topic)
+            if address is None:
+                address = self._addresses[topic] = to_checksum_address(topic[12:])
+            args[name] = address
+
+        data = memoryview(_as_bytes(data))
+        size = len(data)
+        if size < layout.head_size:
+            raise ValueError(f"{layout.name} log data is too short")
+        for name, is_string, head in layout.data_args:
+            word = int.from_bytes(data[head:head + 32], "big")
+            if is_string:
+                start = word + 32
+                end = start + int.from_bytes(data[word:start], "big")
+                if start > size or end > size:
+                    raise ValueError(f"{layout.name}.{name} points past the log data")
+                args[name] = str(data[start:end], "utf-8")
+            else:
+                args[name] = word
+        return layout.name, args
+
+    def decode_log(self, log):
+        name, args = self.decode_args(log["topics"], log["data"])
+        if isinstance(log, AttributeDict):
+            args = AttributeDict(args)
+        event = {
+            "args": args,
+            "event": name,
+            "logIndex": log["logIndex"],
+            "transactionIndex": log["transactionIndex"],
+            "transactionHash": log["transactionHash"],
+            "address": log["address"],
+            "blockHash": log["blockHash"],
+            "blockNumber": log["blockNumber"],
+        }
+        return AttributeDict(event) if isinstance(log, AttributeDict) else event
+
+    def decode_logs(self, logs):
+        """Decode a batch of logs, e.g. one eth_getLogs response, into a list"""
+        decode_log = self.decode_log
+        return [decode_log(log) for log in logs]
+
+    def process_receipt(self, receipt):
+        """Decoded GreetingSet/GreetingUpdated logs of a receipt; other logs are skipped"""
+        layouts = self.layouts
+        return [
+            self.decode_log(log) for log in receipt["logs"]
+            if log["topics"] and _as_bytes(log["topics"][0]) in layouts
+        ]
+
+def _as_bytes(value):
+    """Log fields arrive as HexBytes from web3 and as 0x strings from raw RPC responses"""
+    if isinstance(value, bytes):
+        return value
+    return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+
+def load_decoder(abi_file="contract_abi.json"):
+    """LogDecoder for the ABI saved by the deploy script"""
+    with open(abi_file, "r") as file:
+        return LogDecoder(json.load(file))
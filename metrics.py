@@ -0,0 +1,243 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds in seconds, as in the Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_HELP = {
+    "rpc_request_seconds": ("histogram", "JSON-RPC request latency by method"),
+    "contract_call_seconds": ("histogram", "Latency of RPC requests carrying a contract call, by function"),
+    "write_phase_seconds": ("histogram", "Time spent signing, sending and waiting for receipts"),
+    "rpc_errors_total": ("counter", "JSON-RPC requests that raised or returned an error"),
+}
+
+class Histogram:
+    """Cumulative-bucket latency histogram"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside its bucket, like histogram_quantile()"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets + (self.max,), self.counts):
+            if count and seen + count >= rank:
+                return lower + (min(bound, self.max) - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.max
+
+class Metrics:
+    """Thread-safe registry of latency histograms and error counters
+
+    Series are keyed by metric name and a sorted tuple of label pairs.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._selectors = {}
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe_request(self, method, params, seconds, failed=False):
+        """Record one JSON-RPC request by method, and by contract function when it carries one"""
+        function = self.function_name(params)
+        self.observe("rpc_request_seconds", seconds, method=method)
+        if function:
+            self.observe("contract_call_seconds", seconds, function=function, method=method)
+        if failed:
+            self.increment("rpc_errors_total", method=method, function=function or "")
+
+    @contextmanager
+    def time(self, phase, function=""):
+        """Time one phase of a write (sign, send, receipt) into write_phase_seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("write_phase_seconds", time.perf_counter() - start,
+                         phase=phase, function=function)
+
+    def register_abi(self, abi):
+        """Learn the 4-byte selectors of a contract ABI to label eth_call and eth_estimateGas"""
+        from eth_utils import function_abi_to_4byte_selector
+
+        with self._lock:
+            for item in abi:
+                if item.get("type") == "function":
+                    selector = "0x" + function_abi_to_4byte_selector(item).hex()
+                    self._selectors[selector] = item["name"]
+
+    def function_name(self, params):
+        """Contract function called by an eth_call/eth_estimateGas/eth_sendTransaction, if known"""
+        if params and isinstance(params[0], dict):
+            data = params[0].get("data") or params[0].get("input") or ""
+            if isinstance(data, bytes):
+                data = "0x" + data.hex()
+            return self._selectors.get(data[:10].lower())
+        return None
+
+    def to_prometheus(self, prefix="greeting_"):
+        """Render every series in the Prometheus text exposition format"""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        lines = []
+        described = set()
+
+        def describe(name):
+            if name not in described:
+                kind, text = METRIC_HELP.get(name, ("untyped", name))
+                lines.append(f"# HELP {prefix}{name} {text}")
+                lines.append(f"# TYPE {prefix}{name} {kind}")
+                described.add(name)
+
+        for (name, labels), histogram in histograms:
+            describe(name)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{prefix}{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{prefix}{name}_sum{_labels(labels)} {histogram.sum}")
+            lines.append(f"{prefix}{name}_count{_labels(labels)} {histogram.count}")
+
+        for (name, labels), value in counters:
+            describe(name)
+            lines.append(f"{prefix}{name}{_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """Per-series count, mean, p50/p95/p99 and max in milliseconds, plus error counts"""
+        with self._lock:
+            series = [
+                {
+                    "metric": name,
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "mean_ms": histogram.sum / histogram.count * 1000,
+                    "p50_ms": histogram.quantile(0.50) * 1000,
+                    "p95_ms": histogram.quantile(0.95) * 1000,
+                    "p99_ms": histogram.quantile(0.99) * 1000,
+                    "max_ms": histogram.max * 1000,
+                }
+                for (name, labels), histogram in sorted(self._histograms.items())
+            ]
+            errors = [
+                {"metric": name, "labels": dict(labels), "count": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+        return {"duration": time.time() - self.started_at, "series": series, "errors": errors}
+
+    def write(self, path):
+        """Write the Prometheus text to `path` and the run summary next to it as JSON"""
+        with open(path, "w") as file:
+            file.write(self.to_prometheus())
+        summary_path = path.rsplit(".", 1)[0] + ".json"
+        with open(summary_path, "w") as file:
+            json.dump(self.summary(), file, indent=4)
+        return summary_path
+
+    def print_summary(self, limit=15):
+        """Print the slowest series by total time spent"""
+        series = sorted(self.summary()["series"], key=lambda s: s["count"] * s["mean_ms"], reverse=True)
+        print("=" * 90)
+        print(f" {'series':<58} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+        for entry in series[:limit]:
+            name = entry["metric"] + _labels(tuple(entry["labels"].items()))
+            print(f" {name[:58]:<58} {entry['count']:>6} {entry['p50_ms']:>8.2f} "
+                  f"{entry['p95_ms']:>8.2f} {entry['max_ms']:>8.2f}")
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in pairs) + "}"
+
+def metrics_middleware(metrics):
+    """web3 middleware recording latency and errors per RPC method and contract function"""
+    def factory(make_request, w3):
+        def middleware(method, params):
+            start = time.perf_counter()
+            failed = True
+            try:
+                response = make_request(method, params)
+                failed = "error" in response
+                return response
+            finally:
+                metrics.observe_request(method, params, time.perf_counter() - start, failed)
+
+        return middleware
+
+    # Lets metrics_for() find the registry of a Web3 instance
+    factory.metrics = metrics
+    return factory
+
+def metrics_for(w3):
+    """The Metrics behind a Web3 instance's metrics middleware, or None
+
+    For code that talks to the node without the middleware stack, such as
+    JSON-RPC batches, and records its requests itself.
+    """
+    for middleware in list(w3.middleware_onion) + list(getattr(w3.provider, "middlewares", ())):
+        metrics = getattr(middleware, "metrics", None)
+        if metrics is not None:
+            return metrics
+    return None
+
+# Shared registry for the scripts; pass a separate Metrics() to isolate a component
+REGISTRY = Metrics()
+
+def enabled():
+    """Whether METRICS_FILE asks for metrics to be exported"""
+    return bool(os.getenv("METRICS_FILE"))
+
+def export_from_env(metrics=REGISTRY):
+    """Write metrics to METRICS_FILE (if set) and print the run summary"""
+    path = os.getenv("METRICS_FILE")
+    if not path:
+        return
+    summary_path = metrics.write(path)
+    metrics.print_summary()
+    print(f" Metrics written to {path} and {summary_path}")
@@ -0,0 +1,236 @@
+import threading
+import time
+from collections import deque
+from web3.exceptions import TransactionNotFound
+from gas_planner import bounded_gas
+from metrics import REGISTRY
+
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_POLL_INTERVAL = 0.1
+DEFAULT_RECEIPT_TIMEOUT = 120
+
+# Node error fragments meaning our local nonce no longer matches the chain
+NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid transaction nonce",
+    "correct nonce",
+    "already known",
+    "replacement transaction",
+)
+
+def is_nonce_error(error):
+    """Check whether a send failure was caused by a stale nonce"""
+    message = str(error).lower()
+    return any(fragment in message for fragment in NONCE_ERRORS)
+
+class NonceManager:
+    """Hands out consecutive nonces for one account without a node round trip
+
+    The first nonce is read from the node (counting pending transactions);
+    after that nonces are assigned locally. Call resync() after a failed
+    send so a gap left by the failure does not stall later transactions.
+    """
+
+    def __init__(self, w3, account):
+        self.w3 = w3
+        self.account = account
+        self._lock = threading.Lock()
+        self._next = None
+
+    def next_nonce(self):
+        with self._lock:
+            if self._next is None:
+                self._next = self.w3.eth.get_transaction_count(self.account, "pending")
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    def reserve(self, count):
+        """Set aside `count` consecutive nonces, returning the first one"""
+        with self._lock:
+            if self._next is None:
+                self._next = self.w3.eth.get_transaction_count(self.account, "pending")
+            first = self._next
+            self._next += count
+            return first
+
+    def resync(self):
+        """Drop the local counter and reload it from the node"""
+        with self._lock:
+            self._next = self.w3.eth.get_transaction_count(self.account, "pending")
+
+class PipelinedSubmitter:
+    """Keeps up to `max_in_flight` signed transactions pending at once
+
+    Transactions are signed with locally tracked nonces and sent without
+    waiting for the previous one to be mined. Receipts are collected as
+    they become available, so throughput is bound by the node rather than
+    by one confirmation round trip per write. With a ReceiptCollector the
+    receipts come from its one batched pass per block instead of one
+    eth_getTransactionReceipt per in-flight transaction and poll.
+    """
+
+    def __init__(self, w3, account, private_key, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 nonce_manager=None, gas_planner=None, chain_id=1337, gas=None,
+                 poll_interval=DEFAULT_POLL_INTERVAL, receipt_timeout=DEFAULT_RECEIPT_TIMEOUT,
+                 receipt_collector=None):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be positive")
+        self.w3 = w3
+        self.account = account
+        self.private_key = private_key
+        self.max_in_flight = max_in_flight
+        self.nonces = nonce_manager or NonceManager(w3, account)
+        self.gas_planner = gas_planner
+        self.chain_id = chain_id
+        self.gas = gas
+        self.poll_interval = poll_interval
+        self.receipt_timeout = receipt_timeout
+        self.receipt_collector = receipt_collector
+        self._in_flight = deque()
+
+    def send(self, contract_function, tag=None, gas=None):
+        """Sign and send one contract call, returning its transaction hash
+
+        `gas` overrides the planner's gas limit; with no planner and no `gas`
+        here or on the submitter, each call is estimated on its own. A stale
+        nonce triggers one resync and retry, unless the node already has this
+        very transaction (an earlier attempt got through), in which case its
+        hash is returned instead of writing the greeting twice. Any other
+        error also resyncs the nonce counter before being re-raised.
+        """
+        if self.gas_planner is not None:
+            if gas is None:
+                gas = self.gas_planner.estimate_gas(contract_function, self.account)
+            gas_price = self.gas_planner.gas_price()
+        else:
+            gas = gas or self.gas or bounded_gas(contract_function, self.account)
+            gas_price = self.w3.eth.gas_price
+
+        for attempt in range(2):
+            transaction = contract_function.build_transaction({
+                "chainId": self.chain_id,
+                "from": self.account,
+                "nonce": self.nonces.next_nonce(),
+                "gas": gas,
+                "gasPrice": gas_price,
+            })
+            with REGISTRY.time("sign", contract_function.fn_name):
+                signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
+            try:
+                with REGISTRY.time("send", contract_function.fn_name):
+                    tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            except Exception as e:
+                if is_nonce_error(e) and self._already_sent(signed_txn.hash):
+                    self._track(tag, signed_txn.hash, contract_function)
+                    return signed_txn.hash
+                self.nonces.resync()
+                if attempt == 0 and is_nonce_error(e):
+                    continue
+                raise
+            self._track(tag, tx_hash, contract_function)
+            return tx_hash
+
+    def _already_sent(self, tx_hash):
+        """Whether the node knows this signed transaction, pending or mined"""
+        try:
+            self.w3.eth.get_transaction(tx_hash)
+        except TransactionNotFound:
+            return False
+        return True
+
+    def collect_ready(self):
+        """Pop every in-flight transaction that has a receipt, returning (tag, tx_hash, receipt)"""
+        ready = []
+        still_pending = deque()
+        if self.receipt_collector is not None:
+            self.receipt_collector.poll()
+        for entry in self._in_flight:
+            tag, tx_hash, sent_at, contract_function, future = entry
+            if future is not None:
+                if not future.done():
+                    still_pending.append(entry)
+                    continue
+                # Raises TimeoutError or TransactionDropped from the collector
+                receipt = future.result()
+            else:
+                try:
+                    receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+                except TransactionNotFound:
+                    if time.monotonic() - sent_at > self.receipt_timeout:
+                        raise TimeoutError(f"No receipt for {tx_hash.hex()} after {self.receipt_timeout}s")
+                    still_pending.append(entry)
+                    continue
+            if contract_function is not None:
+                # Resolution is limited by how often receipts are polled
+                REGISTRY.observe("write_phase_seconds", time.monotonic() - sent_at,
+                                 phase="receipt", function=contract_function.fn_name)
+                if self.gas_planner is not None:
+                    self.gas_planner.record_receipt(contract_function, receipt)
+            ready.append((tag, tx_hash, receipt))
+        self._in_flight = still_pending
+        return ready
+
+    def _wait_for_receipts(self, until_in_flight):
+        """Collect receipts until at most `until_in_flight` transactions remain pending"""
+        while len(self._in_flight) > until_in_flight:
+            ready = self.collect_ready()
+            yield from ready
+            if not ready and len(self._in_flight) > until_in_flight:
+                time.sleep(self.poll_interval)
+
+    @property
+    def in_flight(self):
+        """Number of sent transactions still waiting for a receipt"""
+        return len(self._in_flight)
+
+    def _track(self, tag, tx_hash, contract_function):
+        future = None
+        if self.receipt_collector is not None:
+            future = self.receipt_collector.watch(tx_hash, timeout=self.receipt_timeout)
+        self._in_flight.append((tag, tx_hash, time.monotonic(), contract_function, future))
+
+    def send_raw(self, raw_transaction, tag=None):
+        """Send a transaction signed ahead of time, e.g. by a ParallelSigner
+
+        Its nonce is fixed, so a failed send is not retried; the error is
+        re-raised and the transactions signed after it will be stuck
+        until the gap is filled.
+        """
+        with REGISTRY.time("send", "presigned"):
+            tx_hash = self.w3.eth.send_raw_transaction(raw_transaction)
+        self._track(tag, tx_hash, None)
+        return tx_hash
+
+    def track(self, tx_hash, tag=None):
+        """Wait for the receipt of a transaction sent earlier, e.g. by a previous run"""
+        self._track(tag, tx_hash, None)
+
+    def wait_for_slot(self):
+        """Yield (tag, tx_hash, receipt) until another transaction may be sent"""
+        yield from self._wait_for_receipts(self.max_in_flight - 1)
+
+    def drain(self):
+        """Wait for every transaction sent so far, yielding (tag, tx_hash, receipt)"""
+        yield from self._wait_for_receipts(0)
+
+    def submit_all(self, contract_functions):
+        """Send every call, yielding (index, tx_hash, receipt) as receipts arrive
+
+        Receipts are yielded in arrival order, which may differ from the
+        order of `contract_functions`; use the index to match them up.
+        """
+        for index, contract_function in enumerate(contract_functions):
+            yield from self.wait_for_slot()
+            self.send(contract_function, tag=index)
+
+        yield from self.drain()
+
+    def submit_signed(self, signed_transactions):
+        """Send (nonce, raw_transaction, tx_hash) tuples in order, yielding (index, tx_hash, receipt)"""
+        for index, (_, raw_transaction, _) in enumerate(signed_transactions):
+            yield from self.wait_for_slot()
+            self.send_raw(raw_transaction, tag=index)
+
+        yield from self.drain()
@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from eth_account import Account
+
+DEFAULT_CHUNK_SIZE = 64
+
+_worker_account = None
+
+def _init_worker(private_key):
+    # Runs once per worker process, so the key is sent and parsed only once
+    global _worker_account
+    _worker_account = Account.from_key(private_key)
+
+def _sign_chunk(transactions):
+    """Sign transactions with the worker's key, returning (nonce, raw, hash) tuples"""
+    signed = []
+    for transaction in transactions:
+        signed_txn = _worker_account.sign_transaction(transaction)
+        signed.append((transaction["nonce"], bytes(signed_txn.rawTransaction), bytes(signed_txn.hash)))
+    return signed
+
+def build_transactions(contract_functions, account, first_nonce, gas_limits, gas_price, chain_id):
+    """Transaction dicts with consecutive nonces from `first_nonce`
+
+    `gas_limits` holds one limit per call. Every field is given, so
+    building makes no node calls and can run offline once the gas limits
+    and price are known.
+    """
+    return [
+        contract_function.build_transaction({
+            "chainId": chain_id,
+            "from": account,
+            "nonce": first_nonce + i,
+            "gas": gas,
+            "gasPrice": gas_price,
+        })
+        for i, (contract_function, gas) in enumerate(zip(contract_functions, gas_limits, strict=True))
+    ]
+
+class ParallelSigner:
+    """Signs prebuilt transactions for one key in a pool of worker processes
+
+    ECDSA signing and RLP encoding are pure CPU work and hold the GIL, so
+    threads do not help; worker processes do. Transactions are handed out
+    in chunks of `chunk_size` to keep pickling overhead per transaction
+    low. With `workers=1` everything is signed in the calling process.
+    """
+
+    def __init__(self, private_key, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.private_key = private_key
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._pool = None
+
+    def sign_all(self, transactions):
+        """Return (nonce, raw_transaction, tx_hash) for every transaction, in nonce order"""
+        transactions = list(transactions)
+        chunks = [
+            transactions[start:start + self.chunk_size]
+            for start in range(0, len(transactions), self.chunk_size)
+        ]
+        if self.workers == 1:
+            _init_worker(self.private_key)
+            results = map(_sign_chunk, chunks)
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    self.workers, initializer=_init_worker, initargs=(self.private_key,)
+                )
+            results = self._pool.map(_sign_chunk, chunks)
+        return sorted((signed for chunk in results for signed in chunk), key=lambda signed: signed[0])
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def sign_calls(contract_functions, account, private_key, nonce_manager, gas_planner, workers=None,
+               chain_id=1337):
+    """Build and sign many contract calls with nonces reserved from `nonce_manager`
+
+    Each call's gas limit comes from `gas_planner`, which estimates once
+    per calldata-length bucket and covers the worst case of the greeting
+    each update replaces, since the presigned calls run against state
+    that does not exist yet. The result is ready for
+    PipelinedSubmitter.submit_signed(). The nonces stay reserved even if
+    the transactions are never sent, so send them all or resync the nonce
+    manager afterwards.
+    """
+    contract_functions = list(contract_functions)
+    gas_limits = [gas_planner.estimate_gas(call, account) for call in contract_functions]
+    gas_price = gas_planner.gas_price()
+    first_nonce = nonce_manager.reserve(len(contract_functions))
+    transactions = build_transactions(contract_functions, account, first_nonce, gas_limits,
+                                      gas_price, chain_id)
+    with ParallelSigner(private_key, workers) as signer:
+        return signer.sign_all(transactions)
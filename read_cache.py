@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_BLOCK_TTL = 1.0
+
+class ReadCache:
+    """Read-through cache for contract view calls, keyed by block number
+
+    Each call is cached under (function name, args, block) and the eth_call
+    is pinned to that block, so a cached value is always exactly what the
+    node returned for it. When a newer block is seen, entries for older
+    blocks are dropped.
+
+    Learning the current block costs an eth_blockNumber call, so the block
+    number itself is reused for `block_ttl` seconds: a burst of reads costs
+    at most one RPC call per TTL, and repeated reads within it cost none.
+    notify_block() advances the block without a call (for example from a
+    receipt), and invalidate() drops everything, for use once one of our
+    own transactions is confirmed. At most `max_entries` results are kept,
+    evicting the least recently used.
+    """
+
+    def __init__(self, contract, max_entries=DEFAULT_MAX_ENTRIES, block_ttl=DEFAULT_BLOCK_TTL):
+        self.contract = contract
+        self.w3 = contract.w3
+        self.max_entries = max_entries
+        self.block_ttl = block_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._block = None
+        self._block_checked_at = 0.0
+
+    def _advance(self, block_number):
+        """Move to a newer block and forget results from older ones (lock held)"""
+        if self._block is None or block_number > self._block:
+            self._entries.clear()
+            self._block = block_number
+        self._block_checked_at = time.monotonic()
+
+    def current_block(self):
+        """The block reads are pinned to, refreshed at most every block_ttl seconds"""
+        with self._lock:
+            if self._block is not None and time.monotonic() - self._block_checked_at <= self.block_ttl:
+                return self._block
+        block_number = self.w3.eth.block_number
+        with self._lock:
+            self._advance(block_number)
+            return self._block
+
+    def notify_block(self, block_number):
+        """Report a block seen elsewhere, such as in a transaction receipt"""
+        with self._lock:
+            self._advance(block_number)
+
+    def invalidate(self):
+        """Drop every cached result and re-read the block number on the next call"""
+        with self._lock:
+            self._entries.clear()
+            self._block = None
+
+    def call(self, fn_name, *args, block_number=None):
+        """Return contract.functions.<fn_name>(*args).call(), from the cache when possible
+
+        Pass `block_number` to pin several reads to the same block; by
+        default the current block is used.
+        """
+        if block_number is None:
+            block_number = self.current_block()
+        key = (fn_name, args, block_number)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = getattr(self.contract.functions, fn_name)(*args).call(block_identifier=block_number)
+        with self._lock:
+            # Skip storing if a newer block arrived while the call was running
+            if block_number == self._block:
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def get_greeting(self, block_number=None):
+        return self.call("getGreeting", block_number=block_number)
+
+    def get_contract_info(self, block_number=None):
+        return self.call("getContractInfo", block_number=block_number)
+
+    def stats(self):
+        """Return hit/miss counters and the current entry count"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
@@ -0,0 +1,182 @@
+import threading
+import time
+from concurrent.futures import Future, wait as wait_futures
+
+from hexbytes import HexBytes
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+
+from rpc_batch import batch_request
+
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_RECEIPT_TIMEOUT = 120
+DEFAULT_DROP_CHECK_BLOCKS = 3
+DEFAULT_BATCH_SIZE = 500
+
+class TransactionDropped(Exception):
+    """The node no longer knows a transaction that never got a receipt"""
+
+class _Watch:
+    __slots__ = ("future", "deadline", "first_block")
+
+    def __init__(self, future, deadline, first_block):
+        self.future = future
+        self.deadline = deadline
+        self.first_block = first_block
+
+class ReceiptCollector:
+    """Resolves receipts of many pending transactions with one pass per block
+
+    watch() returns a Future for a transaction hash. Each poll() makes one
+    eth_blockNumber call, and only when a new block has appeared does it ask
+    for the receipts of every pending hash, as JSON-RPC batches of up to
+    `batch_size` requests. The number of calls therefore follows the block
+    rate, not the number of transactions in flight. Hashes watched since the
+    last pass are also checked without waiting for a block, since they may
+    already be mined. A transaction still
+    without a receipt `drop_check_blocks` blocks after it was first watched
+    is also looked up with eth_getTransactionByHash in the same batch. If
+    the node no longer knows it, its future fails with TransactionDropped.
+    A future whose timeout expires fails with TimeoutError.
+
+    Call poll() yourself, or start() a background thread that polls every
+    `poll_interval` seconds. wait() works either way.
+    """
+
+    def __init__(self, w3, poll_interval=DEFAULT_POLL_INTERVAL, timeout=DEFAULT_RECEIPT_TIMEOUT,
+                 drop_check_blocks=DEFAULT_DROP_CHECK_BLOCKS, batch_size=DEFAULT_BATCH_SIZE):
+        self.w3 = w3
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.drop_check_blocks = drop_check_blocks
+        self.batch_size = batch_size
+        self.passes = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._last_block = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def pending(self):
+        """Number of watched transactions without a result yet"""
+        with self._lock:
+            return len(self._pending)
+
+    def watch(self, tx_hash, callback=None, timeout=None):
+        """Return a Future resolving to the receipt of `tx_hash`
+
+        `callback`, if given, is called with the future once it is done.
+        Watching a hash that is already pending returns the same future.
+        """
+        key = HexBytes(tx_hash).hex()
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            watch = self._pending.get(key)
+            if watch is None:
+                watch = _Watch(Future(), time.monotonic() + timeout, None)
+                self._pending[key] = watch
+        if callback is not None:
+            watch.future.add_done_callback(callback)
+        return watch.future
+
+    def wait(self, tx_hash, timeout=None):
+        """Block until the receipt of `tx_hash` arrives, polling if nobody else does"""
+        future = self.watch(tx_hash, timeout=timeout)
+        while not future.done():
+            if self._thread is None:
+                self.poll()
+            wait_futures([future], timeout=self.poll_interval)
+        return future.result()
+
+    def poll(self):
+        """Check for a new block and resolve what it can; returns the number of futures completed"""
+        with self._poll_lock:
+            block_number = self.w3.eth.block_number
+            new_block = self._last_block is None or block_number > self._last_block
+            self._last_block = block_number
+            completed = self._collect(block_number, only_unchecked=not new_block)
+            return completed + self._expire()
+
+    def _collect(self, block_number, only_unchecked=False):
+        with self._lock:
+            pending = [
+                (key, watch) for key, watch in self._pending.items()
+                if not only_unchecked or watch.first_block is None
+            ]
+        if not pending:
+            return 0
+        self.passes += 1
+
+        completed = 0
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            # Receipts for every hash, plus a lookup for those pending long enough to be dropped
+            calls = [("eth_getTransactionReceipt", [key]) for key, _ in chunk]
+            checks = [
+                (key, watch) for key, watch in chunk
+                if watch.first_block is not None and block_number - watch.first_block >= self.drop_check_blocks
+            ]
+            calls += [("eth_getTransactionByHash", [key]) for key, _ in checks]
+            results = batch_request(self.w3, calls)
+
+            receipts = {}
+            for (key, watch), receipt in zip(chunk, results):
+                receipts[key] = receipt
+                if watch.first_block is None:
+                    watch.first_block = block_number
+                if receipt is not None:
+                    completed += self._finish(key, result=AttributeDict.recursive(receipt_formatter(receipt)))
+            for (key, _), transaction in zip(checks, results[len(chunk):]):
+                if transaction is None and receipts[key] is None:
+                    completed += self._finish(key, error=TransactionDropped(f"Transaction {key} was dropped"))
+        return completed
+
+    def _expire(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, watch in self._pending.items() if now > watch.deadline]
+        return sum(
+            self._finish(key, error=TimeoutError(f"No receipt for {key} before the timeout"))
+            for key in expired
+        )
+
+    def _finish(self, key, result=None, error=None):
+        with self._lock:
+            watch = self._pending.pop(key, None)
+        if watch is None:
+            return 0
+        if error is not None:
+            watch.future.set_exception(error)
+        else:
+            watch.future.set_result(result)
+        return 1
+
+    def start(self):
+        """Poll in a background thread until stop()"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                # A failed pass is retried on the next tick; futures keep waiting
+                print(f" Receipt collector poll failed: {e}")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
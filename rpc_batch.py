@@ -0,0 +1,74 @@
+import json
+import time
+from itertools import count
+
+from web3 import Web3
+from web3._utils.request import make_post_request
+from metrics import metrics_for
+
+# Request ids only need to be unique within a single batch
+_request_ids = count()
+
+def supports_batching(w3):
+    """Check whether the provider accepts JSON-RPC batch payloads"""
+    return isinstance(w3.provider, Web3.HTTPProvider)
+
+def batch_request(w3, calls):
+    """Send several JSON-RPC calls and return their results in order
+
+    `calls` is a list of (method, params) pairs. Over HTTP the calls are
+    sent as a single JSON-RPC batch (one round trip); other providers fall
+    back to one request per call. A batch bypasses the web3 middlewares,
+    so when the Web3 instance has a metrics middleware each call in it is
+    recorded there directly, with the latency of the whole batch.
+    """
+    if not calls:
+        return []
+
+    if not supports_batching(w3):
+        return [w3.manager.request_blocking(method, params) for method, params in calls]
+
+    ids = [next(_request_ids) for _ in calls]
+    payload = [
+        {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+        for request_id, (method, params) in zip(ids, calls)
+    ]
+    provider = w3.provider
+    data = json.dumps(payload).encode("utf-8")
+    metrics = metrics_for(w3)
+    start = time.perf_counter()
+    by_id = {}
+    try:
+        session = getattr(provider, "session", None)
+        if session is not None:
+            # client.connect() providers share one pooled session
+            response = session.post(provider.endpoint_uri, data=data, **provider.get_request_kwargs())
+            response.raise_for_status()
+            raw_response = response.content
+        else:
+            raw_response = make_post_request(provider.endpoint_uri, data, **provider.get_request_kwargs())
+        responses = json.loads(raw_response)
+
+        # A node that rejects the whole batch answers with a single error object
+        if isinstance(responses, dict):
+            raise ValueError(responses.get("error", responses))
+
+        by_id = {response.get("id"): response for response in responses}
+    finally:
+        if metrics is not None:
+            elapsed = time.perf_counter() - start
+            for request_id, (method, params) in zip(ids, calls):
+                response = by_id.get(request_id, {})
+                metrics.observe_request(method, params, elapsed, "result" not in response)
+    return [
+        _unwrap(by_id.get(request_id, {}), method)
+        for request_id, (method, _) in zip(ids, calls)
+    ]
+
+def _unwrap(response, method):
+    """Return the result of a single JSON-RPC response or raise its error"""
+    if "error" in response:
+        raise ValueError(response["error"])
+    if "result" not in response:
+        raise ValueError(f"No response for {method} in batch")
+    return response["result"]
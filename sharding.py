@@ -0,0 +1,67 @@
+import heapq
+import json
+from eth_utils import keccak
+from history_reader import DEFAULT_CONCURRENCY, DEFAULT_PAGE_SIZE, iter_history
+
+def load_shards(w3, info_file="deployment_info.json", abi_file="contract_abi.json"):
+    """Contracts for every shard in the deployment info, or the single contract"""
+    with open(info_file, "r") as file:
+        deployment_info = json.load(file)
+    with open(abi_file, "r") as file:
+        abi = json.load(file)
+    shards = deployment_info.get("shards") or [{"address": deployment_info["contract_address"]}]
+    return [w3.eth.contract(address=shard["address"], abi=abi) for shard in shards]
+
+def shard_index(key, shard_count):
+    """Shard for a routing key; stable across processes, unlike hash()"""
+    return int.from_bytes(keccak(text=str(key))[:8], "big") % shard_count
+
+class ShardRouter:
+    """Spreads greeting writes over several contract instances by key
+
+    A key (a user id, a topic, ...) always maps to the same shard, so each
+    key's own history stays in order within one contract.
+    """
+
+    def __init__(self, contracts):
+        if not contracts:
+            raise ValueError("ShardRouter needs at least one contract")
+        self.contracts = list(contracts)
+
+    def shard_for(self, key):
+        return shard_index(key, len(self.contracts))
+
+    def contract_for(self, key):
+        return self.contracts[self.shard_for(key)]
+
+    def set_greeting(self, key, greeting):
+        """setGreeting call on the key's shard, ready for a submitter or SignerPool"""
+        return self.contract_for(key).functions.setGreeting(greeting)
+
+    def route(self, items):
+        """Yield a setGreeting call for each (key, greeting) pair"""
+        for key, greeting in items:
+            yield self.set_greeting(key, greeting)
+
+    def history_count(self):
+        """Total history entries over all shards"""
+        return sum(contract.functions.getHistoryCount().call() for contract in self.contracts)
+
+def _tagged_history(shard, contract, page_size, concurrency):
+    for index, message, updated_by, timestamp in iter_history(
+        contract, page_size=page_size, concurrency=concurrency
+    ):
+        yield shard, index, message, updated_by, timestamp
+
+def iter_merged_history(contracts, page_size=DEFAULT_PAGE_SIZE, concurrency=DEFAULT_CONCURRENCY):
+    """Yield (shard, index, message, updatedBy, timestamp) over all shards, oldest first
+
+    Each shard's history is already in timestamp order, so the streams are
+    merged lazily with one page per shard in memory. Entries with the same
+    timestamp come in shard order, then index order.
+    """
+    streams = [
+        _tagged_history(shard, contract, page_size, concurrency)
+        for shard, contract in enumerate(contracts)
+    ]
+    return heapq.merge(*streams, key=lambda entry: (entry[4], entry[0], entry[1]))
@@ -0,0 +1,113 @@
+import time
+from eth_account import Account
+from web3.exceptions import ContractLogicError
+from nonce_manager import PipelinedSubmitter, DEFAULT_MAX_IN_FLIGHT, DEFAULT_POLL_INTERVAL
+
+DEFAULT_MAX_FAILURES = 3
+
+class SignerPool:
+    """Spreads writes over several accounts, each with its own nonce sequence
+
+    Every key gets its own PipelinedSubmitter (and so its own NonceManager
+    and up to `max_in_flight` pending transactions), and each write goes to
+    the active signer with the fewest transactions in flight. One account's
+    nonces must be mined in order, so independent accounts let several
+    sequences progress side by side.
+
+    A signer is retired after `max_failures` failures in a row, counting
+    failed sends and reverted receipts; any success resets its count.
+    Reverts detected during gas estimation say nothing about the signer
+    and are not counted.
+    """
+
+    def __init__(self, w3, private_keys, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 max_failures=DEFAULT_MAX_FAILURES, gas_planner=None, chain_id=1337,
+                 poll_interval=DEFAULT_POLL_INTERVAL, receipt_collector=None):
+        if not private_keys:
+            raise ValueError("SignerPool needs at least one private key")
+        self.w3 = w3
+        self.max_failures = max_failures
+        self.poll_interval = poll_interval
+        self.accounts = [Account.from_key(key).address for key in private_keys]
+        self.submitters = [
+            PipelinedSubmitter(w3, account, key, max_in_flight=max_in_flight,
+                               gas_planner=gas_planner, chain_id=chain_id,
+                               poll_interval=poll_interval, receipt_collector=receipt_collector)
+            for account, key in zip(self.accounts, private_keys)
+        ]
+        self.failures = [0] * len(private_keys)
+        self.sent = [0] * len(private_keys)
+        self.retired = set()
+
+    @property
+    def active(self):
+        """Indexes of the signers still in use"""
+        return [i for i in range(len(self.submitters)) if i not in self.retired]
+
+    @property
+    def in_flight(self):
+        return sum(submitter.in_flight for submitter in self.submitters)
+
+    def _record(self, signer, ok):
+        if ok:
+            self.failures[signer] = 0
+            return
+        self.failures[signer] += 1
+        if self.failures[signer] >= self.max_failures:
+            self.retired.add(signer)
+
+    def _least_loaded(self):
+        active = self.active
+        if not active:
+            raise RuntimeError("Every signer in the pool has been retired after repeated failures")
+        return min(active, key=lambda i: self.submitters[i].in_flight)
+
+    def collect_ready(self):
+        """Pop every transaction that has a receipt, returning (tag, tx_hash, receipt)"""
+        ready = []
+        for signer, submitter in enumerate(self.submitters):
+            for (_, tag), tx_hash, receipt in submitter.collect_ready():
+                self._record(signer, receipt.status == 1)
+                ready.append((tag, tx_hash, receipt))
+        return ready
+
+    def wait_for_slot(self):
+        """Yield (tag, tx_hash, receipt) until some active signer can send again"""
+        while True:
+            signer = self._least_loaded()
+            submitter = self.submitters[signer]
+            if submitter.in_flight < submitter.max_in_flight:
+                return
+            ready = self.collect_ready()
+            yield from ready
+            if not ready:
+                time.sleep(self.poll_interval)
+
+    def send(self, contract_function, tag=None):
+        """Send one call from the least-loaded active signer, returning its transaction hash"""
+        signer = self._least_loaded()
+        try:
+            tx_hash = self.submitters[signer].send(contract_function, tag=(signer, tag))
+        except ContractLogicError:
+            raise
+        except Exception:
+            self._record(signer, False)
+            raise
+        self.sent[signer] += 1
+        return tx_hash
+
+    def drain(self):
+        """Wait for every transaction sent so far, yielding (tag, tx_hash, receipt)"""
+        while self.in_flight:
+            ready = self.collect_ready()
+            yield from ready
+            if not ready and self.in_flight:
+                time.sleep(self.poll_interval)
+
+    def submit_all(self, contract_functions):
+        """Send every call, yielding (index, tx_hash, receipt) as receipts arrive"""
+        for index, contract_function in enumerate(contract_functions):
+            yield from self.wait_for_slot()
+            self.send(contract_function, tag=index)
+
+        yield from self.drain()
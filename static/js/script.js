@@ -2,258 +2,37 @@
         let contract;
         let account;
 
-        // Contract Configuration - UPDATE THESE!
-        const CONTRACT_ADDRESS = '0x893490A3E30a31D927B745Df6131Ff29CD99a835'; // Replace with your deployed contract address
-        const CONTRACT_ABI = [
-    {
-        "inputs": [
-            {
-                "internalType": "string",
-                "name": "_initialGreeting",
-                "type": "string"
-            }
-        ],
-        "stateMutability": "nonpayable",
-        "type": "constructor"
-    },
-    {
-        "anonymous": false,
-        "inputs": [
-            {
-                "indexed": false,
-                "internalType": "string",
-                "name": "greeting",
-                "type": "string"
-            },
-            {
-                "indexed": true,
-                "internalType": "address",
-                "name": "setBy",
-                "type": "address"
-            },
-            {
-                "indexed": false,
-                "internalType": "uint256",
-                "name": "timestamp",
-                "type": "uint256"
-            }
-        ],
-        "name": "GreetingSet",
-        "type": "event"
-    },
-    {
-        "anonymous": false,
-        "inputs": [
-            {
-                "indexed": false,
-                "internalType": "string",
-                "name": "oldGreeting",
-                "type": "string"
-            },
-            {
-                "indexed": false,
-                "internalType": "string",
-                "name": "newGreeting",
-                "type": "string"
-            },
-            {
-                "indexed": true,
-                "internalType": "address",
-                "name": "updatedBy",
-                "type": "address"
-            },
-            {
-                "indexed": false,
-                "internalType": "uint256",
-                "name": "timestamp",
-                "type": "uint256"
-            }
-        ],
-        "name": "GreetingUpdated",
-        "type": "event"
-    },
-    {
-        "inputs": [],
-        "name": "getAllHistory",
-        "outputs": [
-            {
-                "components": [
-                    {
-                        "internalType": "string",
-                        "name": "message",
-                        "type": "string"
-                    },
-                    {
-                        "internalType": "address",
-                        "name": "updatedBy",
-                        "type": "address"
-                    },
-                    {
-                        "internalType": "uint256",
-                        "name": "timestamp",
-                        "type": "uint256"
-                    }
-                ],
-                "internalType": "struct GreetingContract.GreetingHistory[]",
-                "name": "",
-                "type": "tuple[]"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "getContractInfo",
-        "outputs": [
-            {
-                "internalType": "string",
-                "name": "currentGreeting",
-                "type": "string"
-            },
-            {
-                "internalType": "address",
-                "name": "contractOwner",
-                "type": "address"
-            },
-            {
-                "internalType": "uint256",
-                "name": "totalGreetings",
-                "type": "uint256"
-            },
-            {
-                "internalType": "uint256",
-                "name": "historyLength",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "getGreeting",
-        "outputs": [
-            {
-                "internalType": "string",
-                "name": "",
-                "type": "string"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "uint256",
-                "name": "index",
-                "type": "uint256"
-            }
-        ],
-        "name": "getGreetingFromHistory",
-        "outputs": [
-            {
-                "internalType": "string",
-                "name": "message",
-                "type": "string"
-            },
-            {
-                "internalType": "address",
-                "name": "updatedBy",
-                "type": "address"
-            },
-            {
-                "internalType": "uint256",
-                "name": "timestamp",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "getHistoryCount",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "greetingCount",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "name": "greetingHistories",
-        "outputs": [
-            {
-                "internalType": "string",
-                "name": "message",
-                "type": "string"
-            },
-            {
-                "internalType": "address",
-                "name": "updatedBy",
-                "type": "address"
-            },
-            {
-                "internalType": "uint256",
-                "name": "timestamp",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "owner",
-        "outputs": [
-            {
-                "internalType": "address",
-                "name": "",
-                "type": "address"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "string",
-                "name": "_newGreeting",
-                "type": "string"
-            }
-        ],
-        "name": "setGreeting",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function"
-    }
-]; // Replace with your contract ABI
+        // Reads come from api_server.py, which caches them for all viewers;
+        // the contract address and ABI are fetched from it on connect
+        const API_BASE = '/api';
+        const HISTORY_PAGE_SIZE = 20;
+        const REFRESH_INTERVAL_MS = 5000;
+        let historyOffset = 0;
+
+        async function fetchJSON(path) {
+            // The browser revalidates with If-None-Match; unchanged data comes back as 304
+            const response = await fetch(API_BASE + path, { cache: 'no-cache' });
+            const body = await response.json();
+            if (!response.ok) {
+                throw new Error(body.error || response.statusText);
+            }
+            return body;
+        }
+
+        // Same worst-case bound as gas_planner.py: the estimate depends on the
+        // greeting being replaced, so cover writing the new one from empty slots
+        // and clearing a long old one
+        const GAS_MARGIN = 1.25;
+        const FRESH_SLOT_GAS = 17100;
+        const CLEARED_SLOT_GAS = 5000;
+        const MAX_STRING_SLOTS = 7;
+
+        function gasLimit(estimate, greeting) {
+            const length = new TextEncoder().encode(greeting).length;
+            const slots = length < 32 ? 0 : Math.ceil(length / 32);
+            const allowance = FRESH_SLOT_GAS * slots + CLEARED_SLOT_GAS * MAX_STRING_SLOTS;
+            return Math.floor((Number(estimate) + allowance) * GAS_MARGIN);
+        }
 
         // Character counter
         document.getElementById('newGreeting')?.addEventListener('input', function() {
@@ -276,21 +55,17 @@
                 }
                 account = accounts[0];
 
-                // Initialize contract
-                contract = new web3.eth.Contract(CONTRACT_ABI, CONTRACT_ADDRESS);
+                // Initialize contract from the address and ABI the server was started with
+                const deployed = await fetchJSON('/contract');
+                contract = new web3.eth.Contract(deployed.abi, deployed.address);
 
                 // Update UI
                 document.getElementById('statusDot').classList.add('connected');
                 document.getElementById('statusText').textContent = `Connected: ${account.substring(0, 6)}...${account.substring(38)}`;
                 document.getElementById('notConnected').style.display = 'none';
-                document.getElementById('mainContent').style.display = 'block';
                 connectBtn.textContent = 'Connected ✓';
                 connectBtn.style.background = '#10b981';
 
-                // Load initial data
-                await loadGreeting();
-                await loadContractInfo();
-
                 showNotification('Successfully connected to Ganache!', 'success');
             } catch (error) {
                 console.error('Connection error:', error);
@@ -302,7 +77,7 @@
 
         async function loadGreeting() {
             try {
-                const greeting = await contract.methods.getGreeting().call();
+                const { greeting } = await fetchJSON('/greeting');
                 document.getElementById('currentGreeting').textContent = `"${greeting}"`;
             } catch (error) {
                 console.error('Error loading greeting:', error);
@@ -312,10 +87,10 @@
 
         async function loadContractInfo() {
             try {
-                const info = await contract.methods.getContractInfo().call();
-                document.getElementById('greetingCount').textContent = info[2];
-                document.getElementById('historyCount').textContent = info[3];
-                document.getElementById('contractOwner').textContent = info[1];
+                const info = await fetchJSON('/info');
+                document.getElementById('greetingCount').textContent = info.totalGreetings;
+                document.getElementById('historyCount').textContent = info.historyLength;
+                document.getElementById('contractOwner').textContent = info.owner;
             } catch (error) {
                 console.error('Error loading contract info:', error);
             }
@@ -325,6 +100,11 @@
             const newGreeting = document.getElementById('newGreeting').value.trim();
             const resultDiv = document.getElementById('setResult');
             
+            if (!contract) {
+                resultDiv.innerHTML = '<div class="result-box error">❌ Connect to Ganache to update the greeting</div>';
+                return;
+            }
+
             if (!newGreeting) {
                 resultDiv.innerHTML = '<div class="result-box error">❌ Greeting cannot be empty!</div>';
                 return;
@@ -338,9 +118,11 @@
             try {
                 resultDiv.innerHTML = '<div class="result-box"><div class="spinner"></div>Sending transaction...</div>';
 
-                const result = await contract.methods.setGreeting(newGreeting).send({
+                const setGreetingCall = contract.methods.setGreeting(newGreeting);
+                const estimate = await setGreetingCall.estimateGas({ from: account });
+                const result = await setGreetingCall.send({
                     from: account,
-                    gas: 200000
+                    gas: gasLimit(estimate, newGreeting)
                 });
 
                 resultDiv.innerHTML = `
@@ -366,34 +148,45 @@
             }
         }
 
-        async function loadHistory() {
+        function renderHistoryEntry(entry) {
+            const date = new Date(entry.timestamp * 1000);
+            return `
+                <div class="history-item">
+                    <strong>#${entry.index}: "${entry.message}"</strong>
+                    <div class="address">By: ${entry.updatedBy}</div>
+                    <div class="timestamp">⏰ ${date.toLocaleString()}</div>
+                </div>
+            `;
+        }
+
+        async function loadHistory(more = false) {
             const historyDiv = document.getElementById('historyList');
             
             try {
-                historyDiv.innerHTML = '<div class="loading"><div class="spinner"></div>Loading history...</div>';
+                if (!more) {
+                    historyOffset = 0;
+                    historyDiv.innerHTML = '<div class="loading"><div class="spinner"></div>Loading history...</div>';
+                }
 
-                const count = await contract.methods.getHistoryCount().call();
+                // Newest first, one page per request
+                const page = await fetchJSON(`/history?offset=${historyOffset}&limit=${HISTORY_PAGE_SIZE}`);
                 
-                if (count == 0) {
+                if (page.total == 0) {
                     historyDiv.innerHTML = '<div class="loading">No history available</div>';
                     return;
                 }
 
-                let historyHTML = '';
-                for (let i = count - 1; i >= 0; i--) {
-                    const history = await contract.methods.getGreetingFromHistory(i).call();
-                    const date = new Date(history[2] * 1000);
-                    
-                    historyHTML += `
-                        <div class="history-item">
-                            <strong>#${i}: "${history[0]}"</strong>
-                            <div class="address">By: ${history[1]}</div>
-                            <div class="timestamp">⏰ ${date.toLocaleString()}</div>
-                        </div>
+                const historyHTML = page.entries.map(renderHistoryEntry).join('');
+                historyOffset += page.entries.length;
+                document.getElementById('loadMoreHistory')?.remove();
+                historyDiv.innerHTML = (more ? historyDiv.innerHTML : '') + historyHTML;
+                if (historyOffset < page.total) {
+                    historyDiv.innerHTML += `
+                        <button class="btn btn-secondary" id="loadMoreHistory" onclick="loadHistory(true)">
+                            Load More (${page.total - historyOffset} older)
+                        </button>
                     `;
                 }
-
-                historyDiv.innerHTML = historyHTML;
             } catch (error) {
                 console.error('Error loading history:', error);
                 historyDiv.innerHTML = `<div class="result-box error">❌ Error loading history</div>`;
@@ -412,14 +205,14 @@
             try {
                 resultDiv.innerHTML = '<div class="result-box"><div class="spinner"></div>Searching...</div>';
 
-                const history = await contract.methods.getGreetingFromHistory(index).call();
-                const date = new Date(history[2] * 1000);
+                const history = await fetchJSON(`/history/${index}`);
+                const date = new Date(history.timestamp * 1000);
 
                 resultDiv.innerHTML = `
                     <div class="result-box success">
                         <strong>✅ History Entry #${index}</strong><br><br>
-                        <strong>Message:</strong> "${history[0]}"<br>
-                        <strong>Updated By:</strong> ${history[1]}<br>
+                        <strong>Message:</strong> "${history.message}"<br>
+                        <strong>Updated By:</strong> ${history.updatedBy}<br>
                         <strong>Timestamp:</strong> ${date.toLocaleString()}
                     </div>
                 `;
@@ -434,8 +227,16 @@
             console.log(`${type.toUpperCase()}: ${message}`);
         }
 
-        // Auto-connect on page load (optional)
+        // Reads need no wallet: show them on load and keep them fresh.
+        // Polling is cheap, since the server answers from its shared cache.
         window.addEventListener('load', () => {
+            document.getElementById('mainContent').style.display = 'block';
+            loadGreeting();
+            loadContractInfo();
+            setInterval(() => {
+                loadGreeting();
+                loadContractInfo();
+            }, REFRESH_INTERVAL_MS);
             // Uncomment to auto-connect
             // setTimeout(connectWallet, 500);
         });
\ No newline at end of file
@@ -1,14 +1,49 @@
-import unittest
-from web3 import Web3
+import asyncio
+import csv
+import io
 import json
 import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+import unittest
+import requests
+from local_chain import LocalChain
+from deloy import compile_contract, deploy_shards
+from nonce_manager import NonceManager, PipelinedSubmitter
+from history_reader import iter_history
+from indexer import GreetingIndex
+from event_follower import EventFollower, ADDED, REMOVED
+from read_cache import ReadCache
+from bulk_import import import_greetings
+from signer_pool import SignerPool
+from greeting_batcher import GreetingBatcher
+from metrics import REGISTRY, Metrics, metrics_middleware
+from history_hash import history_hash, reconstruct_history
+from api_server import ApiCache, make_server
+from export_history import export_rows, iter_rows, read_columnar
+from receipt_collector import ReceiptCollector, TransactionDropped
+from sharding import ShardRouter, iter_merged_history, load_shards
+from log_decoder import LogDecoder
+from parallel_signer import ParallelSigner, build_transactions, sign_calls
+from history_checkpoint import read_checkpoint, update_history, verify_history
+from gas_planner import GasPlanner
+from interact import set_greeting
+from client import connect
+from rpc_batch import batch_request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from web3 import AsyncWeb3
+from web3.providers.eth_tester import AsyncEthereumTesterProvider
+from async_client import AsyncGreetingClient
 
 class TestGreetingContract(unittest.TestCase):
-    """Test cases for Greeting Contract"""
+    """Test cases for Greeting Contract
+    
+    The contract is deployed once per process on an in-process chain, and
+    every test runs between an evm_snapshot and an evm_revert, so tests do
+    not depend on each other or on their order.
+    """
     
     @classmethod
     def setUpClass(cls):
@@ -17,44 +52,54 @@ class TestGreetingContract(unittest.TestCase):
         print(" GREETING CONTRACT TEST SUITE")
         print("=" * 60)
         
-        # Connect to Ganache
-        ganache_url = os.getenv("GANACHE_URL", "http://127.0.0.1:7545")
-        cls.w3 = Web3(Web3.HTTPProvider(ganache_url))
-        
-        if not cls.w3.is_connected():
-            raise Exception("Failed to connect to Ganache!")
-        
-        print(" Connected to Ganache")
-        
-        # Load contract
         try:
-            with open("deployment_info.json", "r") as file:
-                deployment_info = json.load(file)
-            
-            with open("contract_abi.json", "r") as file:
-                abi = json.load(file)
-            
-            cls.contract_address = deployment_info["contract_address"]
-            cls.contract = cls.w3.eth.contract(address=cls.contract_address, abi=abi)
-            
-            # Get account from environment
-            cls.private_key = os.getenv("PRIVATE_KEY")
-            cls.account = os.getenv("ACCOUNT_ADDRESS")
-            
-            if not cls.private_key or not cls.account:
-                raise Exception("Private key or account not found in .env file!")
-            
-            # Validate account
-            if not cls.account.startswith('0x'):
-                cls.account = '0x' + cls.account
-            if not cls.private_key.startswith('0x'):
-                cls.private_key = '0x' + cls.private_key
-            
-            print(f" Testing contract at: {cls.contract_address}")
-            print(f" Using account: {cls.account}\n")
-            
-        except FileNotFoundError:
-            raise Exception("Contract not deployed! Run 'python deploy.py' first.")
+            cls.chain = LocalChain()
+        except requests.exceptions.RequestException as e:
+            # Fail rather than skip: a skipped suite would let contract changes ship untested
+            raise RuntimeError(
+                "contract.sol does not match compiled_contract.json and solc "
+                f"could not be downloaded to rebuild it: {e}"
+            ) from e
+        
+        cls.w3 = cls.chain.w3
+        cls.contract = cls.chain.contract
+        cls.contract_address = cls.contract.address
+        cls.account = cls.chain.accounts[0]
+        cls.private_key = cls.chain.private_keys[0]
+        
+        print(f" Testing contract at: {cls.contract_address}")
+        print(f" Using account: {cls.account}\n")
+    
+    def setUp(self):
+        self.snapshot_id = self.chain.snapshot()
+        self.nonce_manager = NonceManager(self.w3, self.account)
+    
+    def tearDown(self):
+        self.chain.revert(self.snapshot_id)
+    
+    def send_greeting(self, greeting):
+        """Sign and send setGreeting from the test account, returning the receipt"""
+        return self.send_call(self.contract.functions.setGreeting(greeting))
+    
+    def send_call(self, contract_function, gas=None):
+        """Sign and send a contract call from the test account, returning the receipt
+        
+        Unless `gas` is given the gas limit is estimated, so a call that
+        would revert raises during estimation, before anything is sent.
+        """
+        transaction = {
+            "chainId": self.w3.eth.chain_id,
+            "from": self.account,
+            "nonce": self.nonce_manager.next_nonce(),
+            "gasPrice": self.w3.eth.gas_price,
+        }
+        if gas is not None:
+            transaction["gas"] = gas
+        transaction = contract_function.build_transaction(transaction)
+        
+        signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
+        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        return self.w3.eth.wait_for_transaction_receipt(tx_hash)
     
     def test_01_get_initial_greeting(self):
         """Test 1: Get initial greeting"""
@@ -70,18 +115,7 @@ class TestGreetingContract(unittest.TestCase):
         print("\n Test 2: Set new greeting")
         new_greeting = "Test Greeting - Hello World!"
         
-        nonce = self.w3.eth.get_transaction_count(self.account)
-        transaction = self.contract.functions.setGreeting(new_greeting).build_transaction({
-            "chainId": 1337,
-            "from": self.account,
-            "nonce": nonce,
-            "gas": 200000,
-            "gasPrice": self.w3.eth.gas_price,
-        })
-        
-        signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-        tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = self.send_greeting(new_greeting)
         
         self.assertEqual(tx_receipt.status, 1)
         
@@ -95,18 +129,7 @@ class TestGreetingContract(unittest.TestCase):
         print("\n Test 3: Verify event emission")
         new_greeting = "Testing Event Emission"
         
-        nonce = self.w3.eth.get_transaction_count(self.account)
-        transaction = self.contract.functions.setGreeting(new_greeting).build_transaction({
-            "chainId": 1337,
-            "from": self.account,
-            "nonce": nonce,
-            "gas": 200000,
-            "gasPrice": self.w3.eth.gas_price,
-        })
-        
-        signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-        tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = self.send_greeting(new_greeting)
         
         # Check event logs
         logs = self.contract.events.GreetingUpdated().process_receipt(tx_receipt)
@@ -128,18 +151,7 @@ class TestGreetingContract(unittest.TestCase):
         
         # Set new greeting
         new_greeting = "Counting Test"
-        nonce = self.w3.eth.get_transaction_count(self.account)
-        transaction = self.contract.functions.setGreeting(new_greeting).build_transaction({
-            "chainId": 1337,
-            "from": self.account,
-            "nonce": nonce,
-            "gas": 200000,
-            "gasPrice": self.w3.eth.gas_price,
-        })
-        
-        signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-        self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        self.send_greeting(new_greeting)
         
         info_after = self.contract.functions.getContractInfo().call()
         count_after = info_after[2]
@@ -168,18 +180,8 @@ class TestGreetingContract(unittest.TestCase):
         print("\n Test 6: Test empty greeting validation")
         
         with self.assertRaises(Exception) as context:
-            nonce = self.w3.eth.get_transaction_count(self.account)
-            transaction = self.contract.functions.setGreeting("").build_transaction({
-                "chainId": 1337,
-                "from": self.account,
-                "nonce": nonce,
-                "gas": 200000,
-                "gasPrice": self.w3.eth.gas_price,
-            })
-            
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-            self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            self.send_greeting("")
+        self.assertIn("Greeting cannot be empty", str(context.exception))
         
         print(f"    Empty greeting correctly rejected")
     
@@ -190,18 +192,8 @@ class TestGreetingContract(unittest.TestCase):
         long_greeting = "A" * 201  # More than 200 characters
         
         with self.assertRaises(Exception) as context:
-            nonce = self.w3.eth.get_transaction_count(self.account)
-            transaction = self.contract.functions.setGreeting(long_greeting).build_transaction({
-                "chainId": 1337,
-                "from": self.account,
-                "nonce": nonce,
-                "gas": 200000,
-                "gasPrice": self.w3.eth.gas_price,
-            })
-            
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-            self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            self.send_greeting(long_greeting)
+        self.assertIn("Greeting too long", str(context.exception))
         
         print(f"    Long greeting correctly rejected")
     
@@ -210,7 +202,7 @@ class TestGreetingContract(unittest.TestCase):
         print("\n Test 8: Verify owner")
         
         owner = self.contract.functions.owner().call()
-        self.assertEqual(owner, self.w3.eth.accounts[0])
+        self.assertEqual(owner, self.account)
         print(f"    Owner verified: {owner}")
     
     def test_09_multiple_updates(self):
@@ -220,18 +212,7 @@ class TestGreetingContract(unittest.TestCase):
         greetings = ["Update 1", "Update 2", "Update 3"]
         
         for greeting in greetings:
-            nonce = self.w3.eth.get_transaction_count(self.account)
-            transaction = self.contract.functions.setGreeting(greeting).build_transaction({
-                "chainId": 1337,
-                "from": self.account,
-                "nonce": nonce,
-                "gas": 200000,
-                "gasPrice": self.w3.eth.gas_price,
-            })
-            
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-            self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            self.send_greeting(greeting)
             
             current = self.contract.functions.getGreeting().call()
             self.assertEqual(current, greeting)
@@ -252,6 +233,766 @@ class TestGreetingContract(unittest.TestCase):
         print(f"    Contract info retrieved successfully")
         print(f"      Total Greetings: {info[2]}")
         print(f"      History Length: {info[3]}")
+    
+    def test_11_state_isolation(self):
+        """Test 11: Each test starts from the freshly deployed state"""
+        print("\n Test 11: Test state isolation")
+        
+        # Earlier tests changed the greeting; the snapshot revert undid that
+        info = self.contract.functions.getContractInfo().call()
+        self.assertEqual(info[0], "Hello, Blockchain World!")
+        self.assertEqual(info[2], 1)
+        print(f"    State restored: '{info[0]}'")
+    
+    def test_12_history_range(self):
+        """Test 12: Test getHistoryRange and getHistoryRangeReverse"""
+        print("\n Test 12: Test history range views")
+        
+        for greeting in ["Range 1", "Range 2", "Range 3"]:
+            self.send_greeting(greeting)
+        
+        page = self.contract.functions.getHistoryRange(1, 2).call()
+        self.assertEqual([entry[0] for entry in page], ["Range 1", "Range 2"])
+        
+        page = self.contract.functions.getHistoryRangeReverse(0, 2).call()
+        self.assertEqual([entry[0] for entry in page], ["Range 3", "Range 2"])
+        
+        # Pages are clipped at the end of history
+        self.assertEqual(len(self.contract.functions.getHistoryRange(3, 10).call()), 1)
+        self.assertEqual(self.contract.functions.getHistoryRange(4, 10).call(), [])
+        self.assertEqual(self.contract.functions.getHistoryRangeReverse(4, 10).call(), [])
+        print(f"    Range views return the expected pages")
+    
+    def test_13_iter_history(self):
+        """Test 13: iter_history matches per-index reads in both directions"""
+        print("\n Test 13: Test paginated history reader")
+        
+        for i in range(6):
+            self.send_greeting(f"Page test {i}")
+        
+        expected = [
+            (i, *self.contract.functions.getGreetingFromHistory(i).call())
+            for i in range(self.contract.functions.getHistoryCount().call())
+        ]
+        self.assertEqual(list(iter_history(self.contract, page_size=4, concurrency=2)), expected)
+        self.assertEqual(
+            list(iter_history(self.contract, page_size=4, newest_first=True)),
+            expected[::-1],
+        )
+        print(f"    {len(expected)} entries read in pages")
+    
+    def test_14_pipelined_submission(self):
+        """Test 14: Pipelined submission with local nonces"""
+        print("\n Test 14: Test pipelined submission")
+        
+        submitter = PipelinedSubmitter(
+            self.w3, self.account, self.private_key, max_in_flight=3,
+            nonce_manager=self.nonce_manager, chain_id=self.w3.eth.chain_id, gas=500000,
+        )
+        calls = [self.contract.functions.setGreeting(f"Pipelined {i}") for i in range(5)]
+        results = list(submitter.submit_all(calls))
+        
+        self.assertEqual(sorted(index for index, _, _ in results), list(range(5)))
+        self.assertTrue(all(receipt.status == 1 for _, _, receipt in results))
+        self.assertEqual(self.contract.functions.getGreeting().call(), "Pipelined 4")
+        print(f"    {len(results)} transactions confirmed")
+    
+    def test_15_event_index(self):
+        """Test 15: The SQLite event index mirrors on-chain history"""
+        print("\n Test 15: Test event index")
+        
+        with GreetingIndex(":memory:") as index:
+            self.send_greeting("Indexed 1")
+            index.sync(self.contract, chunk_size=1)
+            self.send_greeting("Indexed 2")
+            index.sync(self.contract, chunk_size=1)
+            
+            on_chain = [
+                tuple(self.contract.functions.getGreetingFromHistory(i).call())
+                for i in range(self.contract.functions.getHistoryCount().call())
+            ]
+            self.assertEqual(list(index.history(self.contract.address)), on_chain)
+            self.assertEqual(
+                index.contract_info(self.contract.address),
+                self.contract.functions.getContractInfo().call(),
+            )
+        print(f"    Index matches {len(on_chain)} on-chain entries")
+
+    def test_16_event_follower_reorg(self):
+        """Test 16: The event follower retracts events from reorged blocks"""
+        print("\n Test 16: Test event follower")
+        
+        follower = EventFollower(self.contract, reorg_depth=4)
+        self.assertEqual(follower.poll(), [])
+        
+        fork = self.chain.snapshot()
+        self.send_greeting("Dropped by reorg")
+        changes = follower.poll()
+        self.assertEqual([(action, event.args.newGreeting) for action, event in changes],
+                         [(ADDED, "Dropped by reorg")])
+        
+        # Replace the block with a different one at the same height
+        self.chain.revert(fork)
+        self.nonce_manager.resync()
+        self.send_greeting("Canonical")
+        changes = follower.poll()
+        self.assertEqual([(action, event.args.newGreeting) for action, event in changes],
+                         [(REMOVED, "Dropped by reorg"), (ADDED, "Canonical")])
+        self.assertEqual(follower.poll(), [])
+        print("    Reorged event retracted and replaced")
+
+    def test_17_read_cache(self):
+        """Test 17: Cached view reads within a block, fresh reads after a write"""
+        print("\n Test 17: Test read cache")
+        
+        cache = ReadCache(self.contract, max_entries=2, block_ttl=60)
+        first = cache.get_greeting()
+        self.assertEqual(cache.get_greeting(), first)
+        self.assertEqual(cache.get_contract_info()[0], first)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        
+        receipt = self.send_greeting("Cache me")
+        cache.invalidate()
+        cache.notify_block(receipt.blockNumber)
+        self.assertEqual(cache.get_greeting(), "Cache me")
+        self.assertEqual(cache.stats()["entries"], 1)
+        print(f"    {cache.stats()}")
+
+    def test_18_bulk_import_resume(self):
+        """Test 18: Bulk import validates lines and resumes after a crash"""
+        print("\n Test 18: Test bulk import")
+        
+        lines = ['"Bulk 1"\n', '{"greeting": ""}\n', '{"greeting": "Bulk 3"}\n',
+                 json.dumps("x" * 201) + "\n", "not json\n", '"Bulk 6"\n']
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "results.jsonl")
+            
+            # A crashed run that had sent line 1 but not recorded its receipt
+            sent = self.send_greeting("Bulk 1")
+            with open(output, "w") as file:
+                file.write(json.dumps({"line": 1, "status": "pending",
+                                       "tx_hash": sent.transactionHash.hex()}) + "\n")
+            history_before = self.contract.functions.getHistoryCount().call()
+            
+            counts = import_greetings(self.w3, self.contract, self.account, self.private_key,
+                                      lines, output, max_in_flight=2)
+            self.assertEqual(counts, {"success": 3, "invalid": 3})
+            self.assertEqual(self.contract.functions.getHistoryCount().call(), history_before + 2)
+            self.assertEqual(self.contract.functions.getGreeting().call(), "Bulk 6")
+            
+            # Everything is recorded, so a rerun sends nothing
+            self.assertEqual(import_greetings(self.w3, self.contract, self.account,
+                                              self.private_key, lines, output), {})
+            with open(output, "r") as file:
+                records = [json.loads(line) for line in file]
+        print(f"    {len(records)} result records written")
+
+    def test_19_signer_pool(self):
+        """Test 19: Writes spread over several signers; failing signers are retired"""
+        print("\n Test 19: Test signer pool")
+        
+        unfunded_key = self.w3.eth.account.create().key.hex()
+        pool = SignerPool(self.w3, [unfunded_key] + self.chain.private_keys[1:4],
+                          max_in_flight=2, max_failures=1, chain_id=self.w3.eth.chain_id)
+        with self.assertRaises(Exception):
+            pool.send(self.contract.functions.setGreeting("Never sent"))
+        self.assertEqual(pool.active, [1, 2, 3])
+        
+        calls = (self.contract.functions.setGreeting(f"Pooled {i}") for i in range(6))
+        results = list(pool.submit_all(calls))
+        self.assertEqual(sorted(index for index, _, _ in results), list(range(6)))
+        self.assertTrue(all(receipt.status == 1 for _, _, receipt in results))
+        self.assertEqual(pool.sent, [0, 2, 2, 2])
+        print(f"    Writes per signer: {pool.sent}")
+
+    def test_20_set_greetings_batch(self):
+        """Test 20: setGreetings applies each update as setGreeting would"""
+        print("\n Test 20: Test batched greeting updates")
+        
+        previous = self.contract.functions.getGreeting().call()
+        info_before = self.contract.functions.getContractInfo().call()
+        batch = ["Batch 1", "Batch 2", "x" * 200]
+        receipt = self.send_call(self.contract.functions.setGreetings(batch))
+        
+        events = self.contract.events.GreetingUpdated().process_receipt(receipt)
+        self.assertEqual([(e.args.oldGreeting, e.args.newGreeting) for e in events],
+                         list(zip([previous] + batch[:-1], batch)))
+        info = self.contract.functions.getContractInfo().call()
+        self.assertEqual(info[0], batch[-1])
+        self.assertEqual(info[2], info_before[2] + len(batch))
+        self.assertEqual(
+            [self.contract.functions.getGreetingFromHistory(info_before[3] + i).call()[0]
+             for i in range(len(batch))],
+            batch,
+        )
+        
+        # One invalid greeting rejects the whole batch
+        with self.assertRaises(Exception) as context:
+            self.send_call(self.contract.functions.setGreetings(["Fine", ""]))
+        self.assertIn("Greeting cannot be empty", str(context.exception))
+        
+        # Chunks stay within the gas budget when sent with the modelled limit
+        batcher = GreetingBatcher(self.contract, self.account)
+        batcher.calibrate()
+        batcher.gas_budget = batcher.gas_limit(["y" * 64] * 3)
+        chunks = list(batcher.chunks([f"Chunked greeting {i}" * 3 for i in range(10)]))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 10)
+        for chunk in chunks:
+            self.assertLessEqual(batcher.gas_limit(chunk), batcher.gas_budget)
+            receipt = self.send_call(self.contract.functions.setGreetings(chunk), gas=batcher.gas_limit(chunk))
+            self.assertEqual(receipt.status, 1)
+        
+        # 32-byte strings need a storage slot of their own, unlike 31-byte ones
+        self.send_greeting("s")
+        for length in (31, 32, 200):
+            batch = [f"{i:0{length}d}" for i in range(8)]
+            receipt = self.send_call(self.contract.functions.setGreetings(batch), gas=batcher.gas_limit(batch))
+            self.assertEqual(receipt.status, 1, f"{length}-byte batch ran out of gas")
+            self.assertLess(receipt.gasUsed, batcher.gas_limit(batch))
+        self.assertGreater(batcher.batch_gas(["y" * 32]) - batcher.batch_gas(["y" * 31]), 20000)
+        print(f"    {len(chunks)} batches of sizes {[len(chunk) for chunk in chunks]}")
+
+    def test_21_rpc_metrics(self):
+        """Test 21: Requests are counted per RPC method and contract function"""
+        print("\n Test 21: Test RPC metrics")
+        
+        metrics = Metrics()
+        metrics.register_abi(self.contract.abi)
+        self.w3.middleware_onion.add(metrics_middleware(metrics), name="metrics")
+        try:
+            self.contract.functions.getGreeting().call()
+            self.contract.functions.getGreetingFromHistory(0).call()
+            with self.assertRaises(Exception):
+                self.contract.functions.getGreetingFromHistory(10 ** 6).call()
+            submitter = PipelinedSubmitter(self.w3, self.account, self.private_key,
+                                           chain_id=self.w3.eth.chain_id)
+            list(submitter.submit_all([self.contract.functions.setGreeting("Measured")]))
+        finally:
+            self.w3.middleware_onion.remove("metrics")
+        
+        series = {(s["metric"], tuple(sorted(s["labels"].items()))): s for s in metrics.summary()["series"]}
+        calls = series[("contract_call_seconds", (("function", "getGreetingFromHistory"), ("method", "eth_call")))]
+        self.assertEqual(calls["count"], 2)
+        self.assertEqual(metrics.summary()["errors"][0]["labels"],
+                         {"function": "getGreetingFromHistory", "method": "eth_call"})
+        self.assertIn(("rpc_request_seconds", (("method", "eth_sendRawTransaction"),)), series)
+        
+        # Write phases go to the shared registry
+        phases = {s["labels"]["phase"] for s in REGISTRY.summary()["series"]
+                  if s["metric"] == "write_phase_seconds" and s["labels"]["function"] == "setGreeting"}
+        self.assertEqual(phases, {"sign", "send", "receipt"})
+        
+        text = metrics.to_prometheus()
+        self.assertIn("# TYPE greeting_rpc_request_seconds histogram", text)
+        self.assertIn('greeting_contract_call_seconds_count{function="getGreeting",method="eth_call"} 1', text)
+        self.assertIn('greeting_rpc_errors_total{function="getGreetingFromHistory",method="eth_call"} 1', text)
+        print(f"    {len(series)} series recorded")
+
+    def test_22_compact_history(self):
+        """Test 22: The compact variant's history can be rebuilt from logs and verified"""
+        print("\n Test 22: Test event-sourced compact history")
+        
+        try:
+            compiled_sol = compile_contract(source_file="contract_compact.sol", save_output=False)
+        except requests.exceptions.RequestException as e:
+            self.fail(f"contract_compact.sol needs solc, which could not be downloaded: {e}")
+        contract_interface = compiled_sol["contracts"]["contract_compact.sol"]["GreetingContract"]
+        factory = self.w3.eth.contract(abi=contract_interface["abi"],
+                                       bytecode=contract_interface["evm"]["bytecode"]["object"])
+        receipt = self.w3.eth.wait_for_transaction_receipt(
+            factory.constructor("Compact start").transact({"from": self.account}))
+        compact = self.w3.eth.contract(address=receipt.contractAddress, abi=contract_interface["abi"])
+        
+        array_gas = self.send_greeting("Same update").gasUsed
+        compact_gas = self.send_call(compact.functions.setGreeting("Same update")).gasUsed
+        self.send_call(compact.functions.setGreetings(["Batch 1", "Batch 2"]))
+        self.assertLess(compact_gas, array_gas)
+        
+        entries = reconstruct_history(compact, start_block=receipt.blockNumber)
+        self.assertEqual([message for message, _, _ in entries],
+                         ["Compact start", "Same update", "Batch 1", "Batch 2"])
+        self.assertEqual(compact.functions.getContractInfo().call()[2:], [4, 4])
+        
+        # Any edit to the rebuilt history changes the hash
+        tampered = [entries[0], ("Rewritten", *entries[1][1:])] + entries[2:]
+        self.assertNotEqual(history_hash(tampered), history_hash(entries))
+        with self.assertRaises(ValueError):
+            reconstruct_history(compact, start_block=receipt.blockNumber + 1)
+        print(f"    setGreeting gas: {array_gas} with history array, {compact_gas} compact")
+
+    def test_23_api_server(self):
+        """Test 23: The read API serves every viewer from one cached read per block"""
+        print("\n Test 23: Test caching read API server")
+        
+        metrics = Metrics()
+        metrics.register_abi(self.contract.abi)
+        self.w3.middleware_onion.add(metrics_middleware(metrics), name="metrics")
+        server = make_server(self.contract, port=0, block_ttl=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        
+        def get(path, etag=None):
+            request = urllib.request.Request(base + path, headers={"If-None-Match": etag} if etag else {})
+            try:
+                with urllib.request.urlopen(request) as response:
+                    body = response.read()
+                    if response.headers["Content-Type"] == "application/json":
+                        body = json.loads(body)
+                    return response.status, response.headers["ETag"], body
+            except urllib.error.HTTPError as e:
+                return e.code, e.headers["ETag"], None
+        
+        def eth_calls():
+            return sum(s["count"] for s in metrics.summary()["series"]
+                       if s["metric"] == "rpc_request_seconds" and s["labels"]["method"] == "eth_call")
+        
+        try:
+            status, etag, body = get("/api/greeting")
+            self.assertEqual((status, body), (200, {"greeting": "Hello, Blockchain World!"}))
+            for _ in range(20):
+                self.assertEqual(get("/api/greeting", etag)[0], 304)
+            self.assertEqual(eth_calls(), 1)
+            
+            self.send_greeting("Served by the API")
+            status, new_etag, body = get("/api/greeting", etag)
+            self.assertEqual((status, body["greeting"]), (200, "Served by the API"))
+            self.assertNotEqual(new_etag, etag)
+            
+            page = get("/api/history?offset=0&limit=1")[2]
+            self.assertEqual((page["total"], page["entries"][0]["index"]), (2, 1))
+            self.assertEqual(get("/api/history/0")[2]["message"], "Hello, Blockchain World!")
+            self.assertEqual(get("/api/history/5")[0], 404)
+            self.assertEqual(get("/api/history?limit=1000")[0], 400)
+            self.assertEqual(get("/static/../deloy.py")[0], 404)
+            self.assertEqual(get("/")[0], 200)
+        finally:
+            server.shutdown()
+            server.server_close()
+            self.w3.middleware_onion.remove("metrics")
+        print(f"    {eth_calls()} eth_calls for 28 requests")
+
+    def test_24_export_history(self):
+        """Test 24: History streams to CSV, JSONL and columnar output with filters"""
+        print("\n Test 24: Test history export")
+        
+        other = self.chain.accounts[1]
+        for i in range(6):
+            sender = other if i % 2 else self.account
+            tx_hash = self.contract.functions.setGreeting(f"Export {i} ✓").transact({"from": sender})
+            self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        
+        rows = list(iter_rows(self.contract, page_size=2))
+        self.assertEqual([row.index for row in rows], list(range(7)))
+        
+        since = rows[3].timestamp
+        expected = [row for row in rows if row.timestamp >= since and row.updated_by == other]
+        filtered = list(iter_rows(self.contract, since=since, updated_by=other.lower()))
+        self.assertEqual(filtered, expected)
+        until = list(iter_rows(self.contract, until=rows[2].timestamp))
+        self.assertEqual(until, [row for row in rows if row.timestamp <= rows[2].timestamp])
+        
+        text = io.StringIO()
+        self.assertEqual(export_rows(iter(rows), text, "csv"), 7)
+        parsed = list(csv.reader(io.StringIO(text.getvalue())))
+        self.assertEqual(parsed[0], ["index", "message", "updated_by", "timestamp"])
+        self.assertEqual(parsed[2][1], "Export 0 ✓")
+        
+        text = io.StringIO()
+        export_rows(iter(rows), text, "jsonl")
+        self.assertEqual(json.loads(text.getvalue().splitlines()[-1])["message"], "Export 5 ✓")
+        
+        binary = io.BytesIO()
+        export_rows(iter(rows), binary, "columnar")
+        binary.seek(0)
+        self.assertEqual(list(read_columnar(binary)), rows)
+        print(f"    {len(rows)} rows, {len(binary.getvalue())} bytes columnar")
+
+    def test_25_receipt_collector(self):
+        """Test 25: Pending receipts are resolved together, with timeouts and drops"""
+        print("\n Test 25: Test block-driven receipt collector")
+        
+        metrics = Metrics()
+        self.w3.middleware_onion.add(metrics_middleware(metrics), name="metrics")
+        collector = ReceiptCollector(self.w3, poll_interval=0.01, drop_check_blocks=0)
+        try:
+            submitter = PipelinedSubmitter(self.w3, self.account, self.private_key, max_in_flight=10,
+                                           chain_id=self.w3.eth.chain_id, receipt_collector=collector)
+            calls = [self.contract.functions.setGreeting(f"Collected {i}") for i in range(10)]
+            results = list(submitter.submit_all(calls))
+            self.assertEqual(len(results), 10)
+            self.assertTrue(all(receipt.status == 1 for _, _, receipt in results))
+            events = self.contract.events.GreetingUpdated().process_receipt(results[-1][2])
+            self.assertTrue(events[0].args.newGreeting.startswith("Collected"))
+            self.assertEqual(collector.passes, 1)
+            
+            missing = "0x" + "ab" * 32
+            dropped = collector.watch(missing)
+            timed_out = collector.watch("0x" + "cd" * 32, timeout=0)
+            done = []
+            confirmed = collector.watch(self.send_greeting("One more").transactionHash, callback=done.append)
+            collector.poll()
+            self.send_greeting("Next block")
+            collector.poll()
+        finally:
+            self.w3.middleware_onion.remove("metrics")
+        
+        self.assertEqual(done, [confirmed])
+        self.assertEqual(confirmed.result().status, 1)
+        self.assertIsInstance(timed_out.exception(), TimeoutError)
+        self.assertIsInstance(dropped.exception(), TransactionDropped)
+        self.assertEqual(collector.pending, 0)
+        receipt_calls = sum(s["count"] for s in metrics.summary()["series"]
+                            if s["labels"].get("method") == "eth_getTransactionReceipt")
+        print(f"    {receipt_calls} receipt requests in {collector.passes} passes for 11 transactions")
+
+    def test_26_sharded_deployment(self):
+        """Test 26: Shards deploy together, matching ones are kept, reads merge by time"""
+        print("\n Test 26: Test sharded deployment and routing")
+        
+        compiled_sol = compile_contract(save_output=False)
+        with tempfile.TemporaryDirectory() as directory:
+            info_file = os.path.join(directory, "deployment_info.json")
+            shards = deploy_shards(self.w3, self.account, self.private_key, compiled_sol, 3,
+                                   existing=[self.contract.address], chain_id=self.w3.eth.chain_id,
+                                   info_file=info_file)
+            self.assertEqual(shards[0]["address"], self.contract.address)
+            self.assertIsNone(shards[0]["transaction_hash"])
+            
+            # Redeploying with every address recorded sends nothing
+            block = self.w3.eth.block_number
+            again = deploy_shards(self.w3, self.account, self.private_key, compiled_sol, 3,
+                                  existing=[shard["address"] for shard in shards],
+                                  chain_id=self.w3.eth.chain_id, info_file=None)
+            self.assertEqual([s["address"] for s in again], [s["address"] for s in shards])
+            self.assertEqual(self.w3.eth.block_number, block)
+            
+            with open(info_file) as file:
+                self.assertEqual(len(json.load(file)["shards"]), 3)
+            contracts = load_shards(self.w3, info_file=info_file)
+        
+        router = ShardRouter(contracts)
+        self.assertEqual(router.shard_for("alice"), router.shard_for("alice"))
+        items = [(f"user-{i}", f"Routed {i}") for i in range(9)]
+        submitter = PipelinedSubmitter(self.w3, self.account, self.private_key,
+                                       chain_id=self.w3.eth.chain_id)
+        self.assertEqual(len(list(submitter.submit_all(router.route(items)))), 9)
+        for key, greeting in items:
+            shard = router.contract_for(key)
+            self.assertIn(greeting, [entry[0] for entry in shard.functions.getAllHistory().call()])
+        
+        merged = list(iter_merged_history(contracts))
+        self.assertEqual(len(merged), router.history_count())
+        self.assertEqual(len(merged), 3 + 9)
+        self.assertEqual(merged, sorted(merged, key=lambda entry: (entry[4], entry[0], entry[1])))
+        print(f"    Writes per shard: {[c.functions.getHistoryCount().call() - 1 for c in contracts]}")
+
+    def test_27_log_decoder(self):
+        """Test 27: The fast log decoder matches web3's decoding exactly"""
+        print("\n Test 27: Test bulk log decoding")
+        
+        receipts = [
+            self.w3.eth.wait_for_transaction_receipt(
+                self.contract.functions.setGreeting(greeting).transact({"from": self.account})
+            )
+            for greeting in ["x" * 31, "y" * 32, "Grüße 🌍 " * 10, "z" * 200]
+        ]
+        logs = self.w3.eth.get_logs({"address": self.contract.address, "fromBlock": 0, "toBlock": "latest"})
+        decoder = LogDecoder(self.contract.abi)
+        events = {
+            "GreetingSet": self.contract.events.GreetingSet(),
+            "GreetingUpdated": self.contract.events.GreetingUpdated(),
+        }
+        
+        decoded = decoder.decode_logs(logs)
+        self.assertEqual(decoded[0]["event"], "GreetingSet")
+        self.assertEqual(decoded, [events[event["event"]].process_log(log) for event, log in zip(decoded, logs)])
+        self.assertEqual(decoded[-1].args.newGreeting, "z" * 200)
+        
+        # Plain dicts and raw hex fields decode too, as plain dicts
+        raw = [dict(log, topics=[topic.hex() for topic in log["topics"]], data=log["data"].hex()) for log in logs]
+        self.assertEqual(decoder.decode_logs(raw), [events[e["event"]].process_log(dict(log)) for e, log in zip(decoded, logs)])
+        for receipt in receipts:
+            self.assertEqual(decoder.process_receipt(receipt), list(events["GreetingUpdated"].process_receipt(receipt)))
+        
+        with self.assertRaises(ValueError):
+            decoder.decode_log(dict(logs[-1], data=logs[-1]["data"][:64]))
+        with self.assertRaises(ValueError):
+            decoder.decode_log(dict(logs[-1], topics=[b"\x00" * 32] + logs[-1]["topics"][1:]))
+        print(f"    {len(logs)} logs decoded identically to process_log")
+
+    def test_28_parallel_signing(self):
+        """Test 28: Transactions signed in a process pool are sent in nonce order"""
+        print("\n Test 28: Test parallel transaction signing")
+        
+        chain_id = self.w3.eth.chain_id
+        nonces = NonceManager(self.w3, self.account)
+        # Long greetings after a short one need more than the old fixed 200000 gas
+        calls = [self.contract.functions.setGreeting(f"Presigned {i} " + "x" * 150) for i in range(5)]
+        calls.append(self.contract.functions.setGreeting("Presigned 5"))
+        gas_planner = GasPlanner(self.w3)
+        signed = sign_calls(calls, self.account, self.private_key, nonces, gas_planner,
+                            workers=2, chain_id=chain_id)
+        first_nonce = self.w3.eth.get_transaction_count(self.account, "pending")
+        self.assertEqual([nonce for nonce, _, _ in signed], list(range(first_nonce, first_nonce + 6)))
+        
+        # Deterministic signatures: the pool signs exactly what one process would
+        gas_limits = [gas_planner.estimate_gas(call, self.account) for call in calls]
+        transactions = build_transactions(calls, self.account, first_nonce, gas_limits,
+                                          gas_planner.gas_price(), chain_id)
+        with ParallelSigner(self.private_key, workers=1, chunk_size=4) as signer:
+            self.assertEqual(signer.sign_all(transactions), signed)
+        
+        submitter = PipelinedSubmitter(self.w3, self.account, self.private_key,
+                                       nonce_manager=nonces, chain_id=chain_id)
+        results = sorted(submitter.submit_signed(signed))
+        self.assertEqual([tx_hash for _, tx_hash, _ in results], [tx_hash for _, _, tx_hash in signed])
+        self.assertTrue(all(receipt.status == 1 for _, _, receipt in results))
+        self.assertEqual(self.contract.functions.getGreeting().call(), "Presigned 5")
+        
+        # The nonce manager continues after the reserved block
+        list(submitter.submit_all([self.contract.functions.setGreeting("After presigned")]))
+        self.assertEqual(self.w3.eth.get_transaction_count(self.account), first_nonce + 7)
+        print(f"    Sent {len(signed)} presigned transactions from nonce {first_nonce}")
+
+    def test_29_history_checkpoint(self):
+        """Test 29: A cached history is verified with one call and extended incrementally"""
+        print("\n Test 29: Test history checkpoint verification")
+        
+        self.send_greeting("Checkpointed")
+        self.send_call(self.contract.functions.setGreetings(["Batch one", "Batch two"]))
+        with tempfile.TemporaryDirectory() as directory:
+            with GreetingIndex(os.path.join(directory, "index.db")) as index:
+                index.sync(self.contract)
+                cached = list(index.history(self.contract_address))
+        self.assertEqual(len(cached), 4)
+        self.assertEqual(read_checkpoint(self.contract)[0], 4)
+        
+        metrics = Metrics()
+        self.w3.middleware_onion.add(metrics_middleware(metrics), name="metrics")
+        try:
+            self.assertTrue(verify_history(self.contract, cached))
+            requests_made = sum(s["count"] for s in metrics.summary()["series"]
+                                if s["metric"] == "rpc_request_seconds")
+        finally:
+            self.w3.middleware_onion.remove("metrics")
+        self.assertEqual(requests_made, 1)
+        
+        tampered = cached[:2] + [("Forged", cached[2][1], cached[2][2])] + cached[3:]
+        self.assertFalse(verify_history(self.contract, tampered))
+        self.assertFalse(verify_history(self.contract, cached[:3]))
+        
+        # New updates are fetched on their own and checked together with the cache
+        self.send_greeting("After the cache")
+        self.assertFalse(verify_history(self.contract, cached))
+        new_entries = update_history(self.contract, cached)
+        self.assertEqual([entry[0] for entry in new_entries], ["After the cache"])
+        self.assertTrue(verify_history(self.contract, cached + new_entries))
+        self.assertEqual(update_history(self.contract, cached + new_entries), [])
+        with self.assertRaises(ValueError):
+            update_history(self.contract, tampered)
+        print(f"    Verified {len(cached) + len(new_entries)} cached entries with {requests_made} call")
+
+    def test_30_gas_planner_worst_case(self):
+        """Test 30: Cached gas limits hold whatever greeting is being replaced"""
+        print("\n Test 30: Test gas planner limits after short and long greetings")
+        
+        self.send_greeting("s" * 190)
+        gas_planner = GasPlanner(self.w3)
+        # The 200-byte limit is first estimated over a long greeting, then reused over a short one
+        for greeting in ["a" * 200, "hi", "b" * 200, "c" * 64, "x", "e" * 32, "d" * 64]:
+            receipt = set_greeting(self.contract, self.w3, self.account, self.private_key, greeting,
+                                   self.nonce_manager, gas_planner)
+            self.assertEqual(receipt.status, 1, f"{len(greeting)}-byte greeting ran out of gas")
+        self.assertEqual(self.contract.functions.getGreeting().call(), "d" * 64)
+        
+        # 31 and 32 bytes pad to the same calldata, but only 32 bytes need a data slot
+        set_greeting_call = self.contract.functions.setGreeting
+        self.assertNotEqual(GasPlanner._key(set_greeting_call("f" * 31)),
+                            GasPlanner._key(set_greeting_call("f" * 32)))
+
+    def test_31_resent_transaction_not_duplicated(self):
+        """Test 31: A send that reached the node before failing is not signed again"""
+        print("\n Test 31: Test a retried raw transaction send")
+        
+        def duplicate_send(make_request, w3):
+            sent = []
+            
+            def middleware(method, params):
+                if method == "eth_sendRawTransaction" and not sent:
+                    # The first attempt is accepted, but its response is lost and the send repeated
+                    sent.append(make_request(method, params))
+                return make_request(method, params)
+            
+            return middleware
+        
+        count = self.contract.functions.getHistoryCount().call()
+        submitter = PipelinedSubmitter(self.w3, self.account, self.private_key,
+                                       nonce_manager=self.nonce_manager, chain_id=self.w3.eth.chain_id)
+        self.w3.middleware_onion.add(duplicate_send, name="duplicate_send")
+        try:
+            results = list(submitter.submit_all([
+                self.contract.functions.setGreeting("Sent once"),
+                self.contract.functions.setGreeting("Sent after"),
+            ]))
+        finally:
+            self.w3.middleware_onion.remove("duplicate_send")
+        
+        self.assertTrue(all(receipt.status == 1 for _, _, receipt in results))
+        history = [entry[0] for entry in self.contract.functions.getAllHistory().call()]
+        self.assertEqual(history[count:], ["Sent once", "Sent after"])
+        print(f"    {len(results)} greetings written once each")
+
+    def test_32_batch_metrics(self):
+        """Test 32: Calls sent as JSON-RPC batches are recorded in the metrics"""
+        print("\n Test 32: Test metrics for batched requests")
+        
+        class StubNode(BaseHTTPRequestHandler):
+            # Answers every call in a batch; eth_getBalance fails
+            def do_POST(self):
+                calls = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                responses = [
+                    {"jsonrpc": "2.0", "id": call["id"], "error": {"code": -32000, "message": "failed"}}
+                    if call["method"] == "eth_getBalance" else {"jsonrpc": "2.0", "id": call["id"], "result": "0x"}
+                    for call in calls
+                ]
+                body = json.dumps(responses).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StubNode)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        metrics = Metrics()
+        metrics.register_abi(self.contract.abi)
+        w3 = connect(url=f"http://127.0.0.1:{server.server_port}", metrics=metrics, retries=0)
+        try:
+            history_calls = [
+                ("eth_call", [{"to": self.contract_address,
+                               "data": self.contract.functions.getGreetingFromHistory(i)._encode_transaction_data()},
+                              "latest"])
+                for i in range(5)
+            ]
+            receipt_calls = [("eth_getTransactionReceipt", ["0x" + "ab" * 32])] * 3
+            self.assertEqual(len(batch_request(w3, history_calls + receipt_calls)), 8)
+            with self.assertRaises(ValueError):
+                batch_request(w3, [("eth_getBalance", [self.account, "latest"])])
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        summary = metrics.summary()
+        counts = {(s["metric"], tuple(sorted(s["labels"].items()))): s["count"]
+                  for s in summary["series"] + summary["errors"]}
+        self.assertEqual(counts[("contract_call_seconds", (("function", "getGreetingFromHistory"), ("method", "eth_call")))], 5)
+        self.assertEqual(counts[("rpc_request_seconds", (("method", "eth_getTransactionReceipt"),))], 3)
+        self.assertEqual(counts[("rpc_errors_total", (("function", ""), ("method", "eth_getBalance")))], 1)
+        print(f"    9 batched calls recorded in {len(counts)} series")
+
+    def test_33_async_client(self):
+        """Test 33: Concurrent async writes from one account get their own nonces"""
+        print("\n Test 33: Test the asyncio client")
+        
+        # An async provider over the same in-process chain
+        provider = AsyncEthereumTesterProvider()
+        provider.ethereum_tester = self.w3.provider.ethereum_tester
+        async_w3 = AsyncWeb3(provider)
+        client = AsyncGreetingClient(async_w3, async_w3.eth.contract(address=self.contract_address,
+                                                                     abi=self.contract.abi))
+        greetings = ["hi", "a" * 200, "b" * 64, "c", "d" * 200]
+        
+        async def run():
+            receipts = await asyncio.gather(*(
+                client.set_greeting(self.account, self.private_key, greeting) for greeting in greetings
+            ))
+            return receipts, await client.get_greeting_history(), await client.get_contract_info()
+        
+        receipts, history, info = asyncio.run(run())
+        self.assertTrue(all(receipt.status == 1 for receipt in receipts))
+        nonces = [self.w3.eth.get_transaction(receipt.transactionHash).nonce for receipt in receipts]
+        self.assertEqual(len(set(nonces)), len(greetings))
+        self.assertEqual(info, self.contract.functions.getContractInfo().call())
+        self.assertEqual(len(history), info[3])
+        self.assertEqual(sorted(entry[0] for entry in history[-5:]), sorted(greetings))
+        self.assertEqual(history[0][0], "Hello, Blockchain World!")
+        print(f"    {len(receipts)} concurrent writes used nonces {sorted(nonces)}")
+
+    def test_34_api_page_pinned_to_block(self):
+        """Test 34: A history page reads its length and entries at one block"""
+        print("\n Test 34: Test API history pages pinned to one block")
+        
+        self.send_greeting("Before the page")
+        cache = ApiCache(self.contract, block_ttl=0)
+        read_info = cache.reads.get_contract_info
+        
+        def info_then_new_block(block_number=None):
+            # A block lands between the length read and the entry reads
+            info = read_info(block_number)
+            self.send_greeting("Mined mid-render")
+            return info
+        
+        cache.reads.get_contract_info = info_then_new_block
+        block, body, _ = cache.get(("history", 0, 2), lambda block: cache.history_page(0, 2, block))
+        page = json.loads(body)
+        self.assertEqual(page["total"], 2)
+        self.assertEqual([entry["message"] for entry in page["entries"]],
+                         ["Before the page", "Hello, Blockchain World!"])
+        self.assertEqual([entry["index"] for entry in page["entries"]], [1, 0])
+        self.assertLess(block, self.w3.eth.block_number)
+        print(f"    Page rendered at block {block}, chain now at {self.w3.eth.block_number}")
+
+    def test_35_history_without_views(self):
+        """Test 35: History readers fall back to logs when the ABI has no history views"""
+        print("\n Test 35: Test history reads on a compact-style ABI")
+        
+        for i in range(3):
+            self.send_greeting(f"Logged {i}")
+        # The same contract seen through an ABI without history views, as for contract_compact.sol
+        views = {"getGreetingFromHistory", "getHistoryRange", "getHistoryRangeReverse",
+                 "getAllHistory", "greetingHistories"}
+        compact = self.w3.eth.contract(address=self.contract_address,
+                                       abi=[item for item in self.contract.abi if item.get("name") not in views])
+        
+        expected = list(iter_history(self.contract))
+        self.assertEqual(list(iter_history(compact)), expected)
+        self.assertEqual(list(iter_history(compact, 1, 3, newest_first=True)), expected[1:3][::-1])
+        
+        since = expected[2][3]
+        rows = list(iter_rows(compact, since=since))
+        self.assertEqual(rows, list(iter_rows(self.contract, since=since)))
+        
+        cache = ApiCache(compact)
+        block = self.w3.eth.block_number
+        page = cache.history_page(0, 2, block)
+        self.assertEqual([entry["message"] for entry in page["entries"]], ["Logged 2", "Logged 1"])
+        self.assertEqual(cache.history_entry(0, block)["message"], "Hello, Blockchain World!")
+        print(f"    {len(expected)} entries rebuilt from logs")
+
+    def test_36_history_view_abi(self):
+        """Test 36: History views return uint256 timestamps despite the packed storage"""
+        print("\n Test 36: Test history view ABI")
+        
+        def timestamp_types(outputs):
+            for output in outputs:
+                if output["name"] == "timestamp":
+                    yield output["type"]
+                yield from timestamp_types(output.get("components", []))
+        
+        functions = {item["name"]: item for item in self.contract.abi if item.get("type") == "function"}
+        views = ["greetingHistories", "getGreetingFromHistory", "getHistoryRange",
+                 "getHistoryRangeReverse", "getAllHistory"]
+        for name in views:
+            self.assertEqual(list(timestamp_types(functions[name]["outputs"])), ["uint256"], name)
+        
+        self.send_greeting("Widened")
+        block_time = self.w3.eth.get_block("latest").timestamp
+        self.assertEqual(self.contract.functions.greetingHistories(1).call()[2], block_time)
+        self.assertEqual(self.contract.functions.getAllHistory().call()[1][2], block_time)
+        print(f"    {len(views)} views return uint256 timestamps")
 
 def run_tests():
     """Run all tests"""